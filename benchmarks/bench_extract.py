@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+텍스트 추출 벤치마크
+기존 BeautifulSoup(html.parser) 다중 탐색 방식과 web_scraper_extract의 단일 순회 방식,
+스트리밍 파싱 방식을 같은 HTML로 비교하고 출력이 같은지 확인합니다.
+
+사용법:
+    python benchmarks/bench_extract.py               # 합성 페이지 사용
+    python benchmarks/bench_extract.py page.html -n 50
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from web_scraper_extract import extract_page, stream_page, format_styled_text
+
+# 스트리밍 파싱에 넘길 청크 크기
+CHUNK_SIZE = 64 * 1024
+
+
+def legacy_extract(html, url=None):
+    """변경 전 extract_text_with_styling + 제목/이미지 탐색"""
+    soup = BeautifulSoup(html, 'html.parser')
+    page_title = soup.find('title')
+    title = page_title.get_text().strip() if page_title else None
+
+    styled_text = []
+    if url:
+        styled_text.append(f"**원본 URL**: {url}")
+        styled_text.append("")
+
+    heading = soup.find('h1') or soup.find('h2') or soup.find('h3')
+    if heading:
+        styled_text.append(f"# {heading.get_text().strip()}")
+
+    for table in soup.find_all('table'):
+        styled_text.append("## 프로그램 정보")
+        for row in table.find_all('tr'):
+            cells = row.find_all(['td', 'th'])
+            if len(cells) >= 2:
+                key = cells[0].get_text().strip()
+                value = cells[1].get_text().strip()
+                styled_text.append(f"**{key}**: {value}")
+        styled_text.append("")
+
+    for div in soup.find_all(['div', 'p'], class_=re.compile(r'content|body|main')):
+        text = div.get_text().strip()
+        if text and len(text) > 10:
+            for line in text.split('\n'):
+                line = line.strip()
+                if line:
+                    styled_text.append(line)
+            styled_text.append("")
+
+    images = []
+    for i, img in enumerate(soup.find_all('img')):
+        if img.get('src'):
+            images.append((img.get('src'), img.get('alt', f'image_{i+1}')))
+    return title, '\n'.join(styled_text), images
+
+
+def single_pass_extract(html, url=None):
+    content = extract_page(html)
+    return content.title, format_styled_text(content, url), content.image_list()
+
+
+def streaming_extract(html, url=None):
+    chunks = (html[i:i + CHUNK_SIZE] for i in range(0, len(html), CHUNK_SIZE))
+    content = stream_page(chunks)
+    return content.title, format_styled_text(content, url), content.image_list()
+
+
+def synthetic_page(sections=200):
+    """테이블, 본문 블록, 이미지가 섞인 합성 페이지"""
+    parts = ['<html><head><meta charset="utf-8"><title>벤치마크 페이지</title>',
+             '<script>var x = "<div class=content>";</script></head><body>',
+             '<h1>청소년 프로그램 안내</h1>']
+    for i in range(sections):
+        parts.append(f'<div class="main-content section-{i}"><h3>섹션 {i}</h3>')
+        parts.append('<table class="info"><tr><th>구분</th><td>내용</td></tr>')
+        parts.append(f'<tr><th>일시</th><td>2024-{i % 12 + 1:02d}-01 10:00</td></tr>')
+        parts.append(f'<tr><th>장소</th><td>본관 {i}층 <b>강의실</b></td></tr></table>')
+        parts.append(f'<p class="body-text">프로그램 {i}에 대한 설명입니다.\n'
+                     f'  참가 신청은 홈페이지에서 가능합니다. &nbsp;문의: 02-000-{i:04d}</p>')
+        parts.append(f'<img src="/images/photo_{i}.jpg" alt="사진 {i}"><img src="/images/icon_{i}.png">')
+        parts.append('<!-- 광고 영역 --><style>.ad { display: none; }</style></div>')
+    parts.append('</body></html>')
+    return ''.join(parts).encode('utf-8')
+
+
+def measure(func, html, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func(html, 'https://example.com/')
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return {
+        'median_ms': round(timings[len(timings) // 2] * 1000, 3),
+        'min_ms': round(timings[0] * 1000, 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='텍스트 추출 벤치마크')
+    parser.add_argument('files', nargs='*', help='비교할 HTML 파일 (없으면 합성 페이지)')
+    parser.add_argument('-n', '--runs', type=int, default=20, help='반복 횟수 (기본값: 20)')
+    args = parser.parse_args()
+
+    pages = []
+    if args.files:
+        for path in args.files:
+            with open(path, 'rb') as f:
+                pages.append((path, f.read()))
+    else:
+        pages.append(('synthetic', synthetic_page()))
+
+    results = []
+    for name, html in pages:
+        legacy = measure(legacy_extract, html, args.runs)
+        single = measure(single_pass_extract, html, args.runs)
+        streaming = measure(streaming_extract, html, args.runs)
+        expected = legacy_extract(html, 'https://example.com/')
+        results.append({
+            'page': name,
+            'bytes': len(html),
+            'identical': (expected == single_pass_extract(html, 'https://example.com/')
+                          == streaming_extract(html, 'https://example.com/')),
+            'legacy_bs4': legacy,
+            'single_pass_lxml': single,
+            'streaming_lxml': streaming,
+            'speedup': round(legacy['median_ms'] / single['median_ms'], 2) if single['median_ms'] else None
+        })
+
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    if not all(r['identical'] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
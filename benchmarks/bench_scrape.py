@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+스크래핑 벤치마크
+로컬 합성 게시판 서버(fixture_server.py)를 띄우고 각 스크래퍼로 같은 공지 페이지들을 스크래핑해
+초당 페이지 수, 이미지 MB/s, 페이지별 소요 시간(p50/p95), 최대 메모리(RSS)를 JSON으로 출력합니다.
+대상마다 별도 프로세스와 임시 HOME을 쓰므로 캐시/저장소/메모리 측정이 서로 섞이지 않습니다.
+
+대상:
+    cli       web_scraper.py의 WebScraper
+    web       web_app.py의 WebScraper
+    flask     Flask /scrape 엔드포인트 (결과 캐시/동시 요청 합치기 포함)
+    selenium  SeleniumWebScraper (Chrome 필요, 기본 대상 아님)
+
+사용법:
+    python benchmarks/bench_scrape.py                          # cli, web, flask
+    python benchmarks/bench_scrape.py --pages 50 --concurrency 4 --latency 0.05 -o after.json
+    python benchmarks/bench_scrape.py --compare before.json    # 이전 실행과 비교
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCH_DIR)
+from fixture_server import (FixtureServer, DEFAULT_PAGE_BYTES, DEFAULT_TABLES, DEFAULT_IMAGES,
+                            DEFAULT_IMAGE_BYTES)
+
+TARGETS = ['cli', 'web', 'flask', 'selenium']
+DEFAULT_TARGETS = ['cli', 'web', 'flask']
+MB = 1024 * 1024
+# 측정 페이지와 번호가 겹치지 않는 예열용 공지 번호
+WARMUP_OFFSET = 100000
+WORKER_TIMEOUT = 1800
+
+
+def percentile(values, fraction):
+    """정렬된 값의 백분위수 (가장 가까운 순위)"""
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, math.ceil(fraction * len(values)) - 1))
+    return values[index]
+
+
+def peak_rss_mb():
+    """이 프로세스의 최대 RSS (MB, 측정할 수 없으면 None)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, 리눅스는 KB
+    return round(peak / MB if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+def image_bytes(images):
+    return sum(os.path.getsize(image['local_path']) for image in images or []
+               if image.get('local_path') and os.path.isfile(image['local_path']))
+
+
+def make_scraper(target, base_url, stream):
+    """url을 받아 (성공 여부, 내려받은 이미지 바이트)를 반환하는 함수 (스레드마다 하나씩 만듦)"""
+    if target == 'cli':
+        from web_scraper import WebScraper
+        scraper = WebScraper(base_url, stream=stream)
+
+        def scrape(url):
+            folder = scraper.scrape_page(url)
+            if not folder:
+                return False, 0
+            return True, scraper.last_metadata['bytes']['images']
+        return scrape
+
+    if target == 'web':
+        from web_app import WebScraper
+        scraper = WebScraper(base_url, stream=stream)
+
+        def scrape(url):
+            result = scraper.scrape_page(url)
+            return result['success'], image_bytes(result.get('images'))
+        return scrape
+
+    if target == 'flask':
+        from web_app import app
+        client = app.test_client()
+
+        def scrape(url):
+            response = client.post('/scrape', json={'url': url, 'use_stream': stream, 'force_refresh': True})
+            result = response.get_json()
+            return response.status_code == 200 and result['success'], image_bytes(result.get('images'))
+        return scrape
+
+    if target == 'selenium':
+        from web_scraper_selenium import SeleniumWebScraper, get_driver_pool
+        scraper = SeleniumWebScraper(base_url, driver_pool=get_driver_pool())
+
+        def scrape(url):
+            result = scraper.scrape_page(url)
+            return result['success'], image_bytes(result.get('images'))
+        return scrape
+
+    raise ValueError(f"알 수 없는 대상: {target}")
+
+
+def run_worker(args):
+    """한 대상을 측정하고 결과 dict 반환 (--worker로 실행된 자식 프로세스에서 호출)"""
+    from web_scraper_session import configure
+    if not args.throttle:
+        # 로컬 서버라 호스트별 속도 조절은 측정 대상이 아님
+        configure(scheduler=None)
+
+    local = threading.local()
+
+    def scrape(number):
+        if not hasattr(local, 'scrape'):
+            local.scrape = make_scraper(args.worker, args.base, args.stream)
+        started = time.perf_counter()
+        try:
+            ok, size = local.scrape(f"{args.base}/notice/{number}")
+        except Exception as e:
+            print(f"스크래핑 오류: {e}", file=sys.stderr)
+            ok, size = False, 0
+        return ok, size, time.perf_counter() - started
+
+    # 스크래퍼 로그는 버리고 결과 JSON만 출력
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            list(executor.map(scrape, range(WARMUP_OFFSET, WARMUP_OFFSET + args.warmup)))
+            started = time.perf_counter()
+            results = list(executor.map(scrape, range(1, args.pages + 1)))
+            wall = time.perf_counter() - started
+
+    latencies = sorted(elapsed for ok, size, elapsed in results if ok)
+    total_bytes = sum(size for ok, size, elapsed in results if ok)
+    return {
+        'pages': len(latencies),
+        'errors': len(results) - len(latencies),
+        'wall_seconds': round(wall, 3),
+        'pages_per_sec': round(len(latencies) / wall, 3) if wall else None,
+        'image_mb': round(total_bytes / MB, 3),
+        'image_mb_per_sec': round(total_bytes / MB / wall, 3) if wall else None,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 0.5) * 1000, 1) if latencies else None,
+            'p95': round(percentile(latencies, 0.95) * 1000, 1) if latencies else None,
+            'max': round(latencies[-1] * 1000, 1) if latencies else None
+        },
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def spawn_worker(target, base_url, args):
+    """대상 하나를 임시 HOME을 쓰는 자식 프로세스로 측정"""
+    home = tempfile.mkdtemp(prefix=f'bench_{target}_')
+    command = [sys.executable, os.path.abspath(__file__), '--worker', target, '--base', base_url,
+               '--pages', str(args.pages), '--concurrency', str(args.concurrency), '--warmup', str(args.warmup)]
+    if args.stream:
+        command.append('--stream')
+    if args.throttle:
+        command.append('--throttle')
+    env = dict(os.environ, HOME=home, USERPROFILE=home)
+    try:
+        completed = subprocess.run(command, cwd=REPO_DIR, env=env, capture_output=True, text=True,
+                                   timeout=WORKER_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        return {'error': f'{WORKER_TIMEOUT}초 안에 끝나지 않음'}
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        error = completed.stderr.strip().splitlines()
+        return {'error': error[-1] if error else f'종료 코드 {completed.returncode}'}
+    return json.loads(lines[-1])
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(report, baseline):
+    """대상별 이전 실행 대비 비율 (1보다 크면 값이 커짐)"""
+    def ratio(new, old):
+        return round(new / old, 3) if new is not None and old else None
+
+    comparison = {}
+    for target, result in report['results'].items():
+        old = baseline.get('results', {}).get(target)
+        if not old or 'error' in old or 'error' in result:
+            continue
+        comparison[target] = {
+            'pages_per_sec': ratio(result['pages_per_sec'], old['pages_per_sec']),
+            'image_mb_per_sec': ratio(result['image_mb_per_sec'], old['image_mb_per_sec']),
+            'p50_ms': ratio(result['latency_ms']['p50'], old['latency_ms']['p50']),
+            'p95_ms': ratio(result['latency_ms']['p95'], old['latency_ms']['p95']),
+            'peak_rss_mb': ratio(result['peak_rss_mb'], old['peak_rss_mb'])
+        }
+    return {'baseline_commit': baseline.get('environment', {}).get('commit'), 'ratios': comparison}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='스크래핑 벤치마크 (로컬 합성 게시판 사용)')
+    parser.add_argument('--targets', nargs='+', choices=TARGETS, default=DEFAULT_TARGETS,
+                        help=f'측정 대상 (기본값: {" ".join(DEFAULT_TARGETS)})')
+    parser.add_argument('--pages', type=int, default=20, help='대상별 측정 페이지 수 (기본값: 20)')
+    parser.add_argument('--warmup', type=int, default=2, help='측정 전 예열 페이지 수 (기본값: 2)')
+    parser.add_argument('--concurrency', type=int, default=1, help='동시에 스크래핑할 페이지 수 (기본값: 1)')
+    parser.add_argument('--stream', action='store_true', help='스트리밍 파싱 모드로 측정')
+    parser.add_argument('--throttle', action='store_true', help='호스트별 속도 조절을 켠 채로 측정')
+    parser.add_argument('--page-bytes', type=int, default=DEFAULT_PAGE_BYTES, help='공지 페이지 크기 (바이트)')
+    parser.add_argument('--tables', type=int, default=DEFAULT_TABLES, help='페이지당 테이블 수')
+    parser.add_argument('--images', type=int, default=DEFAULT_IMAGES, help='페이지당 이미지 수')
+    parser.add_argument('--image-bytes', type=int, default=DEFAULT_IMAGE_BYTES, help='이미지 크기 (바이트)')
+    parser.add_argument('--latency', type=float, default=0.0, help='페이지 응답 지연 (초)')
+    parser.add_argument('--image-latency', type=float, default=0.0, help='이미지 응답 지연 (초)')
+    parser.add_argument('-o', '--output', help='결과 JSON 저장 위치')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON')
+    parser.add_argument('--worker', choices=TARGETS, help=argparse.SUPPRESS)
+    parser.add_argument('--base', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args)))
+        return
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    server = FixtureServer(page_bytes=args.page_bytes, tables=args.tables, images=args.images,
+                           image_bytes=args.image_bytes, latency=args.latency, image_latency=args.image_latency)
+    results = {}
+    with server:
+        for target in args.targets:
+            print(f"측정 중: {target}", file=sys.stderr)
+            results[target] = spawn_worker(target, server.url, args)
+
+    report = {
+        'config': {
+            'pages': args.pages,
+            'warmup': args.warmup,
+            'concurrency': args.concurrency,
+            'stream': args.stream,
+            'throttle': args.throttle,
+            'fixture': server.config()
+        },
+        'environment': {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count()
+        },
+        'results': results
+    }
+    if baseline is not None:
+        report['comparison'] = compare(report, baseline)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    if any('error' in result or result['errors'] for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+벤치마크용 로컬 HTTP 서버
+게시판 공지 페이지를 흉내 낸 합성 페이지와 이미지를 제공합니다.
+페이지 크기, 테이블 수, 이미지 수/크기, 응답 지연을 정할 수 있고 같은 설정이면 항상 같은 응답을 돌려줍니다.
+
+    /board               공지 목록 (각 공지 링크)
+    /notice/<번호>        공지 페이지
+    /img/<번호>/<순번>.png 공지 이미지 (공지/순번마다 내용이 다름)
+
+사용법:
+    python benchmarks/fixture_server.py --port 8000 --images 20 --latency 0.05
+"""
+
+import argparse
+import hashlib
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 기본 설정
+DEFAULT_PAGE_BYTES = 64 * 1024
+DEFAULT_TABLES = 3
+DEFAULT_IMAGES = 10
+DEFAULT_IMAGE_BYTES = 32 * 1024
+BOARD_SIZE = 50  # /board에 보여줄 공지 수
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def png_chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+def synthetic_png(seed, size, width=640, height=480):
+    """헤더가 올바른 PNG 형식 바이트 (seed마다 내용이 달라 이미지 저장소에서 중복 제거되지 않음)"""
+    header = PNG_SIGNATURE + png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+    end = png_chunk(b'IEND', b'')
+    # 나머지는 보조 청크로 채움 (청크 길이/종류/CRC 12바이트 제외)
+    padding = max(0, size - len(header) - len(end) - 12)
+    digest = hashlib.sha256(seed.encode('utf-8')).digest()
+    filler = (digest * (padding // len(digest) + 1))[:padding]
+    return header + png_chunk(b'pADd', filler) + end
+
+
+def notice_page(number, page_bytes=DEFAULT_PAGE_BYTES, tables=DEFAULT_TABLES, images=DEFAULT_IMAGES):
+    """공지 페이지 HTML (본문 문단으로 page_bytes 크기까지 채움)"""
+    head = [
+        '<!DOCTYPE html><html><head><meta charset="utf-8">',
+        f'<title>공지사항 {number} - 청소년 프로그램 안내</title>',
+        '<link rel="stylesheet" href="/static/board.css">',
+        '<script>var board = {page: 1, size: 20};</script></head><body>',
+        '<div class="header"><ul class="menu"><li>기관 소개</li><li>프로그램</li><li>공지사항</li></ul></div>',
+        f'<div class="board-view"><h1>{number}번 청소년 프로그램 참가자 모집</h1>'
+    ]
+    for table in range(tables):
+        head.append('<table class="info">')
+        head.append(f'<tr><th>구분</th><td>프로그램 {number}-{table}</td></tr>')
+        head.append(f'<tr><th>기간</th><td>2024-{table % 12 + 1:02d}-01 ~ 2024-{table % 12 + 1:02d}-28</td></tr>')
+        head.append(f'<tr><th>장소</th><td>본관 {table + 1}층 <b>강의실</b></td></tr>')
+        head.append('<tr><th>대상</th><td>중·고등학생 20명</td></tr></table>')
+    for index in range(images):
+        head.append(f'<img src="/img/{number}/{index}.png" alt="활동 사진 {index + 1}">')
+    tail = '</div><div class="footer">문의: 02-000-0000</div></body></html>'
+
+    html = ''.join(head)
+    body = ['<div class="content">']
+    size = len(html.encode('utf-8')) + len(tail.encode('utf-8'))
+    paragraph = 0
+    while size < page_bytes:
+        text = (f'<p>{paragraph + 1}. 프로그램 참가 신청은 홈페이지에서 받습니다. '
+                f'신청 번호 {number:05d}-{paragraph:04d}, 자세한 내용은 첨부 파일을 확인하세요.</p>\n')
+        body.append(text)
+        size += len(text.encode('utf-8'))
+        paragraph += 1
+    body.append('</div>')
+    return (html + ''.join(body) + tail).encode('utf-8')
+
+
+def board_page(board_size=BOARD_SIZE):
+    links = ''.join(f'<li><a href="/notice/{number}">공지사항 {number}</a></li>' for number in range(1, board_size + 1))
+    return (f'<html><head><meta charset="utf-8"><title>공지사항</title></head>'
+            f'<body><h1>공지사항</h1><ul class="board">{links}</ul></body></html>').encode('utf-8')
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        fixture = self.server.fixture
+        parts = self.path.split('?')[0].strip('/').split('/')
+        try:
+            if parts == ['board']:
+                body, content_type, delay = board_page(), 'text/html; charset=utf-8', fixture.latency
+            elif len(parts) == 2 and parts[0] == 'notice':
+                body = notice_page(int(parts[1]), fixture.page_bytes, fixture.tables, fixture.images)
+                content_type, delay = 'text/html; charset=utf-8', fixture.latency
+            elif len(parts) == 3 and parts[0] == 'img' and parts[2].endswith('.png'):
+                body = synthetic_png(f"{parts[1]}/{parts[2]}", fixture.image_bytes)
+                content_type, delay = 'image/png', fixture.image_latency
+            else:
+                raise ValueError(self.path)
+        except ValueError:
+            self.send_error(404)
+            return
+
+        if delay:
+            time.sleep(delay)
+        fixture.count(len(body))
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """합성 게시판을 제공하는 HTTP 서버 (백그라운드 스레드에서 실행)
+
+    with FixtureServer(images=20) as server:
+        scrape(server.url + '/notice/1')
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, page_bytes=DEFAULT_PAGE_BYTES, tables=DEFAULT_TABLES,
+                 images=DEFAULT_IMAGES, image_bytes=DEFAULT_IMAGE_BYTES, latency=0.0, image_latency=0.0):
+        self.page_bytes = page_bytes
+        self.tables = tables
+        self.images = images
+        self.image_bytes = image_bytes
+        self.latency = latency
+        self.image_latency = image_latency
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.bytes_sent = 0
+        self.httpd = ThreadingHTTPServer((host, port), FixtureHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.fixture = self
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, size):
+        with self.lock:
+            self.requests += 1
+            self.bytes_sent += size
+
+    def config(self):
+        return {
+            'page_bytes': self.page_bytes,
+            'tables': self.tables,
+            'images': self.images,
+            'image_bytes': self.image_bytes,
+            'latency': self.latency,
+            'image_latency': self.image_latency
+        }
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='fixture-server', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='벤치마크용 합성 게시판 서버')
+    parser.add_argument('--port', type=int, default=8000, help='포트 (기본값: 8000)')
+    parser.add_argument('--page-bytes', type=int, default=DEFAULT_PAGE_BYTES, help='공지 페이지 크기 (바이트)')
+    parser.add_argument('--tables', type=int, default=DEFAULT_TABLES, help='페이지당 테이블 수')
+    parser.add_argument('--images', type=int, default=DEFAULT_IMAGES, help='페이지당 이미지 수')
+    parser.add_argument('--image-bytes', type=int, default=DEFAULT_IMAGE_BYTES, help='이미지 크기 (바이트)')
+    parser.add_argument('--latency', type=float, default=0.0, help='페이지 응답 지연 (초)')
+    parser.add_argument('--image-latency', type=float, default=0.0, help='이미지 응답 지연 (초)')
+    args = parser.parse_args()
+
+    server = FixtureServer(port=args.port, page_bytes=args.page_bytes, tables=args.tables, images=args.images,
+                           image_bytes=args.image_bytes, latency=args.latency, image_latency=args.image_latency)
+    print(f"합성 게시판 서버: {server.url}/board")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+테스트 공통 설정
+저장소/캐시/검색 색인 위치는 모듈을 불러올 때 홈 디렉터리 기준으로 정해지므로,
+저장소 모듈을 불러오기 전에 HOME을 임시 디렉터리로 바꿔 실제 ~/.web_scraper와 데스크탑을 건드리지 않습니다.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+TEST_HOME = tempfile.mkdtemp(prefix='web_scraper_test_')
+os.environ['HOME'] = TEST_HOME
+os.environ['USERPROFILE'] = TEST_HOME
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, 'benchmarks'))
+
+import pytest
+from fixture_server import FixtureServer
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(TEST_HOME, ignore_errors=True)
+
+
+@pytest.fixture(scope='session')
+def fixture_server():
+    """작은 합성 게시판 서버 (페이지 8KB, 테이블 2개, 이미지 3개)"""
+    with FixtureServer(page_bytes=8 * 1024, tables=2, images=3, image_bytes=4 * 1024) as server:
+        yield server
+
+
+@pytest.fixture
+def unused_url():
+    """연결을 받지 않는 로컬 주소"""
+    import socket
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/notice/1"
@@ -0,0 +1,50 @@
+"""asyncio 엔진이 web_app.WebScraper와 같은 결과를 만드는지 확인"""
+
+import json
+import os
+from pathlib import Path
+
+from web_app import WebScraper
+from web_scraper_async import scrape_page_sync, scrape_pages_sync
+
+
+def folder_files(folder_path):
+    folder = Path(folder_path)
+    return sorted(str(path.relative_to(folder)) for path in folder.rglob('*'))
+
+
+def image_names(result):
+    return [os.path.basename(image['local_path']) for image in result['images']]
+
+
+def test_matches_web_scraper(fixture_server, tmp_path):
+    url = fixture_server.url + '/notice/1'
+    expected = WebScraper(url).scrape_page(url)
+    result = scrape_page_sync(url, output_dir=tmp_path)
+
+    assert expected['success'] and result['success']
+    assert result['text_content'] == expected['text_content']
+    assert result['image_count'] == expected['image_count'] == fixture_server.images
+    assert image_names(result) == image_names(expected)
+
+    files = folder_files(result['folder_path'])
+    assert files == folder_files(expected['folder_path'])
+    assert {'content.md', 'content.txt', 'metadata.json', 'images'} <= set(files)
+    with open(Path(result['folder_path']) / 'metadata.json', encoding='utf-8') as f:
+        assert f"{fixture_server.url}/notice/1" == json.load(f)['url']
+
+
+def test_many_pages(fixture_server, tmp_path):
+    urls = [f"{fixture_server.url}/notice/{number}" for number in (2, 3)]
+    results = scrape_pages_sync(urls, concurrency=2, output_dir=tmp_path)
+
+    assert [result['success'] for result in results] == [True, True]
+    assert all(result['image_count'] == fixture_server.images for result in results)
+
+
+def test_unreachable_server(unused_url, tmp_path):
+    result = scrape_page_sync(unused_url, output_dir=tmp_path)
+
+    assert result['success'] is False
+    assert result['error'].startswith('연결 오류')
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,44 @@
+"""명령줄 배치 모드 (web_scraper.run_batch) JSONL 요약"""
+
+import json
+
+import pytest
+
+from web_scraper import run_batch
+
+
+@pytest.mark.parametrize('use_async', [False, True])
+def test_batch_summaries(fixture_server, unused_url, tmp_path, use_async):
+    urls = [f"{fixture_server.url}/notice/{number}" for number in (20, 21)] + [unused_url]
+    jsonl_path = tmp_path / 'summary.jsonl'
+
+    totals = run_batch(urls, jsonl_path, concurrency=2, use_async=use_async, output_dir=tmp_path / 'out')
+
+    assert (totals['ok'], totals['error']) == (2, 1)
+    with open(jsonl_path, encoding='utf-8') as f:
+        summaries = {summary['url']: summary for summary in map(json.loads, f)}
+    assert set(summaries) == set(urls)
+    for url in urls[:2]:
+        assert summaries[url]['status'] == 'ok'
+        assert summaries[url]['image_count'] == fixture_server.images
+        assert summaries[url]['image_bytes'] > 0
+    assert summaries[unused_url]['status'] == 'error'
+    assert summaries[unused_url]['error']
+
+
+@pytest.mark.parametrize('use_async', [False, True])
+def test_same_title_pages_get_separate_folders(fixture_server, tmp_path, use_async):
+    # 쿼리만 다른 URL은 제목이 같아 같은 초에 같은 폴더 이름을 만듦
+    urls = [f"{fixture_server.url}/notice/5{query}" for query in ('', '?x=1', '?x=2')]
+    jsonl_path = tmp_path / 'summary.jsonl'
+
+    totals = run_batch(urls, jsonl_path, concurrency=3, use_async=use_async, output_dir=tmp_path / 'out')
+
+    assert totals['ok'] == 3
+    with open(jsonl_path, encoding='utf-8') as f:
+        folders = {summary['url']: summary['folder'] for summary in map(json.loads, f)}
+    assert len(set(folders.values())) == 3
+    # 각 폴더에는 자기 페이지의 메타데이터가 남아 있어야 함 (덮어쓰기 없음)
+    for url, folder in folders.items():
+        with open(f"{folder}/metadata.json", encoding='utf-8') as f:
+            assert json.load(f)['url'] == url
@@ -0,0 +1,87 @@
+"""SQLite 스크래핑 저장소 (web_scraper_db): 빈 이미지 제외, 실패한 묶음의 개별 재시도"""
+
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from fixture_server import synthetic_png
+from web_scraper import WebScraper
+from web_scraper_db import ScrapeDatabase
+from web_scraper_store import ImageStore
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = ScrapeDatabase(tmp_path / 'scrapes.db')
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def empty_image_server():
+    """/page는 빈 이미지(/empty.png)와 정상 이미지(/ok.png)를 보여줌"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == '/empty.png':
+                body, content_type = b'', 'image/png'
+            elif self.path == '/ok.png':
+                body, content_type = synthetic_png('ok', 2048), 'image/png'
+            else:
+                body = ('<html><head><title>빈 이미지</title></head><body><h1>빈 이미지</h1>'
+                        '<div class="content">본문 이미지 두 개 중 하나는 비어 있습니다.</div>'
+                        '<img src="/empty.png" alt="빈 그림"><img src="/ok.png" alt="사진"></body></html>'
+                        ).encode('utf-8')
+                content_type = 'text/html; charset=utf-8'
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_empty_image_is_not_recorded(empty_image_server, database, tmp_path):
+    base = empty_image_server
+    scraper = WebScraper(base, database=database, image_store=ImageStore(tmp_path / 'store'))
+    page_id = scraper.scrape_page(base + '/page')
+
+    page = database.get_page(page_id)
+    assert [image['original_url'] for image in page['images']] == ['/ok.png']
+
+
+def record(url, title):
+    return {'url': url, 'title': title, 'folder_name': title, 'scraped_at': '2026-10-17T00:00:00',
+            'text': f'{title} 본문', 'tables': [[('담당', '홍보팀')]],
+            'images': [{'original_url': '/a.png', 'alt_text': '사진', 'hash': 'abc'}], 'metadata': {}}
+
+
+def test_failed_record_does_not_fail_its_batch(tmp_path):
+    # 첫 페이지 뒤 1초 동안 들어온 페이지를 한 트랜잭션으로 묶음
+    database = ScrapeDatabase(tmp_path / 'scrapes.db', batch_delay=1.0)
+    try:
+        with ThreadPoolExecutor(3) as pool:
+            futures = [pool.submit(database.save_page, record(url, title))
+                       for url, title in (('http://a/1', '첫째'), (None, '주소 없음'), ('http://a/2', '둘째'))]
+        first, second = futures[0].result(), futures[2].result()
+        with pytest.raises(sqlite3.IntegrityError):
+            futures[1].result()
+
+        assert database.get_page(first)['title'] == '첫째'
+        assert database.get_page(second)['tables'] == [[('담당', '홍보팀')]]
+        assert sorted((page['url'], page['id']) for page in database.list_pages()) == [
+            ('http://a/1', first), ('http://a/2', second)]
+    finally:
+        database.close()
@@ -0,0 +1,37 @@
+"""지연 이미지(lazy_images): 스크래핑 때는 받지 않고 /image 첫 요청에 받아 저장"""
+
+import os
+
+from fixture_server import synthetic_png
+from web_app import app
+
+
+def test_lazy_image_fetched_on_first_request(fixture_server):
+    client = app.test_client()
+    url = fixture_server.url + '/notice/30'
+    result = client.post('/scrape', json={'url': url, 'lazy_images': True, 'force_refresh': True}).get_json()
+
+    assert result['success']
+    assert result['image_count'] == fixture_server.images
+    image = result['images'][0]
+    assert image['lazy'] and not os.path.exists(image['local_path'])
+
+    key = f"{os.path.basename(result['folder_path'])}/{os.path.basename(image['local_path'])}"
+    response = client.get(f'/image/{key}')
+    expected = synthetic_png('30/0.png', fixture_server.image_bytes)
+    assert response.status_code == 200
+    assert response.data == expected
+    with open(image['local_path'], 'rb') as f:
+        assert f.read() == expected
+
+    # 두 번째 요청은 저장된 파일을 그대로 제공
+    requests_before = fixture_server.requests
+    assert client.get(f'/image/{key}').data == expected
+    assert fixture_server.requests == requests_before
+
+    metrics = client.get('/metrics').get_data(as_text=True)
+    assert 'web_scraper_lazy_images_total{store="stored"' in metrics
+
+
+def test_unknown_image_is_404():
+    assert app.test_client().get('/image/없는_폴더/없는_파일.png').status_code == 404
@@ -0,0 +1,89 @@
+"""검색 색인: 한국어 bigram 검색, 같은 URL 교체, FTS 문법 문자, 실패 집계"""
+
+import threading
+
+import pytest
+
+from web_scraper_search import SearchIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = SearchIndex(tmp_path / 'search.db')
+    yield index
+    index.close()
+
+
+def urls(found):
+    return [result['url'] for result in found['results']]
+
+
+def test_korean_bigrams_match_words_with_particles(index):
+    index.add_page('http://a/1', '청소년 센터', '방과 후 프로그램에 참여하세요.')
+    index.add_page('http://a/2', '공지', '도서관 휴관 안내')
+    index.flush()
+
+    assert urls(index.search('프로그램')) == ['http://a/1']
+    assert urls(index.search('청소년 프로그램')) == ['http://a/1']
+    assert urls(index.search('청소년 휴관')) == []
+    # 한 글자 검색어는 그 글자로 시작하는 토큰("청소")을 찾음
+    assert urls(index.search('청')) == ['http://a/1']
+
+
+def test_rescrape_replaces_previous_row(index):
+    index.add_page('http://a/1', '예전 제목', '폐강된 강좌 안내', tables=[[('장소', '본관')]])
+    index.flush()
+    index.add_page('http://a/1', '새 제목', '개설된 강좌 안내', tables=[[('장소', '별관')]])
+    index.flush()
+
+    assert index.stats()['documents'] == 1
+    assert index.search('폐강')['total'] == 0
+    assert index.search('본관')['total'] == 0
+    found = index.search('개설')
+    assert found['total'] == 1 and found['results'][0]['title'] == '새 제목'
+    assert index.search('별관')['total'] == 1
+    assert index.search('강좌')['total'] == 1
+
+
+@pytest.mark.parametrize('text', ['"', 'a"b', '*', 'pro*', '-', '-python', 'NOT', 'python NOT java',
+                                  'AND OR', '(', 'title:', 'NEAR(a b)', '^', '청"소'])
+def test_fts_syntax_characters_do_not_raise(index, text):
+    index.add_page('http://a/1', 'Python 강좌', 'python and java NOT only')
+    index.flush()
+    found = index.search(text)
+    assert found['total'] == len(found['results'])
+
+
+def test_failed_batch_is_counted(index):
+    index.add_page(None, '주소 없음', '색인할 수 없는 페이지')
+    index.flush()
+    index.add_page('http://a/1', '정상', '색인되는 페이지')
+    index.flush()
+
+    stats = index.stats()
+    assert stats['failed'] == 1
+    assert stats['indexed'] == 1
+    assert stats['documents'] == 1
+
+
+def test_failed_page_does_not_drop_its_batch(index, monkeypatch):
+    # 첫 페이지를 색인하는 동안 쓰기 스레드를 멈춰 나머지 세 페이지가 한 묶음(트랜잭션)이 되게 함
+    release = threading.Event()
+    index_document = index._index
+
+    def gated(db, document):
+        if document['url'] == 'http://a/0':
+            release.wait(5)
+        index_document(db, document)
+
+    monkeypatch.setattr(index, '_index', gated)
+    index.add_page('http://a/0', '대기', '쓰기 스레드를 잡아두는 페이지')
+    index.add_page('http://a/1', '앞 페이지', '먼저 들어온 정상 페이지')
+    index.add_page(None, '주소 없음', '색인할 수 없는 페이지')
+    index.add_page('http://a/2', '뒤 페이지', '나중에 들어온 정상 페이지')
+    release.set()
+    index.flush()
+
+    stats = index.stats()
+    assert (stats['indexed'], stats['failed'], stats['documents']) == (3, 1, 3)
+    assert sorted(urls(index.search('정상'))) == ['http://a/1', 'http://a/2']
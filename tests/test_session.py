@@ -0,0 +1,141 @@
+"""공유 세션 쿠키: 한 스크래핑 안에서는 유지하고 다른 스크래핑에는 보내지 않음"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from fixture_server import synthetic_png
+from web_app import WebScraper
+from web_scraper_session import get_session, keep_cookies, new_cookie_jar
+
+
+@pytest.fixture
+def cookie_server():
+    """/login?user=X는 sid=X 쿠키를 설정하고, /page는 쿠키 없이 같은 이미지를 보여줌 (이미지 요청의 Cookie 기록)"""
+    seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            extra = []
+            if parsed.path == '/img.png':
+                seen.append(self.headers.get('Cookie'))
+                body, content_type = synthetic_png('cookie', 2048), 'image/png'
+            else:
+                user = parse_qs(parsed.query).get('user', [None])[0]
+                if user:
+                    extra.append(('Set-Cookie', f'sid={user}; Path=/'))
+                body = ('<html><head><title>쿠키</title></head><body><h1>쿠키 확인</h1>'
+                        '<div class="content">로그인한 사용자만 볼 수 있는 이미지입니다.</div>'
+                        f'<img src="/img.png?{parsed.query}" alt="사진"></body></html>').encode('utf-8')
+                content_type = 'text/html; charset=utf-8'
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Cache-Control', 'no-store')
+            for name, value in extra:
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", seen
+    server.shutdown()
+    server.server_close()
+
+
+def test_cookies_stay_within_one_scrape(cookie_server):
+    base, seen = cookie_server
+
+    login = WebScraper(base).scrape_page(base + '/login?user=alice')
+    assert login['success'] and login['image_count'] == 1
+    assert seen == ['sid=alice']
+
+    # 같은 호스트의 공유 세션을 쓰는 다음 스크래핑에는 앞 사용자의 쿠키가 가지 않음
+    scraper = WebScraper(base)
+    assert scraper.session is get_session(base)
+    assert scraper.scrape_page(base + '/page?n=1')['success']
+    assert seen == ['sid=alice', None]
+    assert len(get_session(base).cookies) == 0
+
+    # 같은 스크래퍼를 다시 써도 스크래핑마다 새로 시작
+    scraper.scrape_page(base + '/login?user=bob')
+    scraper.scrape_page(base + '/page?n=2')
+    assert seen == ['sid=alice', None, 'sid=bob', None]
+
+
+@pytest.fixture
+def renewing_server():
+    """방문할 때마다 새 sid를 주는 캐시 가능한(ETag) 페이지
+
+    /page는 200과 304 모두 Set-Cookie를 붙이고, /plain은 304에만 붙임 (이미지 요청의 Cookie 기록)
+    """
+    seen = []
+    issued = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = urlparse(self.path).path
+            if path == '/img.png':
+                seen.append(self.headers.get('Cookie'))
+                self.send_response(200)
+                self.send_header('Content-Type', 'image/png')
+                self.send_header('Cache-Control', 'no-store')
+                body = synthetic_png('renew', 2048)
+            else:
+                issued.append(f'sid={len(issued) + 1}')
+                revalidated = self.headers.get('If-None-Match') == '"v1"'
+                self.send_response(304 if revalidated else 200)
+                self.send_header('ETag', '"v1"')
+                self.send_header('Cache-Control', 'no-cache')
+                if path == '/page' or revalidated:
+                    self.send_header('Set-Cookie', f'{issued[-1]}; Path=/')
+                body = b'' if revalidated else (
+                    '<html><head><title>세션</title></head><body><h1>세션 갱신</h1>'
+                    '<div class="content">방문할 때마다 세션이 새로 발급되는 페이지입니다.</div>'
+                    '<img src="/img.png" alt="사진"></body></html>').encode('utf-8')
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+            if body:
+                self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", seen, issued
+    server.shutdown()
+    server.server_close()
+
+
+def test_cacheable_page_still_delivers_its_cookie(renewing_server):
+    base, seen, issued = renewing_server
+
+    for _ in range(2):
+        assert WebScraper(base).scrape_page(base + '/page')['image_count'] == 1
+    # 쿠키를 설정한 페이지는 캐시하지 않으므로 두 번째 스크래핑도 새 세션 쿠키로 이미지를 받음
+    assert seen == ['sid=1', 'sid=2'] == issued
+
+
+def test_set_cookie_on_304_reaches_the_scrape_jar(renewing_server):
+    base, seen, issued = renewing_server
+    session = get_session(base)
+
+    first = session.get(base + '/plain', cookies=new_cookie_jar(), timeout=10)
+    assert first.cache_status == 'miss' and not first.cookies
+    first.content
+
+    jar = new_cookie_jar()
+    second = session.get(base + '/plain', cookies=jar, timeout=10)
+    keep_cookies(jar, second)
+    assert second.cache_status == 'revalidated'
+    assert second.text == first.text
+    assert jar.get('sid') == issued[-1].split('=')[1]
@@ -0,0 +1,204 @@
+"""도메인별 방법 기록 (StrategyTable) 선택/재시도/저장"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import web_scraper_strategy
+from web_scraper_strategy import StrategyTable, classify
+
+URL = 'http://example.com/notice/1'
+
+
+def make_table(tmp_path, **kwargs):
+    kwargs.setdefault('flush_interval', 0)
+    return StrategyTable(tmp_path / 'strategies.json', **kwargs)
+
+
+def test_plan_unknown_host(tmp_path):
+    assert make_table(tmp_path).plan(URL) == (['requests', 'selenium'], False)
+
+
+def test_plan_host_needing_browser(tmp_path):
+    table = make_table(tmp_path)
+    table.record(URL, [('requests', 'empty', 0.01), ('selenium', 'success', 0.5)])
+
+    assert table.plan(URL) == (['selenium', 'requests'], False)
+    assert table.plan('http://other.com/') == (['requests', 'selenium'], False)
+    assert table.stats()['hosts']['example.com']['preferred'] == 'selenium'
+
+
+def test_plan_without_selenium(tmp_path):
+    table = make_table(tmp_path)
+    table.record(URL, [('requests', 'empty', 0.01), ('selenium', 'success', 0.5)])
+
+    assert table.plan(URL, available=('requests',)) == (['requests'], False)
+
+
+def test_one_timeout_keeps_working_method(tmp_path):
+    table = make_table(tmp_path)
+    table.record(URL, [('requests', 'success', 0.02)])
+    table.record(URL, [('requests', 'timeout', 3.0), ('selenium', 'success', 0.5)])
+    assert table.plan(URL)[0][0] == 'requests'
+
+    table.record(URL, [('requests', 'timeout', 3.0), ('selenium', 'success', 0.5)])
+    assert table.plan(URL)[0][0] == 'selenium'
+
+
+def test_should_fallback(tmp_path):
+    table = make_table(tmp_path)
+
+    assert table.should_fallback(URL, 'timeout', 'selenium')
+    assert table.should_fallback(URL, 'empty', 'selenium')
+    assert not table.should_fallback(URL, 'error', 'selenium')
+    assert not table.should_fallback(URL, 'success', 'selenium')
+
+    # 다음 방법도 마지막에 빈 추출이었으면 페이지 자체가 비어 있는 것
+    table.record(URL, [('requests', 'empty', 0.01), ('selenium', 'empty', 0.5)])
+    assert not table.should_fallback(URL, 'empty', 'selenium')
+    assert table.should_fallback(URL, 'timeout', 'selenium')
+
+
+def test_empty_everywhere_is_not_a_failure(tmp_path):
+    table = make_table(tmp_path)
+    table.record(URL, [('requests', 'empty', 0.01), ('selenium', 'empty', 0.5)])
+    table.record(URL, [('requests', 'empty', 0.01)])
+
+    state = table.stats()['hosts']['example.com']['strategies']['requests']
+    assert state['failures'] == 0
+    assert state['empty'] == 2
+    assert state['latency'] is not None
+    assert table.plan(URL)[0][0] == 'requests'
+
+
+def test_empty_when_other_method_found_content_is_a_failure(tmp_path):
+    table = make_table(tmp_path)
+    table.record(URL, [('requests', 'empty', 0.01), ('selenium', 'success', 0.5)])
+
+    state = table.stats()['hosts']['example.com']['strategies']['requests']
+    assert state['failures'] == 1
+    assert state['latency'] is None
+
+
+def test_reprobe_after_interval(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(web_scraper_strategy.time, 'time', lambda: now[0])
+    table = make_table(tmp_path, reprobe_interval=60)
+    table.record(URL, [('requests', 'empty', 0.01), ('selenium', 'success', 0.5)])
+
+    now[0] += 59
+    assert table.plan(URL) == (['selenium', 'requests'], False)
+    now[0] += 1
+    assert table.plan(URL) == (['requests', 'selenium'], True)
+    # 같은 간격 안의 다른 요청은 다시 시도하지 않음
+    assert table.plan(URL) == (['selenium', 'requests'], False)
+    assert table.stats()['probes'] == 1
+
+
+def test_load_save_round_trip(tmp_path):
+    table = make_table(tmp_path)
+    table.record(URL, [('requests', 'timeout', 3.0), ('selenium', 'success', 0.5)])
+    table.record(URL, [('requests', 'timeout', 3.0), ('selenium', 'success', 0.7)])
+
+    with open(tmp_path / 'strategies.json', encoding='utf-8') as f:
+        assert set(json.load(f)) == {'example.com'}
+    loaded = make_table(tmp_path)
+    assert loaded.stats()['hosts'] == table.stats()['hosts']
+    assert loaded.plan(URL)[0][0] == 'selenium'
+
+    assert loaded.forget('EXAMPLE.com')
+    assert make_table(tmp_path).stats()['host_count'] == 0
+
+
+def test_flush_is_deferred(tmp_path):
+    table = make_table(tmp_path, flush_interval=3600)
+    table.record(URL, [('requests', 'success', 0.02)])
+    timer = table.flush_timer
+    timer.cancel()
+    assert not (tmp_path / 'strategies.json').exists()
+
+    table.flush()
+    assert table.flush_timer is None
+    assert make_table(tmp_path).stats()['host_count'] == 1
+
+
+def test_classify():
+    assert classify({'success': True, 'text_content': '**원본 URL**: x\n\n# 제목\n본문 내용', 'image_count': 0}) == 'success'
+    assert classify({'success': True, 'text_content': '**원본 URL**: x\n\n# 제목\n', 'image_count': 0}) == 'empty'
+    assert classify({'success': True, 'text_content': '', 'image_count': 2}) == 'success'
+    assert classify({'success': False, 'error': '연결 시간 초과: 서버에 연결할 수 없습니다.'}) == 'timeout'
+    assert classify({'success': False, 'error': 'HTTP 오류 (404): Not Found'}) == 'error'
+
+
+class FakeSeleniumScraper:
+    """브라우저 없이 본문이 그려진 결과를 돌려주는 Selenium 스크래퍼 대역"""
+    calls = []
+
+    def __init__(self, url):
+        pass
+
+    def scrape_page(self, url):
+        FakeSeleniumScraper.calls.append(url)
+        return {'success': True, 'folder_path': None, 'text_content': f'**원본 URL**: {url}\n\n# 제목\n그려진 본문',
+                'image_count': 0, 'images': []}
+
+
+@pytest.fixture
+def web_app_routing(tmp_path, monkeypatch):
+    import web_app
+    FakeSeleniumScraper.calls = []
+    monkeypatch.setattr(web_app, 'selenium_scraper', FakeSeleniumScraper)
+    monkeypatch.setattr(web_app, 'strategy_table', make_table(tmp_path))
+    return web_app
+
+
+@pytest.fixture(scope='module')
+def script_page_server():
+    """본문을 JavaScript로 그리는 (HTML에는 빈 틀만 있는) 페이지"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = b'<html><head><title>app</title></head><body><div id="app"></div></body></html>'
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_scrape_url_keeps_requests_for_static_pages(web_app_routing, fixture_server):
+    url = fixture_server.url + '/notice/10'
+    result = web_app_routing.scrape_url(url)
+
+    assert result['success'] and 'method' not in result
+    assert result['strategy']['attempts'] == [
+        {'method': 'requests', 'outcome': 'success', 'seconds': result['strategy']['attempts'][0]['seconds']}]
+    assert FakeSeleniumScraper.calls == []
+
+
+def test_scrape_url_routes_script_pages_to_selenium(web_app_routing, script_page_server):
+    first = web_app_routing.scrape_url(script_page_server + '/page/1')
+    assert first['method'] == 'selenium_auto_fallback'
+    assert [attempt['outcome'] for attempt in first['strategy']['attempts']] == ['empty', 'success']
+
+    second = web_app_routing.scrape_url(script_page_server + '/page/2')
+    assert second['method'] == 'selenium_auto'
+    assert [attempt['method'] for attempt in second['strategy']['attempts']] == ['selenium']
+    assert len(FakeSeleniumScraper.calls) == 2
+
+    client = web_app_routing.app.test_client()
+    stats = client.get('/scrape/strategies').get_json()
+    host = script_page_server.split('//')[1]
+    assert stats['hosts'][host]['preferred'] == 'selenium'
+    assert client.delete(f'/scrape/strategies/{host}').status_code == 200
+    assert client.delete(f'/scrape/strategies/{host}').status_code == 404
@@ -4,61 +4,132 @@
 Flask를 사용하여 웹 브라우저에서 사용할 수 있는 GUI 제공
 """
 
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file
 import os
 import re
 import requests
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
 import json
 from datetime import datetime
 from pathlib import Path
 import threading
 import time
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
+import queue
+import sqlite3
+from web_scraper_images import ImageDownloadPool, DEFAULT_MAX_WORKERS, DEFAULT_PER_HOST_LIMIT
+from web_scraper_session import get_session, new_cookie_jar, keep_cookies, get_registry, iter_body, IMAGE_HEADERS
+from web_scraper_cache import CacheStats
+from web_scraper_store import StoreStats, get_image_store
+from web_scraper_jobs import JobManager, JobQueueFull
+from web_scraper_image_index import ImageIndex
+from web_scraper_results import ResultCache, SingleFlight, normalize_url
+from web_scraper_db import get_scrape_database, page_record
+from web_scraper_search import get_search_index, index_page
+from web_scraper_metrics import PhaseTimer, get_metrics
+from web_scraper_extract import extract_page, format_styled_text, image_alt, StreamingPageParser
+from web_scraper_image_policy import ImagePolicy, ImageSkipped, SkippedImages
+from web_scraper_strategy import OUTCOMES, OUTCOME_SUCCESS, classify, get_strategy_table
 
 app = Flask(__name__)
 
+# 백그라운드 작업 설정
+JOB_WORKERS = 4
+JOB_QUEUE_SIZE = 100
+JOB_TTL = 3600  # 완료된 작업 보관 시간 (초)
+
+# Selenium 드라이버 풀 설정
+SELENIUM_POOL_SIZE = 2
+SELENIUM_MAX_USES = 50  # 이 횟수만큼 사용한 브라우저는 새로 띄움
+SELENIUM_READY_MAX_WAIT = 8.0  # 페이지 준비 대기 상한 (초)
+# 사이트별로 기다릴 CSS 선택자 (예: {'r.yongsanyouthtown.or.kr': '.board_view'})
+SELENIUM_SITE_SELECTORS = {}
+# 브라우저가 받은 이미지 본문을 그대로 저장 (False면 모든 이미지를 requests로 다시 받음)
+SELENIUM_CAPTURE_IMAGES = True
+# 글꼴/동영상/오디오 요청을 막아 페이지 로드를 줄임
+SELENIUM_BLOCK_ASSETS = False
+
+# 스트리밍 모드에서 한 번에 읽어 파서에 넘기는 크기
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# 페이지별 폴더 대신 SQLite 스크래핑 데이터베이스에 저장할지 여부 (requests 방식만 해당)
+# 저장 위치는 ~/.web_scraper/scrapes.db이며 /pages/<id>/export로 폴더를 만들 수 있음
+USE_SCRAPE_DATABASE = False
+
+# 스크래핑 결과 캐시 설정 (같은 URL은 이 시간 동안 다시 스크래핑하지 않음)
+RESULT_CACHE_TTL = 600  # 초
+RESULT_CACHE_MAX_ENTRIES = 256
+RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# /scrape/stream 연결 유지용 주석을 보내는 간격 (초)
+SSE_HEARTBEAT = 15
+
+# /image 응답을 브라우저가 다시 묻지 않고 쓰는 시간 (초, 이후에는 ETag로 재검증)
+IMAGE_MAX_AGE = 24 * 3600
+
+# 이미지 다운로드 정책 (이보다 크거나, 가로/세로가 작거나, 허용하지 않은 형식이면 받는 도중 중단)
+IMAGE_MAX_BYTES = 10 * 1024 * 1024
+IMAGE_MIN_SIZE = 16
+IMAGE_TYPES = ['image/jpeg', 'image/png', 'image/gif', 'image/webp', 'image/avif', 'image/bmp', 'image/svg+xml']
+
+# 요청에 lazy_images가 없을 때 기본값 (True면 이미지를 미리 받지 않고 /image로 처음 볼 때 받음)
+LAZY_IMAGES = False
+
+def default_image_policy():
+    """설정값으로 만든 이미지 다운로드 정책"""
+    return ImagePolicy(max_bytes=IMAGE_MAX_BYTES, min_width=IMAGE_MIN_SIZE, min_height=IMAGE_MIN_SIZE,
+                       allowed_types=IMAGE_TYPES)
+
+def output_roots():
+    """스크래핑 폴더를 만들 위치 후보 (앞에서부터 시도)"""
+    return [
+        Path.home() / "Desktop",
+        Path.home() / "Desktop" / "Downloads",
+        Path.cwd() / "downloads",
+        Path("/tmp") / "web_scraper_downloads"
+    ]
+
 class WebScraper:
-    def __init__(self, base_url):
+    def __init__(self, base_url, max_workers=DEFAULT_MAX_WORKERS, per_host_limit=DEFAULT_PER_HOST_LIMIT,
+                 progress_callback=None, stream=False, image_store=None, database=None, image_policy=None,
+                 lazy_images=False):
         self.base_url = base_url
-        self.session = requests.Session()
-        
-        # 재시도 전략 설정
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS"]
-        )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
-        
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        })
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        # 진행 상황 알림 콜백: progress_callback(stage, **info)
+        self.progress_callback = progress_callback
+        # 응답을 받는 대로 파싱하고 이미지를 바로 내려받을지 여부
+        self.stream = stream
+        # 호스트별 공유 세션 사용 (재시도 전략과 커넥션 풀은 레지스트리에서 설정)
+        self.session = get_session(base_url)
+        # HTTP 캐시 적중 집계 (scrape_page마다 새로 시작)
+        self.cache_stats = CacheStats()
+        # 이 스크래핑에서 받은 쿠키 (공유 세션에는 남기지 않으므로 다른 스크래핑에 보내지 않음)
+        self.cookies = new_cookie_jar()
+        # 이미지는 내용 주소 저장소에 한 번만 저장하고 폴더에는 하드 링크
+        self.image_store = image_store or get_image_store()
+        self.store_stats = StoreStats()
+        # 지정하면 폴더 대신 SQLite 스크래핑 데이터베이스(ScrapeDatabase)에 저장
+        self.database = database
+        # 정책에 맞지 않는 이미지는 받는 도중 중단하고 기록 (scrape_page마다 새로 시작)
+        self.image_policy = image_policy or default_image_policy()
+        self.skipped_images = SkippedImages()
+        # 이미지는 URL과 저장할 경로만 기록하고 /image로 처음 요청될 때 받음 (데이터베이스 저장 시에는 미리 받음)
+        self.lazy_images = lazy_images and database is None
         # 타임아웃 설정 조정 (더 짧게)
         self.timeout = (3, 10)  # (연결 타임아웃, 읽기 타임아웃)
         
+    def report(self, stage, **info):
+        """진행 상황 알림 (콜백 오류는 스크래핑에 영향 주지 않음)"""
+        if self.progress_callback:
+            try:
+                self.progress_callback(stage, **info)
+            except Exception as e:
+                print(f"진행 상황 콜백 오류: {e}")
+    
     def create_folder(self, folder_name):
         """데스크탑에 폴더 생성"""
         # 여러 경로 시도
-        possible_paths = [
-            Path.home() / "Desktop",
-            Path.home() / "Desktop" / "Downloads",
-            Path.cwd() / "downloads",
-            Path("/tmp") / "web_scraper_downloads"
-        ]
-        
-        for base_path in possible_paths:
+        for base_path in output_roots():
             try:
                 folder_path = base_path / folder_name
                 print(f"폴더 생성 시도: {folder_path}")
@@ -91,29 +162,57 @@ class WebScraper:
         print(f"최종 대안 경로로 폴더 생성: {fallback_path}")
         return fallback_path
     
+    def image_url(self, img_url):
+        """이미지 src를 절대 URL로 변환"""
+        if img_url.startswith('//'):
+            return 'https:' + img_url
+        if img_url.startswith('/'):
+            return urljoin(self.base_url, img_url)
+        if not img_url.startswith(('http://', 'https://')):
+            return urljoin(self.base_url, '/' + img_url.lstrip('/'))
+        return img_url
+    
+    def lazy_image_path(self, img_url, folder_path, img_name):
+        """지연 이미지를 저장할 경로 (Content-Type을 아직 모르므로 확장자는 URL에서)"""
+        file_ext = os.path.splitext(urlparse(img_url).path)[1] or '.jpg'
+        safe_name = re.sub(r'[^\w\-_\.]', '_', img_name)
+        return folder_path / "images" / f"{safe_name}{file_ext}"
+    
+    def fetch_lazy_image(self, img_url, file_path):
+        """지연 이미지 원본을 받아 정해 둔 경로에 저장하고 (크기, 저장소 상태, 캐시 상태) 반환
+
+        정책에 맞지 않으면 ImageSkipped가 발생합니다. 캐시 상태는 'hit'/'revalidated'/'miss'
+        (HTTP 캐시를 쓰지 않으면 'none')입니다.
+        """
+        img_url = self.image_url(img_url)
+        print(f"지연 이미지 다운로드: {img_url}")
+        headers = {**IMAGE_HEADERS, 'Referer': self.base_url}
+        response = get_session(img_url).get(img_url, headers=headers, cookies=self.cookies,
+                                            timeout=self.timeout, stream=True)
+        self.cache_stats.record(response)
+        keep_cookies(self.cookies, response)
+        response.raise_for_status()
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        digest, size, status = self.image_policy.save_response(self.image_store, img_url, response, file_path)
+        self.store_stats.record(status)
+        cache_status = getattr(response, 'cache_status', None) or 'none'
+        print(f"지연 이미지 저장 완료: {file_path} (크기: {size} bytes, 저장소: {status}, 캐시: {cache_status})")
+        return size, status, cache_status
+    
     def download_image(self, img_url, folder_path, img_name):
         """이미지 다운로드"""
         try:
             # 절대 URL로 변환
-            if img_url.startswith('//'):
-                img_url = 'https:' + img_url
-            elif img_url.startswith('/'):
-                img_url = urljoin(self.base_url, img_url)
-            elif not img_url.startswith(('http://', 'https://')):
-                img_url = urljoin(self.base_url, '/' + img_url.lstrip('/'))
+            img_url = self.image_url(img_url)
             
             print(f"이미지 다운로드 시도: {img_url}")
             
-            # 이미지 다운로드용 세션 생성
-            img_session = requests.Session()
-            img_session.headers.update({
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
-                'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8',
-                'Referer': self.base_url
-            })
-            
-            response = img_session.get(img_url, timeout=self.timeout, stream=True)
+            # 이미지 호스트의 공유 세션 사용 (keep-alive 연결 재사용)
+            headers = {**IMAGE_HEADERS, 'Referer': self.base_url}
+            response = get_session(img_url).get(img_url, headers=headers, cookies=self.cookies,
+                                                timeout=self.timeout, stream=True)
+            self.cache_stats.record(response)
+            keep_cookies(self.cookies, response)
             response.raise_for_status()
             
             # Content-Type 확인
@@ -136,6 +235,14 @@ class WebScraper:
                 if not file_ext:
                     file_ext = '.jpg'  # 기본값
             
+            if folder_path is None:
+                # 데이터베이스 저장 시에는 저장소에만 두고 데이터베이스가 쓰는 파일로 고정
+                digest, size, status = self.image_policy.save_response(
+                    self.image_store, img_url, response, ref=self.database.path)
+                self.store_stats.record(status)
+                print(f"이미지 저장 완료: {digest} (크기: {size} bytes)")
+                return str(self.image_store.blob_path(digest)) if size else None
+            
             # 파일명 정리
             safe_name = re.sub(r'[^\w\-_\.]', '_', img_name)
             filename = f"{safe_name}{file_ext}"
@@ -147,11 +254,9 @@ class WebScraper:
                 images_folder.mkdir(parents=True, exist_ok=True)
                 print(f"images 폴더 생성: {images_folder}")
             
-            # 이미지 데이터 저장
-            with open(file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+            # 이미지 데이터 저장 (저장소에 한 번만 저장하고 링크, 바뀌지 않은 이미지는 본문을 다시 쓰지 않음)
+            digest, size, status = self.image_policy.save_response(self.image_store, img_url, response, file_path)
+            self.store_stats.record(status)
             
             # 파일 크기 확인
             file_size = os.path.getsize(file_path)
@@ -163,50 +268,36 @@ class WebScraper:
             
             return str(file_path)
             
+        except ImageSkipped as e:
+            self.skipped_images.record(img_url, img_name, e)
+            return None
         except Exception as e:
             print(f"이미지 다운로드 실패: {img_url} - {e}")
             return None
     
-    def extract_text_with_styling(self, soup, url=None):
-        """텍스트를 스타일과 함께 추출"""
-        styled_text = []
-        
-        # URL 정보 추가
-        if url:
-            styled_text.append(f"**원본 URL**: {url}")
-            styled_text.append("")
-        
-        # 제목 추출
-        title = soup.find('h1') or soup.find('h2') or soup.find('h3')
-        if title:
-            styled_text.append(f"# {title.get_text().strip()}")
-        
-        # 테이블 정보 추출
-        tables = soup.find_all('table')
-        for table in tables:
-            styled_text.append("## 프로그램 정보")
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 2:
-                    key = cells[0].get_text().strip()
-                    value = cells[1].get_text().strip()
-                    styled_text.append(f"**{key}**: {value}")
-            styled_text.append("")
-        
-        # 본문 내용 추출
-        content_divs = soup.find_all(['div', 'p'], class_=re.compile(r'content|body|main'))
-        for div in content_divs:
-            text = div.get_text().strip()
-            if text and len(text) > 10:
-                lines = text.split('\n')
-                for line in lines:
-                    line = line.strip()
-                    if line:
-                        styled_text.append(line)
-                styled_text.append("")
-        
-        return '\n'.join(styled_text)
+    def extract_text_with_styling(self, content, url=None):
+        """텍스트를 스타일과 함께 추출 (content는 extract_page의 PageContent)"""
+        return format_styled_text(content, url)
+    
+    def fetch_streaming(self, url, on_title, on_image, phases=None):
+        """응답을 청크 단위로 받으며 파싱 (이미지/제목 콜백은 태그가 파싱되는 즉시 호출)"""
+        phases = phases or PhaseTimer()
+        response = self.session.get(url, cookies=self.cookies, timeout=self.timeout, stream=True)
+        phases.add('connect', response.elapsed.total_seconds())
+        self.cache_stats.record(response)
+        keep_cookies(self.cookies, response)
+        try:
+            response.raise_for_status()
+            parser = StreamingPageParser(on_image=on_image, on_title=on_title)
+            for chunk in iter_body(response, STREAM_CHUNK_SIZE):
+                with phases.phase('parse'):
+                    parser.feed(chunk)
+            with phases.phase('parse'):
+                content = parser.close()
+            self.report('page_fetched', status_code=response.status_code, bytes=parser.bytes_read)
+            return content, parser.bytes_read
+        finally:
+            response.close()
     
     def scrape_page(self, url):
         """웹페이지 스크래핑"""
@@ -216,54 +307,146 @@ class WebScraper:
                 url = 'https://' + url
             
             print(f"요청 URL: {url}")
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # 단계별 소요 시간/바이트 수 (결과와 metadata.json의 phases, bytes)
+            phases = PhaseTimer()
+            started = phases.started
+            self.cache_stats = CacheStats()
+            self.cookies = new_cookie_jar()
+            self.store_stats = StoreStats()
+            self.skipped_images = SkippedImages()
+            page = {'first_image': None, 'lazy': []}
             
-            # 페이지 제목 추출
-            page_title = soup.find('title')
-            if page_title:
-                title = page_title.get_text().strip()
-            else:
-                title = "웹페이지_스크래핑"
-            
-            # 폴더명 생성
-            safe_title = re.sub(r'[^\w\-_\.]', '_', title)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            folder_name = f"{safe_title}_{timestamp}"
-            
-            # 폴더 생성
-            folder_path = self.create_folder(folder_name)
-            
-            # 텍스트 정보 추출
-            styled_text = self.extract_text_with_styling(soup, url)
+            def open_folder(page_title):
+                # 페이지 제목 추출
+                if page_title is not None:
+                    title = page_title
+                else:
+                    title = "웹페이지_스크래핑"
+                
+                # 폴더명 생성
+                safe_title = re.sub(r'[^\w\-_\.]', '_', title)
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                folder_name = f"{safe_title}_{timestamp}"
+                
+                # 폴더 생성 (데이터베이스에 저장할 때는 만들지 않음)
+                page['title'] = title
+                page['folder_name'] = folder_name
+                with phases.phase('write'):
+                    page['folder'] = None if self.database else self.create_folder(folder_name)
             
-            # 텍스트 파일로 저장
-            text_file = folder_path / "content.txt"
-            with open(text_file, 'w', encoding='utf-8') as f:
-                f.write(styled_text)
+            # 이미지 병렬 다운로드 (결과는 문서 순서대로 모음)
+            image_count = {'done': 0, 'total': 0}
+            image_lock = threading.Lock()
             
-            # 마크다운 파일로도 저장
-            md_file = folder_path / "content.md"
-            with open(md_file, 'w', encoding='utf-8') as f:
-                f.write(styled_text)
+            def download_and_report(img_src, folder_path, img_alt):
+                img_path = self.download_image(img_src, folder_path, img_alt)
+                with image_lock:
+                    image_count['done'] += 1
+                    done, total = image_count['done'], image_count['total']
+                self.report('image_saved', images_done=done, images_total=total,
+                            original_url=img_src, local_path=img_path, alt_text=img_alt)
+                return img_path
             
-            # 이미지 추출 및 다운로드
-            images = soup.find_all('img')
-            image_info = []
+            pool = ImageDownloadPool(download_and_report, self.base_url,
+                                     self.max_workers, self.per_host_limit)
             
-            for i, img in enumerate(images):
-                img_src = img.get('src')
+            def submit_image(index, img_src, img_alt):
                 if img_src:
-                    img_alt = img.get('alt', f'image_{i+1}')
-                    img_path = self.download_image(img_src, folder_path, img_alt)
+                    if page['first_image'] is None:
+                        page['first_image'] = round(time.perf_counter() - started, 3)
+                    img_alt = image_alt(index, img_alt)
+                    if self.stream:
+                        # 스트리밍 모드에서는 전체 개수를 미리 알 수 없으므로 지금까지 발견한 수
+                        with image_lock:
+                            image_count['total'] += 1
+                    if self.lazy_images:
+                        page['lazy'].append((img_src, img_alt))
+                    else:
+                        pool.submit((img_src, img_alt), img_src, page['folder'], img_alt)
+            
+            with pool:
+                if self.stream:
+                    # 파싱 도중 제목이 확정되면 폴더를 만들고 <img>마다 바로 다운로드 시작
+                    content, page_bytes = self.fetch_streaming(url, open_folder, submit_image, phases)
+                    fetched = time.perf_counter()
+                    # 파싱(폴더 생성 포함)과 겹친 시간을 뺀 본문 수신 시간
+                    done = phases.phases_dict()
+                    phases.add('page_body', fetched - started - done['connect'] - done['parse'] - done.get('write', 0))
+                else:
+                    response = self.session.get(url, cookies=self.cookies, timeout=self.timeout)
+                    self.cache_stats.record(response)
+                    keep_cookies(self.cookies, response)
+                    response.raise_for_status()
+                    fetched = time.perf_counter()
+                    page_bytes = len(response.content)
+                    phases.add('connect', response.elapsed.total_seconds())
+                    phases.add('page_body', fetched - started - response.elapsed.total_seconds())
+                    self.report('page_fetched', status_code=response.status_code, bytes=page_bytes)
+                    
+                    # 제목/본문/이미지를 한 번의 순회로 추출
+                    with phases.phase('parse'):
+                        content = extract_page(response.content)
+                    open_folder(content.title)
+                    image_count['total'] = len(content.image_list())
+                    for index, (img_src, img_alt) in enumerate(content.images):
+                        submit_image(index, img_src, img_alt)
+                
+                title = page['title']
+                folder_path = page['folder']
+                
+                # 텍스트 정보 추출
+                with phases.phase('format'):
+                    styled_text = self.extract_text_with_styling(content, url)
+                extracted = time.perf_counter()
+                self.report('text_extracted', title=title, text_content=styled_text)
+                
+                if self.database:
+                    text_file = md_file = None
+                else:
+                    with phases.phase('write'):
+                        # 텍스트 파일로 저장 (그동안 이미지는 계속 내려받음)
+                        text_file = folder_path / "content.txt"
+                        with open(text_file, 'w', encoding='utf-8') as f:
+                            f.write(styled_text)
+                        
+                        # 마크다운 파일로도 저장
+                        md_file = folder_path / "content.md"
+                        with open(md_file, 'w', encoding='utf-8') as f:
+                            f.write(styled_text)
+                
+                image_info = []
+                for (img_src, img_alt), img_path in pool.gather():
                     if img_path:
                         image_info.append({
                             'original_url': img_src,
                             'local_path': img_path,
                             'alt_text': img_alt
                         })
+                for img_src, img_alt in page['lazy']:
+                    image_info.append({
+                        'original_url': img_src,
+                        'local_path': str(self.lazy_image_path(img_src, folder_path, img_alt)),
+                        'alt_text': img_alt,
+                        'lazy': True
+                    })
+                image_summary = pool.summary()
+            
+            phases.add('images', image_summary['images_wall'])
+            phases.count('page', page_bytes)
+            phases.count('images', sum(os.path.getsize(info['local_path']) for info in image_info
+                                       if not info.get('lazy')))
+            phases.count('text', len(styled_text.encode('utf-8')))
+            
+            # 페이지별 타이밍 요약
+            timing = {
+                'page_fetch': round(fetched - started, 3),
+                'extract': round(extracted - fetched, 3),
+                'first_image': page['first_image'],
+                **image_summary,
+                'total': round(time.perf_counter() - started, 3)
+            }
+            print(f"스크래핑 소요 시간: 전체 {timing['total']}초 (페이지 {timing['page_fetch']}초, "
+                  f"이미지 {timing['images_wall']}초 / 개별 합계 {timing['images_sum']}초)")
             
             # 메타데이터 저장
             metadata = {
@@ -271,22 +454,45 @@ class WebScraper:
                 'title': title,
                 'scraped_at': datetime.now().isoformat(),
                 'images': image_info,
-                'text_file': str(text_file),
-                'markdown_file': str(md_file)
+                'text_file': str(text_file) if text_file else None,
+                'markdown_file': str(md_file) if md_file else None,
+                'streamed': self.stream,
+                'lazy_images': self.lazy_images,
+                'timing': timing,
+                'phases': phases.phases_dict(),
+                'bytes': phases.bytes_dict(),
+                'cache': self.cache_stats.to_dict(),
+                'image_store': self.store_stats.to_dict(),
+                'skipped_images': self.skipped_images.to_list()
             }
             
-            metadata_file = folder_path / "metadata.json"
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, ensure_ascii=False, indent=2)
-            
-            return {
+            result = {
                 'success': True,
-                'folder_path': str(folder_path),
+                'folder_path': str(folder_path) if folder_path else None,
                 'text_content': styled_text,
                 'image_count': len(image_info),
-                'images': image_info
+                'images': image_info,
+                'skipped_images': metadata['skipped_images'],
+                'timing': timing
             }
             
+            with phases.phase('write'):
+                if self.database:
+                    result['page_id'] = self.database.save_page(page_record(
+                        url, title, page['folder_name'], styled_text, content, image_info, metadata))
+                    location = f"page:{result['page_id']}"
+                else:
+                    metadata_file = folder_path / "metadata.json"
+                    with open(metadata_file, 'w', encoding='utf-8') as f:
+                        json.dump(metadata, f, ensure_ascii=False, indent=2)
+                    location = folder_path
+            index_page(url, title, styled_text, content.tables, location, metadata['scraped_at'])
+            
+            # metadata.json에는 그 파일을 쓰기 전까지의 단계가 기록됨
+            result['phases'] = phases.phases_dict()
+            result['bytes'] = phases.bytes_dict()
+            return result
+            
         except requests.exceptions.ConnectTimeout:
             return {
                 'success': False,
@@ -317,62 +523,393 @@ class WebScraper:
 def index():
     return render_template('index.html')
 
+# 스크래핑 폴더 이미지 색인 ("폴더명/파일명" → 경로, 처음 조회할 때 디스크에서 생성)
+image_index = ImageIndex(output_roots())
+# 같은 지연 이미지를 동시에 처음 요청하면 원본은 한 번만 받음
+lazy_image_flights = SingleFlight()
+
+def fetch_lazy_image(key):
+    """아직 받지 않은 지연 이미지면 원본을 받아 스크래핑 폴더에 저장하고 경로 반환 (아니면 None)"""
+    entry = image_index.pending(key)
+    if entry is None:
+        return None
+    path, img_url, referer = entry
+    
+    def fetch():
+        if not path.is_file():
+            size, status, cache_status = WebScraper(referer or img_url).fetch_lazy_image(img_url, path)
+            scrape_metrics.record_lazy_image(status, cache_status, size)
+        image_index.add(path)
+        return path
+    
+    try:
+        return lazy_image_flights.do(key, fetch)[0]
+    except ImageSkipped:
+        # 정책에 맞지 않는 이미지는 다시 요청해도 받지 않음
+        image_index.forget_lazy(key)
+        raise
+
 @app.route('/image/<path:filename>')
 def serve_image(filename):
-    """이미지 파일 서빙"""
+    """이미지 파일 서빙 (filename은 "폴더명/파일명" 또는 예전 방식의 파일명)
+
+    지연 이미지(lazy_images)는 처음 요청될 때 원본을 받아 저장한 뒤 그 파일을 제공합니다.
+    """
     try:
-        # 데스크탑에서 이미지 파일 찾기
-        desktop_path = Path.home() / "Desktop"
-        
-        # 모든 하위 폴더에서 이미지 파일 검색
-        for folder in desktop_path.glob("*"):
-            if folder.is_dir():
-                image_path = folder / "images" / filename
-                if image_path.exists():
-                    return send_file(str(image_path))
-        
-        return "이미지를 찾을 수 없습니다.", 404
+        image_path = image_index.lookup(filename) or fetch_lazy_image(filename)
+        if image_path is None:
+            return "이미지를 찾을 수 없습니다.", 404
+        # ETag/Last-Modified로 조건부 요청에 304 응답
+        return send_file(str(image_path), max_age=IMAGE_MAX_AGE, etag=True, conditional=True)
+    except ImageSkipped as e:
+        return f"이미지를 받지 않았습니다: {e}", 404
+    except requests.exceptions.RequestException as e:
+        return f"원본 이미지를 가져올 수 없습니다: {str(e)}", 502
     except Exception as e:
         return f"이미지 로드 오류: {str(e)}", 500
 
+def selenium_scraper(url):
+    """공유 드라이버 풀을 사용하는 Selenium 스크래퍼 생성"""
+    from web_scraper_selenium import SeleniumWebScraper, get_driver_pool
+    from web_scraper_readiness import ReadinessPolicy
+    pool = get_driver_pool(size=SELENIUM_POOL_SIZE, max_uses=SELENIUM_MAX_USES)
+    readiness = ReadinessPolicy(max_wait=SELENIUM_READY_MAX_WAIT, site_selectors=SELENIUM_SITE_SELECTORS)
+    return SeleniumWebScraper(url, driver_pool=pool, readiness=readiness, image_policy=default_image_policy(),
+                              capture_images=SELENIUM_CAPTURE_IMAGES, block_assets=SELENIUM_BLOCK_ASSETS)
+
+# 정규화한 URL별 최근 스크래핑 결과
+result_cache = ResultCache(ttl=RESULT_CACHE_TTL, max_entries=RESULT_CACHE_MAX_ENTRIES,
+                           max_bytes=RESULT_CACHE_MAX_BYTES)
+# 같은 URL을 동시에 스크래핑하는 요청은 하나로 합침
+scrape_flights = SingleFlight()
+# 방법/호스트/단계별 누적 지표 (/metrics)
+scrape_metrics = get_metrics()
+# 도메인별로 잘 되는 스크래핑 방법 (requests/Selenium) 기록
+strategy_table = get_strategy_table()
+
+def scrape_method(result, use_selenium=False, use_async=False, use_stream=False):
+    """지표용 스크래핑 방법 이름 (결과에 method가 있으면 그대로 사용)"""
+    if result.get('method'):
+        return result['method']
+    if use_selenium:
+        return 'selenium'
+    if use_async:
+        return 'async'
+    return 'stream' if use_stream else 'requests'
+
+def run_scrape(url, use_selenium=False, use_async=False, use_stream=False, force_refresh=False, progress=None,
+               lazy_images=False):
+    """스크래핑 실행 (/scrape와 백그라운드 작업이 함께 사용)
+
+    최근에 같은 URL을 스크래핑했다면 저장된 결과를 돌려주며, force_refresh면 항상 새로 스크래핑합니다.
+    같은 URL을 이미 스크래핑 중이면 새로 시작하지 않고 그 결과(실패 포함)를 함께 받습니다.
+    lazy_images는 requests 방법(Selenium/asyncio 제외)에서만 적용됩니다.
+    """
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    
+    def report(stage, **info):
+        if progress:
+            progress(stage, **info)
+    
+    # Selenium 결과(스크린샷 포함), 이미지를 받지 않은 결과는 requests 결과와 따로 보관
+    lazy_images = bool(lazy_images) and not use_selenium and not use_async
+    if use_selenium:
+        kind = 'selenium'
+    else:
+        kind = 'lazy' if lazy_images else 'requests'
+    cache_key = (kind, normalize_url(url))
+    if not force_refresh:
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            scrape_metrics.record(scrape_method(cached, use_selenium, use_async, use_stream), url, cached,
+                                  outcome='cached')
+            print(f"저장된 결과 사용: {url} ({cached['folder_path']})")
+            report('result_cached', folder_path=cached['folder_path'])
+            return cached
+    
+    def scrape():
+        result = scrape_url(url, use_selenium=use_selenium, use_async=use_async, use_stream=use_stream,
+                            progress=progress, lazy_images=lazy_images)
+        scrape_metrics.record(scrape_method(result, use_selenium, use_async, use_stream), url, result)
+        if result.get('success'):
+            image_index.add_result(result, url)
+            result_cache.put(cache_key, result)
+        return result
+    
+    result, shared = scrape_flights.do(cache_key, scrape)
+    if shared:
+        scrape_metrics.record(scrape_method(result, use_selenium, use_async, use_stream), url, result,
+                              outcome='coalesced')
+        print(f"진행 중인 스크래핑 결과 사용: {url}")
+        report('result_shared', success=result.get('success'))
+        return dict(result, coalesced=True)
+    return result
+
+def scrape_url(url, use_selenium=False, use_async=False, use_stream=False, progress=None, lazy_images=False):
+    """선택한 방법으로 실제 스크래핑 실행
+
+    Selenium을 지정하지 않으면 도메인별 방법 기록에 따라 requests 또는 Selenium으로 바로 시작하고,
+    시간 초과나 빈 추출이면 다른 방법으로 다시 시도합니다. 시도 결과와 소요 시간은 기록에 반영됩니다.
+    """
+    def report(stage, **info):
+        if progress:
+            progress(stage, **info)
+    
+    def run(strategy):
+        if strategy == 'selenium':
+            report('selenium_started')
+            return selenium_scraper(url).scrape_page(url)
+        if use_async:
+            from web_scraper_async import scrape_page_sync
+            return scrape_page_sync(url, image_policy=default_image_policy())
+        database = get_scrape_database() if USE_SCRAPE_DATABASE else None
+        scraper = WebScraper(url, progress_callback=progress, stream=use_stream, database=database,
+                             lazy_images=lazy_images)
+        return scraper.scrape_page(url)
+    
+    if use_selenium:
+        started = time.perf_counter()
+        try:
+            result = run('selenium')
+        except ImportError:
+            return {
+                'success': False, 
+                'error': 'Selenium이 설치되지 않았습니다. pip install selenium을 실행해주세요.'
+            }
+        strategy_table.record(url, [('selenium', classify(result), time.perf_counter() - started)])
+        return result
+    
+    order, probe = strategy_table.plan(url)
+    if probe or order[0] != 'requests':
+        print(f"도메인 방법 기록에 따라 {order[0]}{' 다시 시도' if probe else ''}: {url}")
+        report('strategy_selected', method=order[0], probe=probe)
+    
+    attempts = []
+    best = None
+    for index, strategy in enumerate(order):
+        if attempts:
+            # 시간 초과나 빈 추출이면 다른 방법으로 재시도
+            if not strategy_table.should_fallback(url, attempts[-1][1], strategy):
+                break
+            print(f"{attempts[-1][0]} 방법 실패({attempts[-1][1]}), {strategy}(으)로 재시도...")
+            report(f'{strategy}_fallback')
+        started = time.perf_counter()
+        try:
+            result = run(strategy)
+        except ImportError:
+            if strategy == 'selenium':
+                continue  # Selenium이 없으면 requests 결과만 사용
+            return {
+                'success': False,
+                'error': 'aiohttp가 설치되지 않았습니다. pip install aiohttp를 실행해주세요.'
+            }
+        outcome = classify(result)
+        attempts.append((strategy, outcome, time.perf_counter() - started))
+        if best is None or OUTCOMES.index(outcome) < OUTCOMES.index(best[1]):
+            best = (result, outcome, strategy, index)
+        if outcome == OUTCOME_SUCCESS:
+            break
+    
+    strategy_table.record(url, attempts)
+    result, outcome, strategy, index = best
+    if strategy == 'selenium' and result['success']:
+        result['method'] = 'selenium_auto_fallback' if index else 'selenium_auto'
+    result['strategy'] = {
+        'order': order,
+        'probe': probe,
+        'attempts': [{'method': name, 'outcome': outcome, 'seconds': round(seconds, 3)}
+                     for name, outcome, seconds in attempts]
+    }
+    return result
+
 @app.route('/scrape', methods=['POST'])
 def scrape():
     url = request.json.get('url', '').strip()
     use_selenium = request.json.get('use_selenium', False)
+    use_async = request.json.get('use_async', False)
+    use_stream = request.json.get('use_stream', False)
+    force_refresh = request.json.get('force_refresh', False)
+    lazy_images = request.json.get('lazy_images', LAZY_IMAGES)
     
     if not url:
         return jsonify({'success': False, 'error': 'URL을 입력해주세요.'})
     
-    if not url.startswith(('http://', 'https://')):
-        url = 'https://' + url
+    return jsonify(run_scrape(url, use_selenium=use_selenium, use_async=use_async, use_stream=use_stream,
+                              force_refresh=force_refresh, lazy_images=lazy_images))
+
+def query_flag(name):
+    """쿼리 문자열의 true/false 옵션"""
+    return request.args.get(name, '').lower() in ('1', 'true', 'on')
+
+def sse_event(event, data):
+    """Server-Sent Events 형식의 이벤트 한 개"""
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+@app.route('/scrape/stream')
+def scrape_stream():
+    """단계가 끝날 때마다 이벤트를 보내는 /scrape (EventSource용 GET)
+
+    page_fetched, text_extracted, image_saved(이미지마다) 등 진행 이벤트 뒤에
+    /scrape와 같은 결과 dict를 done 이벤트로 보냅니다.
+    """
+    url = request.args.get('url', '').strip()
+    params = {
+        'use_selenium': query_flag('use_selenium'),
+        'use_async': query_flag('use_async'),
+        'use_stream': query_flag('use_stream'),
+        'force_refresh': query_flag('force_refresh'),
+        'lazy_images': query_flag('lazy_images') if 'lazy_images' in request.args else LAZY_IMAGES
+    }
+    events = queue.Queue()
     
-    if use_selenium:
-        try:
-            from web_scraper_selenium import SeleniumWebScraper
-            scraper = SeleniumWebScraper(url)
-            result = scraper.scrape_page(url)
-        except ImportError:
-            return jsonify({
-                'success': False, 
-                'error': 'Selenium이 설치되지 않았습니다. pip install selenium을 실행해주세요.'
-            })
+    if not url:
+        events.put(('done', {'success': False, 'error': 'URL을 입력해주세요.'}))
     else:
-        scraper = WebScraper(url)
-        result = scraper.scrape_page(url)
+        def progress(stage, **info):
+            events.put((stage, info))
+        
+        def run():
+            try:
+                result = run_scrape(url, progress=progress, **params)
+            except Exception as e:
+                result = {'success': False, 'error': f'알 수 없는 오류: {str(e)}'}
+            events.put(('done', result))
         
-        # 일반 방법이 실패하면 자동으로 Selenium 시도
-        if not result['success'] and 'ConnectTimeoutError' in str(result.get('error', '')):
+        # 브라우저 연결이 끊겨도 스크래핑은 끝까지 진행 (결과는 캐시에 남음)
+        threading.Thread(target=run, name='scrape-stream', daemon=True).start()
+    
+    def generate():
+        while True:
             try:
-                from web_scraper_selenium import SeleniumWebScraper
-                print("일반 방법 실패, Selenium으로 재시도...")
-                selenium_scraper = SeleniumWebScraper(url)
-                result = selenium_scraper.scrape_page(url)
-                if result['success']:
-                    result['method'] = 'selenium_auto_fallback'
-            except ImportError:
-                pass  # Selenium이 없으면 원래 오류 반환
+                event, data = events.get(timeout=SSE_HEARTBEAT)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+            yield sse_event(event, data)
+            if event == 'done':
+                return
+    
+    return Response(generate(), mimetype='text/event-stream',
+                     headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/scrape/cache')
+def result_cache_stats():
+    """스크래핑 결과 캐시 적중률, 합쳐진 동시 요청 수 등 지표"""
+    return jsonify({'success': True, **result_cache.stats(), 'in_flight': scrape_flights.stats()})
+
+job_manager = JobManager(lambda params, progress: run_scrape(progress=progress, **params),
+                         workers=JOB_WORKERS, max_queue=JOB_QUEUE_SIZE, ttl=JOB_TTL)
+
+@app.route('/jobs', methods=['POST'])
+def create_job():
+    """스크래핑 작업 등록 후 job id 즉시 반환"""
+    url = request.json.get('url', '').strip()
+    if not url:
+        return jsonify({'success': False, 'error': 'URL을 입력해주세요.'}), 400
     
-    return jsonify(result)
+    try:
+        job_id = job_manager.submit(
+            url=url,
+            use_selenium=bool(request.json.get('use_selenium', False)),
+            use_async=bool(request.json.get('use_async', False)),
+            use_stream=bool(request.json.get('use_stream', False)),
+            force_refresh=bool(request.json.get('force_refresh', False)),
+            lazy_images=bool(request.json.get('lazy_images', LAZY_IMAGES))
+        )
+    except JobQueueFull as e:
+        return jsonify({'success': False, 'error': str(e)}), 503
+    
+    return jsonify({'success': True, 'job_id': job_id, 'status': 'queued'}), 202
+
+@app.route('/scrape/strategies')
+def strategy_stats():
+    """도메인별 선택한 스크래핑 방법과 방법별 성공/시간 초과/빈 추출 수, 평균 소요 시간"""
+    return jsonify({'success': True, **strategy_table.stats()})
+
+@app.route('/scrape/strategies/<host>', methods=['DELETE'])
+def forget_strategy(host):
+    """도메인 방법 기록 삭제 (다음 요청은 requests부터 다시 시도)"""
+    if not strategy_table.forget(host):
+        return jsonify({'success': False, 'error': '기록이 없는 도메인입니다.'}), 404
+    return jsonify({'success': True})
+
+@app.route('/selenium/pool')
+def selenium_pool_stats():
+    """Selenium 드라이버 풀 대기 시간 등 지표"""
+    try:
+        from web_scraper_selenium import get_driver_pool
+    except ImportError:
+        return jsonify({'success': False, 'error': 'Selenium이 설치되지 않았습니다.'}), 404
+    pool = get_driver_pool(create=False)
+    if pool is None:
+        return jsonify({'success': True, 'started': False})
+    return jsonify({'success': True, 'started': True, **pool.metrics()})
+
+@app.route('/pages/<int:page_id>/export', methods=['POST'])
+def export_page(page_id):
+    """데이터베이스에 저장된 페이지를 기존 폴더 구조로 내보내기"""
+    try:
+        folder_path = get_scrape_database().export(page_id, output_roots()[0])
+    except KeyError as e:
+        return jsonify({'success': False, 'error': e.args[0]}), 404
+    except OSError as e:
+        return jsonify({'success': False, 'error': f'내보내기 실패: {str(e)}'}), 500
+    return jsonify({'success': True, 'folder_path': str(folder_path)})
+
+@app.route('/search')
+def search_pages():
+    """스크래핑한 페이지 전문 검색 (?q=검색어&page=1&per_page=20, 관련도 순)"""
+    text = request.args.get('q', '').strip()
+    if not text:
+        return jsonify({'success': False, 'error': '검색어를 입력해주세요.'}), 400
+    try:
+        page = int(request.args.get('page', 1))
+        per_page = int(request.args.get('per_page', 20))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'page와 per_page는 숫자여야 합니다.'}), 400
+    try:
+        found = get_search_index().search(text, page, per_page)
+    except sqlite3.Error as e:
+        return jsonify({'success': False, 'error': f'검색 실패: {str(e)}'}), 500
+    return jsonify({'success': True, 'query': text, **found})
+
+@app.route('/throttle')
+def throttle_stats():
+    """호스트별 요청 속도, 429/503 횟수, 대기 시간"""
+    scheduler = get_registry().scheduler
+    if scheduler is None:
+        return jsonify({'success': True, 'enabled': False})
+    return jsonify({'success': True, 'enabled': True, **scheduler.stats()})
+
+def throttle_rates():
+    scheduler = get_registry().scheduler
+    if scheduler is None:
+        return {}
+    return {(host,): info['rate'] for host, info in scheduler.stats()['hosts'].items()}
+
+scrape_metrics.registry.gauge('web_scraper_in_flight_scrapes', '진행 중인 스크래핑 수 (합쳐진 요청 제외)',
+                              lambda: scrape_flights.stats()['in_flight'])
+scrape_metrics.registry.gauge('web_scraper_result_cache_entries', '보관 중인 스크래핑 결과 수',
+                              lambda: result_cache.stats()['entries'])
+scrape_metrics.registry.gauge('web_scraper_job_queue_depth', '대기 중인 백그라운드 작업 수',
+                              lambda: job_manager.stats()['queue_depth'])
+scrape_metrics.registry.gauge('web_scraper_host_rate', '호스트별 현재 초당 요청 수 (429/503이면 줄어듦)',
+                              throttle_rates, labels=('host',))
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus 형식 지표 (방법/호스트별 스크래핑 수, 단계별 소요 시간 히스토그램, 바이트 수)"""
+    return Response(scrape_metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/jobs/<job_id>')
+def get_job(job_id):
+    """작업 상태, 진행률, 최종 결과 조회"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': '작업을 찾을 수 없거나 만료되었습니다.'}), 404
+    return jsonify({'success': True, **job})
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -6,32 +6,75 @@ URL을 입력받아 페이지의 텍스트 정보와 이미지를 추출하여 
 
 import os
 import re
-import requests
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+import sys
 import json
 from datetime import datetime
 import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from web_scraper_images import ImageDownloadPool, DEFAULT_MAX_WORKERS, DEFAULT_PER_HOST_LIMIT
+from web_scraper_session import get_session, new_cookie_jar, keep_cookies, iter_body, configure, IMAGE_HEADERS
+from web_scraper_throttle import PolitenessScheduler, DEFAULT_HOST_RATE
+from web_scraper_cache import CacheStats
+from web_scraper_store import StoreStats, get_image_store
+from web_scraper_extract import extract_page, format_styled_text, image_alt, StreamingPageParser
+from web_scraper_db import ScrapeDatabase, DEFAULT_DB_PATH, page_record
+from web_scraper_search import index_page
+from web_scraper_metrics import PhaseTimer, format_phases
+from web_scraper_image_policy import (ImagePolicy, ImageSkipped, SkippedImages, DEFAULT_MAX_IMAGE_BYTES,
+                                     DEFAULT_MIN_IMAGE_WIDTH, DEFAULT_IMAGE_TYPES)
+
+# 배치 모드에서 동시에 처리할 페이지 수 기본값
+DEFAULT_BATCH_CONCURRENCY = 4
+
+# 스트리밍 모드에서 한 번에 읽어 파서에 넘기는 크기
+STREAM_CHUNK_SIZE = 64 * 1024
 
 class WebScraper:
-    def __init__(self, base_url):
+    def __init__(self, base_url, max_workers=DEFAULT_MAX_WORKERS, per_host_limit=DEFAULT_PER_HOST_LIMIT,
+                 output_dir=None, stream=False, image_store=None, database=None, image_policy=None):
         self.base_url = base_url
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.output_dir = Path(output_dir) if output_dir else None
+        # 응답을 받는 대로 파싱하고 이미지를 바로 내려받을지 여부
+        self.stream = stream
+        # 마지막 스크래핑 결과 (배치 모드 요약용)
+        self.last_metadata = None
+        self.last_error = None
+        # 호스트별 공유 세션 사용
+        self.session = get_session(base_url)
+        # HTTP 캐시 적중 집계 (scrape_page마다 새로 시작)
+        self.cache_stats = CacheStats()
+        # 이 스크래핑에서 받은 쿠키 (공유 세션에는 남기지 않으므로 다른 스크래핑에 보내지 않음)
+        self.cookies = new_cookie_jar()
+        # 이미지는 내용 주소 저장소에 한 번만 저장하고 폴더에는 하드 링크
+        self.image_store = image_store or get_image_store()
+        self.store_stats = StoreStats()
+        # 지정하면 폴더 대신 SQLite 스크래핑 데이터베이스(ScrapeDatabase)에 저장
+        self.database = database
+        # 크기 상한/최소 가로세로/허용 형식에 맞지 않는 이미지는 받는 도중 중단하고 기록
+        self.image_policy = image_policy or ImagePolicy()
+        self.skipped_images = SkippedImages()
         
     def create_folder(self, folder_name):
-        """데스크탑에 폴더 생성"""
-        desktop_path = Path.home() / "Desktop"
-        folder_path = desktop_path / folder_name
+        """데스크탑(또는 지정한 출력 폴더)에 폴더 생성"""
+        desktop_path = self.output_dir or Path.home() / "Desktop"
+        desktop_path.mkdir(parents=True, exist_ok=True)
         
-        if not folder_path.exists():
-            folder_path.mkdir(parents=True, exist_ok=True)
-            print(f"폴더 생성: {folder_path}")
-        
-        return folder_path
+        # 같은 제목의 페이지를 동시에 스크래핑해도 폴더가 겹치지 않도록 번호를 붙임
+        folder_path = desktop_path / folder_name
+        suffix = 1
+        while True:
+            try:
+                folder_path.mkdir()
+                print(f"폴더 생성: {folder_path}")
+                return folder_path
+            except FileExistsError:
+                suffix += 1
+                folder_path = desktop_path / f"{folder_name}_{suffix}"
     
     def download_image(self, img_url, folder_path, img_name):
         """이미지 다운로드"""
@@ -42,7 +85,11 @@ class WebScraper:
             elif img_url.startswith('/'):
                 img_url = urljoin(self.base_url, img_url)
             
-            response = self.session.get(img_url, timeout=30)
+            headers = {**IMAGE_HEADERS, 'Referer': self.base_url}
+            response = get_session(img_url).get(img_url, headers=headers, cookies=self.cookies,
+                                                timeout=30, stream=True)
+            self.cache_stats.record(response)
+            keep_cookies(self.cookies, response)
             response.raise_for_status()
             
             # 파일 확장자 추출
@@ -51,6 +98,16 @@ class WebScraper:
             if not file_ext:
                 file_ext = '.jpg'  # 기본 확장자
             
+            if folder_path is None:
+                # 데이터베이스 저장 시에는 저장소에만 두고 데이터베이스가 쓰는 파일로 고정
+                digest, size, status = self.image_policy.save_response(
+                    self.image_store, img_url, response, ref=self.database.path)
+                self.store_stats.record(status)
+                if size == 0:
+                    print(f"경고: 이미지가 비어있습니다: {img_url}")
+                    return None
+                return str(self.image_store.blob_path(digest))
+            
             # 파일명 정리
             safe_name = re.sub(r'[^\w\-_\.]', '_', img_name)
             filename = f"{safe_name}{file_ext}"
@@ -59,105 +116,159 @@ class WebScraper:
             # images 폴더 생성
             (folder_path / "images").mkdir(exist_ok=True)
             
-            with open(file_path, 'wb') as f:
-                f.write(response.content)
+            # 저장소에 저장 후 링크 (바뀌지 않은 이미지는 본문을 다시 쓰지 않음)
+            digest, size, status = self.image_policy.save_response(self.image_store, img_url, response, file_path)
+            self.store_stats.record(status)
+            
+            if size == 0:
+                print(f"경고: 이미지 파일이 비어있습니다: {file_path}")
+                return None
             
             print(f"이미지 저장: {file_path}")
             return str(file_path)
             
+        except ImageSkipped as e:
+            self.skipped_images.record(img_url, img_name, e)
+            return None
         except Exception as e:
             print(f"이미지 다운로드 실패: {img_url} - {e}")
             return None
     
-    def extract_text_with_styling(self, soup):
-        """텍스트를 스타일과 함께 추출"""
-        styled_text = []
-        
-        # 제목 추출
-        title = soup.find('h1') or soup.find('h2') or soup.find('h3')
-        if title:
-            styled_text.append(f"# {title.get_text().strip()}\n")
-        
-        # 테이블 정보 추출
-        tables = soup.find_all('table')
-        for table in tables:
-            styled_text.append("## 프로그램 정보\n")
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 2:
-                    key = cells[0].get_text().strip()
-                    value = cells[1].get_text().strip()
-                    styled_text.append(f"**{key}**: {value}\n")
-            styled_text.append("\n")
-        
-        # 본문 내용 추출
-        content_divs = soup.find_all(['div', 'p'], class_=re.compile(r'content|body|main'))
-        for div in content_divs:
-            text = div.get_text().strip()
-            if text and len(text) > 10:  # 의미있는 텍스트만
-                # 줄바꿈 처리
-                lines = text.split('\n')
-                for line in lines:
-                    line = line.strip()
-                    if line:
-                        styled_text.append(f"{line}\n")
-                styled_text.append("\n")
-        
-        return '\n'.join(styled_text)
+    def extract_text_with_styling(self, content):
+        """텍스트를 스타일과 함께 추출 (content는 extract_page의 PageContent)"""
+        return format_styled_text(content, line_end='\n')
+    
+    def fetch_streaming(self, url, on_title, on_image, phases=None):
+        """응답을 청크 단위로 받으며 파싱 (이미지/제목 콜백은 태그가 파싱되는 즉시 호출)"""
+        phases = phases or PhaseTimer()
+        response = self.session.get(url, cookies=self.cookies, timeout=30, stream=True)
+        phases.add('connect', response.elapsed.total_seconds())
+        self.cache_stats.record(response)
+        keep_cookies(self.cookies, response)
+        try:
+            response.raise_for_status()
+            parser = StreamingPageParser(on_image=on_image, on_title=on_title)
+            for chunk in iter_body(response, STREAM_CHUNK_SIZE):
+                with phases.phase('parse'):
+                    parser.feed(chunk)
+            with phases.phase('parse'):
+                content = parser.close()
+            return content, parser.bytes_read
+        finally:
+            response.close()
     
     def scrape_page(self, url):
         """웹페이지 스크래핑"""
         try:
             print(f"페이지 로딩 중: {url}")
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # 페이지 제목 추출
-            page_title = soup.find('title')
-            if page_title:
-                title = page_title.get_text().strip()
-            else:
-                title = "웹페이지_스크래핑"
-            
-            # 폴더명 생성 (특수문자 제거)
-            safe_title = re.sub(r'[^\w\-_\.]', '_', title)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            folder_name = f"{safe_title}_{timestamp}"
-            
-            # 폴더 생성
-            folder_path = self.create_folder(folder_name)
-            
-            # 텍스트 정보 추출
-            styled_text = self.extract_text_with_styling(soup)
-            
-            # 텍스트 파일로 저장
-            text_file = folder_path / "content.txt"
-            with open(text_file, 'w', encoding='utf-8') as f:
-                f.write(styled_text)
+            # 단계별 소요 시간/바이트 수 (metadata.json의 phases, bytes)
+            phases = PhaseTimer()
+            started = phases.started
+            self.cache_stats = CacheStats()
+            self.cookies = new_cookie_jar()
+            self.store_stats = StoreStats()
+            self.skipped_images = SkippedImages()
+            page = {'first_image': None}
             
-            # 마크다운 파일로도 저장
-            md_file = folder_path / "content.md"
-            with open(md_file, 'w', encoding='utf-8') as f:
-                f.write(styled_text)
+            def open_folder(page_title):
+                # 페이지 제목 추출
+                if page_title is not None:
+                    title = page_title
+                else:
+                    title = "웹페이지_스크래핑"
+                
+                # 폴더명 생성 (특수문자 제거)
+                safe_title = re.sub(r'[^\w\-_\.]', '_', title)
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                folder_name = f"{safe_title}_{timestamp}"
+                
+                # 폴더 생성 (데이터베이스에 저장할 때는 만들지 않음)
+                page['title'] = title
+                page['folder_name'] = folder_name
+                with phases.phase('write'):
+                    page['folder'] = None if self.database else self.create_folder(folder_name)
             
-            # 이미지 추출 및 다운로드
-            images = soup.find_all('img')
-            image_info = []
+            # 이미지 병렬 다운로드 (결과는 문서 순서대로 모음)
+            pool = ImageDownloadPool(self.download_image, self.base_url,
+                                     self.max_workers, self.per_host_limit)
             
-            for i, img in enumerate(images):
-                img_src = img.get('src')
+            def submit_image(index, img_src, img_alt):
                 if img_src:
-                    img_alt = img.get('alt', f'image_{i+1}')
-                    img_path = self.download_image(img_src, folder_path, img_alt)
+                    if page['first_image'] is None:
+                        page['first_image'] = round(time.perf_counter() - started, 3)
+                    img_alt = image_alt(index, img_alt)
+                    pool.submit((img_src, img_alt), img_src, page['folder'], img_alt)
+            
+            with pool:
+                if self.stream:
+                    # 파싱 도중 제목이 확정되면 폴더를 만들고 <img>마다 바로 다운로드 시작
+                    content, page_bytes = self.fetch_streaming(url, open_folder, submit_image, phases)
+                    fetched = time.perf_counter()
+                    # 파싱(폴더 생성 포함)과 겹친 시간을 뺀 본문 수신 시간
+                    done = phases.phases_dict()
+                    phases.add('page_body', fetched - started - done['connect'] - done['parse'] - done.get('write', 0))
+                else:
+                    response = self.session.get(url, cookies=self.cookies, timeout=30)
+                    self.cache_stats.record(response)
+                    keep_cookies(self.cookies, response)
+                    response.raise_for_status()
+                    fetched = time.perf_counter()
+                    page_bytes = len(response.content)
+                    phases.add('connect', response.elapsed.total_seconds())
+                    phases.add('page_body', fetched - started - response.elapsed.total_seconds())
+                    
+                    # 제목/본문/이미지를 한 번의 순회로 추출
+                    with phases.phase('parse'):
+                        content = extract_page(response.content)
+                    open_folder(content.title)
+                    for index, (img_src, img_alt) in enumerate(content.images):
+                        submit_image(index, img_src, img_alt)
+                
+                title = page['title']
+                folder_path = page['folder']
+                
+                # 텍스트 정보 추출
+                with phases.phase('format'):
+                    styled_text = self.extract_text_with_styling(content)
+                extracted = time.perf_counter()
+                
+                if self.database:
+                    text_file = md_file = None
+                else:
+                    with phases.phase('write'):
+                        # 텍스트 파일로 저장 (그동안 이미지는 계속 내려받음)
+                        text_file = folder_path / "content.txt"
+                        with open(text_file, 'w', encoding='utf-8') as f:
+                            f.write(styled_text)
+                        
+                        # 마크다운 파일로도 저장
+                        md_file = folder_path / "content.md"
+                        with open(md_file, 'w', encoding='utf-8') as f:
+                            f.write(styled_text)
+                
+                image_info = []
+                for (img_src, img_alt), img_path in pool.gather():
                     if img_path:
                         image_info.append({
                             'original_url': img_src,
                             'local_path': img_path,
                             'alt_text': img_alt
                         })
+                image_summary = pool.summary()
+            
+            phases.add('images', image_summary['images_wall'])
+            phases.count('page', page_bytes)
+            phases.count('images', sum(os.path.getsize(info['local_path']) for info in image_info))
+            phases.count('text', len(styled_text.encode('utf-8')))
+            
+            # 페이지별 타이밍 요약
+            timing = {
+                'page_fetch': round(fetched - started, 3),
+                'extract': round(extracted - fetched, 3),
+                'first_image': page['first_image'],
+                **image_summary,
+                'total': round(time.perf_counter() - started, 3)
+            }
             
             # 메타데이터 저장
             metadata = {
@@ -165,36 +276,240 @@ class WebScraper:
                 'title': title,
                 'scraped_at': datetime.now().isoformat(),
                 'images': image_info,
-                'text_file': str(text_file),
-                'markdown_file': str(md_file)
+                'text_file': str(text_file) if text_file else None,
+                'markdown_file': str(md_file) if md_file else None,
+                'streamed': self.stream,
+                'timing': timing,
+                'phases': phases.phases_dict(),
+                'bytes': phases.bytes_dict(),
+                'cache': self.cache_stats.to_dict(),
+                'image_store': self.store_stats.to_dict(),
+                'skipped_images': self.skipped_images.to_list()
             }
+            self.last_metadata = metadata
+            
+            if self.database:
+                with phases.phase('write'):
+                    page_id = self.database.save_page(page_record(url, title, page['folder_name'], styled_text,
+                                                                  content, image_info, metadata))
+                metadata['page_id'] = page_id
+                metadata['phases'] = phases.phases_dict()
+                index_page(url, title, styled_text, content.tables, f"page:{page_id}", metadata['scraped_at'])
+                print(f"\n스크래핑 완료!")
+                print(f"데이터베이스: {self.database.path} (페이지 id {page_id})")
+                print(f"이미지 개수: {len(image_info)} (건너뜀 {len(metadata['skipped_images'])})")
+                print(f"소요 시간: 전체 {timing['total']}초 (페이지 {timing['page_fetch']}초, "
+                      f"이미지 {timing['images_wall']}초 / 개별 합계 {timing['images_sum']}초)")
+                print(f"단계별: {format_phases(metadata['phases'])}")
+                return page_id
             
-            metadata_file = folder_path / "metadata.json"
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, ensure_ascii=False, indent=2)
+            # metadata.json에는 그 파일을 쓰기 전까지의 단계가 기록됨
+            with phases.phase('write'):
+                metadata_file = folder_path / "metadata.json"
+                with open(metadata_file, 'w', encoding='utf-8') as f:
+                    json.dump(metadata, f, ensure_ascii=False, indent=2)
+            metadata['phases'] = phases.phases_dict()
+            index_page(url, title, styled_text, content.tables, folder_path, metadata['scraped_at'])
             
             print(f"\n스크래핑 완료!")
             print(f"폴더 위치: {folder_path}")
             print(f"텍스트 파일: {text_file}")
             print(f"마크다운 파일: {md_file}")
-            print(f"이미지 개수: {len(image_info)}")
+            print(f"이미지 개수: {len(image_info)} (건너뜀 {len(metadata['skipped_images'])})")
+            print(f"소요 시간: 전체 {timing['total']}초 (페이지 {timing['page_fetch']}초, "
+                  f"이미지 {timing['images_wall']}초 / 개별 합계 {timing['images_sum']}초)")
+            print(f"단계별: {format_phases(metadata['phases'])}")
             
             return folder_path
             
         except Exception as e:
             print(f"스크래핑 실패: {e}")
+            self.last_error = str(e)
             return None
 
+def read_urls(source):
+    """URL 목록 읽기 ('-'이면 표준 입력, 빈 줄과 # 주석은 무시)"""
+    if source == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.strip().startswith('#')]
+
+def scrape_one(url, **scraper_kwargs):
+    """배치 모드용 단일 URL 스크래핑 후 요약 dict 반환"""
+    started = time.perf_counter()
+    scraper = WebScraper(url, **scraper_kwargs)
+    result = scraper.scrape_page(url)
+    summary = {
+        'url': url,
+        'status': 'ok' if result is not None else 'error',
+        'elapsed': round(time.perf_counter() - started, 3)
+    }
+    if scraper.database:
+        summary['page_id'] = result
+    else:
+        summary['folder'] = str(result) if result else None
+    if scraper.last_metadata:
+        summary['page_bytes'] = scraper.last_metadata['bytes']['page']
+        summary['image_bytes'] = scraper.last_metadata['bytes']['images']
+        summary['image_count'] = len(scraper.last_metadata['images'])
+        summary['skipped_images'] = len(scraper.last_metadata['skipped_images'])
+    else:
+        summary['error'] = scraper.last_error
+    return summary
+
+def async_summary(url, result, elapsed):
+    """asyncio 엔진 결과를 배치 요약 dict로 변환 (scrape_one과 같은 형식)"""
+    summary = {
+        'url': url,
+        'status': 'ok' if result['success'] else 'error',
+        'elapsed': round(elapsed, 3),
+        'folder': result.get('folder_path')
+    }
+    if result['success']:
+        summary['page_bytes'] = result['bytes'].get('page', 0)
+        summary['image_bytes'] = result['bytes'].get('images', 0)
+        summary['image_count'] = result['image_count']
+        summary['skipped_images'] = len(result['skipped_images'])
+    else:
+        summary['error'] = result['error']
+    return summary
+
+def run_batch(urls, jsonl_path, concurrency=DEFAULT_BATCH_CONCURRENCY, use_async=False, **scraper_kwargs):
+    """URL 목록을 동시에 스크래핑하고 URL별 요약을 JSONL로 기록
+
+    use_async면 asyncio 엔진(web_scraper_async)이 한 이벤트 루프에서 concurrency개씩 처리합니다.
+    """
+    started = time.perf_counter()
+    totals = {'ok': 0, 'error': 0, 'bytes': 0}
+    
+    with open(jsonl_path, 'a', encoding='utf-8') as out:
+        def write(summary):
+            totals[summary['status']] += 1
+            totals['bytes'] += summary.get('page_bytes', 0) + summary.get('image_bytes', 0)
+            out.write(json.dumps(summary, ensure_ascii=False) + '\n')
+            out.flush()
+        
+        if use_async:
+            from web_scraper_async import scrape_pages_sync
+            scrape_pages_sync(urls, concurrency=concurrency,
+                              on_result=lambda url, result, elapsed: write(async_summary(url, result, elapsed)),
+                              **scraper_kwargs)
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix='batch') as executor:
+                futures = {executor.submit(scrape_one, url, **scraper_kwargs): url for url in urls}
+                for future in as_completed(futures):
+                    try:
+                        summary = future.result()
+                    except Exception as e:
+                        summary = {'url': futures[future], 'status': 'error', 'error': str(e)}
+                    write(summary)
+    
+    elapsed = time.perf_counter() - started
+    pages = totals['ok'] + totals['error']
+    print(f"\n배치 완료: {pages}개 페이지 (성공 {totals['ok']}, 실패 {totals['error']})")
+    print(f"소요 시간: {elapsed:.2f}초, 처리량: {pages / elapsed if elapsed > 0 else 0:.2f} pages/sec, "
+          f"전송량: {totals['bytes'] / 1024 / 1024:.2f} MB")
+    print(f"요약 파일: {jsonl_path}")
+    return totals
+
 def main():
     parser = argparse.ArgumentParser(description='웹페이지 스크래핑 프로그램')
-    parser.add_argument('url', help='스크래핑할 웹페이지 URL')
+    parser.add_argument('url', nargs='?', help='스크래핑할 웹페이지 URL')
+    parser.add_argument('--batch', metavar='FILE',
+                        help="URL 목록 파일로 여러 페이지를 동시에 스크래핑 ('-'이면 표준 입력)")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_BATCH_CONCURRENCY,
+                        help=f'배치 모드에서 동시에 처리할 페이지 수 (기본값: {DEFAULT_BATCH_CONCURRENCY})')
+    parser.add_argument('--jsonl', metavar='FILE',
+                        help='배치 모드 URL별 요약 파일 (기본값: batch_<타임스탬프>.jsonl)')
+    parser.add_argument('--output-dir', help='결과 폴더를 만들 위치 (기본값: 데스크탑)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                        help=f'이미지 동시 다운로드 수 (기본값: {DEFAULT_MAX_WORKERS})')
+    parser.add_argument('--per-host', type=int, default=DEFAULT_PER_HOST_LIMIT,
+                        help=f'호스트별 동시 다운로드 상한 (기본값: {DEFAULT_PER_HOST_LIMIT})')
+    
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='asyncio 엔진으로 스크래핑')
+    parser.add_argument('--stream', action='store_true',
+                        help='응답을 받는 대로 파싱하고 이미지 다운로드를 바로 시작')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='디스크 HTTP 캐시(~/.web_scraper/http_cache)를 사용하지 않음')
+    parser.add_argument('--host-rate', type=float, default=DEFAULT_HOST_RATE,
+                        help=f'호스트별 초당 요청 수 상한 (429/503을 받으면 자동으로 줄임, 기본값: {DEFAULT_HOST_RATE})')
+    parser.add_argument('--no-throttle', action='store_true',
+                        help='호스트별 속도 조절을 사용하지 않음')
+    parser.add_argument('--db', action='store_true',
+                        help='페이지별 폴더 대신 SQLite 데이터베이스에 저장')
+    parser.add_argument('--db-path', default=str(DEFAULT_DB_PATH),
+                        help=f'--db 사용 시 데이터베이스 위치 (기본값: {DEFAULT_DB_PATH})')
+    parser.add_argument('--max-image-bytes', type=int, default=DEFAULT_MAX_IMAGE_BYTES,
+                        help=f'이보다 큰 이미지는 받는 도중 중단 (0이면 제한 없음, 기본값: {DEFAULT_MAX_IMAGE_BYTES})')
+    parser.add_argument('--min-image-size', type=int, default=DEFAULT_MIN_IMAGE_WIDTH,
+                        help=f'가로 또는 세로가 이보다 작은 이미지는 건너뜀 (기본값: {DEFAULT_MIN_IMAGE_WIDTH})')
+    parser.add_argument('--image-types', default=','.join(sorted(DEFAULT_IMAGE_TYPES)),
+                        help="받을 이미지 형식 (쉼표로 구분, 'all'이면 모든 형식)")
     
     args = parser.parse_args()
     
-    scraper = WebScraper(args.url)
+    if args.no_cache:
+        configure(cache=None)
+    if args.no_throttle:
+        configure(scheduler=None)
+    elif args.host_rate != DEFAULT_HOST_RATE:
+        configure(scheduler=PolitenessScheduler(rate=args.host_rate))
+    
+    if args.db and args.use_async:
+        parser.error('--db는 --async와 함께 사용할 수 없습니다.')
+    database = ScrapeDatabase(Path(args.db_path).expanduser()) if args.db else None
+    image_types = None if args.image_types == 'all' else [t for t in args.image_types.split(',') if t.strip()]
+    image_policy = ImagePolicy(max_bytes=args.max_image_bytes, min_width=args.min_image_size,
+                               min_height=args.min_image_size, allowed_types=image_types)
+    
+    if args.batch:
+        urls = read_urls(args.batch)
+        jsonl_path = args.jsonl or f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+        if args.use_async:
+            run_batch(urls, jsonl_path, concurrency=args.concurrency, use_async=True, max_workers=args.workers,
+                      per_host_limit=args.per_host, output_dir=args.output_dir, image_policy=image_policy)
+        else:
+            run_batch(urls, jsonl_path, concurrency=args.concurrency, max_workers=args.workers,
+                      per_host_limit=args.per_host, output_dir=args.output_dir, stream=args.stream,
+                      database=database, image_policy=image_policy)
+        if database:
+            database.close()
+        return
+    
+    if not args.url:
+        parser.error('URL 또는 --batch 옵션이 필요합니다.')
+    
+    if args.use_async:
+        from web_scraper_async import scrape_page_sync
+        result = scrape_page_sync(args.url, max_workers=args.workers, per_host_limit=args.per_host,
+                                  output_dir=args.output_dir, image_policy=image_policy)
+        if not result['success']:
+            print(f"스크래핑 실패: {result['error']}")
+            return
+        print(f"\n스크래핑 완료!")
+        print(f"폴더 위치: {result['folder_path']}")
+        print(f"이미지 개수: {result['image_count']} (건너뜀 {len(result['skipped_images'])})")
+        print(f"\n복사할 텍스트:")
+        print("=" * 50)
+        print(result['text_content'])
+        return
+    
+    scraper = WebScraper(args.url, max_workers=args.workers, per_host_limit=args.per_host,
+                         output_dir=args.output_dir, stream=args.stream, database=database,
+                         image_policy=image_policy)
     result = scraper.scrape_page(args.url)
     
-    if result:
+    if database:
+        if result is not None:
+            print(f"\n복사할 텍스트:")
+            print("=" * 50)
+            print(database.get_page(result)['text'])
+        database.close()
+    elif result:
         print(f"\n복사할 텍스트:")
         print("=" * 50)
         text_file = result / "content.txt"
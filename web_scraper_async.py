@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+asyncio 기반 웹페이지 스크래핑 엔진
+페이지 요청, 이미지 다운로드, 파일 저장을 하나의 이벤트 루프에서 처리하여
+여러 페이지를 동시에 스크래핑합니다. 결과 형식은 WebScraper.scrape_page와 같습니다.
+"""
+
+import asyncio
+import os
+import re
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+import aiohttp
+from web_scraper_images import DEFAULT_MAX_WORKERS, DEFAULT_PER_HOST_LIMIT
+from web_scraper_session import DEFAULT_HEADERS, IMAGE_HEADERS, get_registry
+from web_scraper_extract import extract_page, format_styled_text
+from web_scraper_store import StoreStats, get_image_store
+from web_scraper_throttle import THROTTLE_STATUSES, MAX_RETRY_AFTER
+from web_scraper_search import index_page
+from web_scraper_metrics import PhaseTimer
+from web_scraper_image_policy import ImagePolicy, ImageScreen, ImageSkipped, SkippedImages
+
+# 동시에 처리할 페이지 수 기본값
+DEFAULT_PAGE_CONCURRENCY = 4
+# 이미지 정책 검사 시 본문을 읽는 단위
+IMAGE_CHUNK_SIZE = 8192
+
+# 재시도 대상 상태 코드 (동기 버전의 Retry 정책과 동일)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 1
+
+
+class AsyncWebScraper:
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, per_host_limit=DEFAULT_PER_HOST_LIMIT,
+                 timeout=(3, 10), output_dir=None, image_store=None, scheduler=None, image_policy=None):
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout  # (연결 타임아웃, 읽기 타임아웃)
+        self.output_dir = Path(output_dir) if output_dir else None
+        # 이미지는 내용 주소 저장소에 한 번만 저장하고 폴더에는 하드 링크
+        self.image_store = image_store or get_image_store()
+        # 동기 버전과 같은 호스트별 속도 조절기를 공유 (None이면 사용하지 않음)
+        self.scheduler = scheduler or get_registry().scheduler
+        # 정책에 맞지 않는 이미지는 받는 도중 중단하고 기록
+        self.image_policy = image_policy or ImagePolicy()
+        # aiohttp가 지원하는 인코딩만 요청하도록 Accept-Encoding은 기본값 사용
+        self.headers = {k: v for k, v in DEFAULT_HEADERS.items() if k != 'Accept-Encoding'}
+        self.image_semaphore = None
+        self.host_semaphores = {}
+
+    def create_session(self):
+        """이벤트 루프에서 공유할 aiohttp 세션 생성"""
+        # 세마포어는 이벤트 루프에 묶이므로 세션을 만들 때마다 새로 준비
+        self.image_semaphore = asyncio.Semaphore(self.max_workers)
+        self.host_semaphores = {}
+        connector = aiohttp.TCPConnector(limit=max(self.max_workers * 2, 16),
+                                         limit_per_host=self.per_host_limit * 2)
+        timeout = aiohttp.ClientTimeout(sock_connect=self.timeout[0], sock_read=self.timeout[1])
+        return aiohttp.ClientSession(connector=connector, timeout=timeout, headers=self.headers)
+
+    def host_semaphore(self, url):
+        host = urlparse(url).netloc.lower()
+        if host not in self.host_semaphores:
+            self.host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self.host_semaphores[host]
+
+    async def fetch(self, session, url, headers=None, phases=None, policy=None):
+        """GET 요청 후 (응답, 본문) 반환 - 재시도 상태 코드는 지수 백오프로 재시도
+
+        요청은 호스트별 속도 조절기를 거치며, 429/503은 Retry-After만큼 그 호스트 전체가 기다린 뒤 재시도합니다.
+        phases(PhaseTimer)를 주면 응답 헤더까지(connect)와 본문 수신(page_body) 시간을 기록합니다.
+        policy(ImagePolicy)를 주면 헤더와 본문을 받는 도중 검사하고 맞지 않으면 연결을 닫고 ImageSkipped를 발생시킵니다.
+        """
+        started = time.perf_counter()
+        for attempt in range(RETRY_TOTAL + 1):
+            host = await self.scheduler.acquire_async(url) if self.scheduler else None
+            status, retry_after, delay = None, None, 0
+            try:
+                async with session.get(url, headers=headers) as response:
+                    status, retry_after = response.status, response.headers.get('Retry-After')
+                    if status not in RETRY_STATUSES or attempt == RETRY_TOTAL:
+                        response.raise_for_status()
+                        headers_at = time.perf_counter()
+                        if policy:
+                            body = await self.read_screened(response, policy)
+                        else:
+                            body = await response.read()
+                        if phases:
+                            phases.add('connect', headers_at - started)
+                            phases.add('page_body', time.perf_counter() - headers_at)
+                        return response, body
+            finally:
+                if self.scheduler:
+                    delay = self.scheduler.release(host, status, retry_after)
+            if status in THROTTLE_STATUSES and self.scheduler:
+                if delay > MAX_RETRY_AFTER:
+                    raise aiohttp.ClientResponseError(response.request_info, response.history,
+                                                      status=status, message=response.reason)
+                # 다음 acquire_async가 Retry-After 동안 기다림
+                continue
+            await asyncio.sleep(RETRY_BACKOFF * (2 ** attempt))
+
+    @staticmethod
+    async def read_screened(response, policy):
+        """이미지 정책으로 검사하며 본문 읽기"""
+        policy.check_headers(response.headers.get('content-type'), response.headers.get('content-length'))
+        screen = ImageScreen(policy)
+        chunks = []
+        async for chunk in response.content.iter_chunked(IMAGE_CHUNK_SIZE):
+            screen.feed(chunk)
+            chunks.append(chunk)
+        screen.finish()
+        return b''.join(chunks)
+
+    @staticmethod
+    def make_unique_folder(base_path, folder_name):
+        """base_path 아래에 새 폴더 생성 (같은 이름이 있으면 _2, _3... 번호를 붙임)"""
+        base_path.mkdir(parents=True, exist_ok=True)
+        folder_path = base_path / folder_name
+        suffix = 1
+        while True:
+            try:
+                folder_path.mkdir(exist_ok=False)
+                (folder_path / "images").mkdir()
+                return folder_path
+            except FileExistsError:
+                suffix += 1
+                folder_path = base_path / f"{folder_name}_{suffix}"
+
+    def create_folder(self, folder_name):
+        """데스크탑에 폴더 생성 (같은 제목의 페이지를 동시에 스크래핑해도 폴더가 겹치지 않음)"""
+        # 여러 경로 시도
+        if self.output_dir:
+            possible_paths = [self.output_dir]
+        else:
+            possible_paths = [
+                Path.home() / "Desktop",
+                Path.home() / "Desktop" / "Downloads",
+                Path.cwd() / "downloads",
+                Path("/tmp") / "web_scraper_downloads"
+            ]
+
+        for base_path in possible_paths:
+            try:
+                folder_path = self.make_unique_folder(base_path, folder_name)
+                print(f"폴더 생성 확인 완료: {folder_path}")
+                return folder_path
+            except Exception as e:
+                print(f"폴더 생성 실패 ({base_path}): {e}")
+                continue
+
+        # 모든 경로 실패 시 현재 디렉토리 사용
+        fallback_path = self.make_unique_folder(Path.cwd() / "downloads", folder_name)
+        print(f"최종 대안 경로로 폴더 생성: {fallback_path}")
+        return fallback_path
+
+    @staticmethod
+    def write_file(path, data):
+        """파일 저장 (실행기 스레드에서 호출)"""
+        if isinstance(data, str):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(data)
+        else:
+            with open(path, 'wb') as f:
+                f.write(data)
+
+    async def download_image(self, session, img_url, folder_path, img_name, page_url, store_stats=None,
+                             skipped=None):
+        """이미지 다운로드"""
+        try:
+            # 절대 URL로 변환
+            if img_url.startswith('//'):
+                img_url = 'https:' + img_url
+            elif img_url.startswith('/'):
+                img_url = urljoin(page_url, img_url)
+            elif not img_url.startswith(('http://', 'https://')):
+                img_url = urljoin(page_url, '/' + img_url.lstrip('/'))
+
+            headers = {**IMAGE_HEADERS, 'Referer': page_url}
+            async with self.image_semaphore, self.host_semaphore(img_url):
+                response, body = await self.fetch(session, img_url, headers=headers, policy=self.image_policy)
+
+            # 파일 확장자 결정
+            content_type = response.headers.get('content-type', '')
+            if 'image/jpeg' in content_type or 'image/jpg' in content_type:
+                file_ext = '.jpg'
+            elif 'image/png' in content_type:
+                file_ext = '.png'
+            elif 'image/gif' in content_type:
+                file_ext = '.gif'
+            elif 'image/webp' in content_type:
+                file_ext = '.webp'
+            else:
+                file_ext = os.path.splitext(urlparse(img_url).path)[1] or '.jpg'
+
+            if not body:
+                print(f"경고: 이미지가 비어있습니다: {img_url}")
+                return None
+
+            # 파일명 정리
+            safe_name = re.sub(r'[^\w\-_\.]', '_', img_name)
+            file_path = folder_path / "images" / f"{safe_name}{file_ext}"
+
+            loop = asyncio.get_running_loop()
+            digest, size, status = await loop.run_in_executor(
+                None, self.image_store.save, img_url, [body], file_path)
+            if store_stats:
+                store_stats.record(status)
+            print(f"이미지 저장 완료: {file_path} (크기: {len(body)} bytes)")
+            return str(file_path)
+
+        except ImageSkipped as e:
+            if skipped:
+                skipped.record(img_url, img_name, e)
+            return None
+        except Exception as e:
+            print(f"이미지 다운로드 실패: {img_url} - {e}")
+            return None
+
+    def extract_text_with_styling(self, content, url=None):
+        """텍스트를 스타일과 함께 추출 (content는 extract_page의 PageContent)"""
+        return format_styled_text(content, url)
+
+    def parse_page(self, content, url, phases=None):
+        """HTML 파싱 및 텍스트/이미지 목록/테이블 추출 (실행기 스레드에서 호출)"""
+        phases = phases or PhaseTimer()
+        with phases.phase('parse'):
+            page = extract_page(content)
+        title = page.title if page.title is not None else "웹페이지_스크래핑"
+        with phases.phase('format'):
+            styled_text = self.extract_text_with_styling(page, url)
+        return title, styled_text, page.image_list(), page.tables
+
+    async def scrape_page(self, url, session=None):
+        """웹페이지 스크래핑 (WebScraper.scrape_page와 같은 결과 dict 반환)"""
+        if session is None:
+            async with self.create_session() as own_session:
+                return await self.scrape_page(url, own_session)
+
+        if self.image_semaphore is None:
+            self.image_semaphore = asyncio.Semaphore(self.max_workers)
+
+        try:
+            # URL 검증 및 정규화
+            if not url.startswith(('http://', 'https://')):
+                url = 'https://' + url
+
+            print(f"요청 URL: {url}")
+            loop = asyncio.get_running_loop()
+            # 단계별 소요 시간/바이트 수 (결과와 metadata.json의 phases, bytes)
+            phases = PhaseTimer()
+            started = phases.started
+            async with self.host_semaphore(url):
+                response, content = await self.fetch(session, url, phases=phases)
+            fetched = time.perf_counter()
+
+            # 실행기 스레드에서 파싱/텍스트 변환 (두 단계를 나눠 기록)
+            title, styled_text, images, tables = await loop.run_in_executor(
+                None, self.parse_page, content, url, phases)
+            extracted = time.perf_counter()
+
+            # 폴더 생성
+            safe_title = re.sub(r'[^\w\-_\.]', '_', title)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            with phases.phase('write'):
+                folder_path = await loop.run_in_executor(None, self.create_folder, f"{safe_title}_{timestamp}")
+
+            # 텍스트/마크다운 파일 저장과 이미지 다운로드를 함께 진행
+            text_file = folder_path / "content.txt"
+            md_file = folder_path / "content.md"
+            image_started = time.perf_counter()
+            store_stats = StoreStats()
+            skipped = SkippedImages()
+
+            def write_timed(path, data):
+                with phases.phase('write'):
+                    self.write_file(path, data)
+
+            downloads = [self.download_image(session, src, folder_path, alt, url, store_stats, skipped)
+                         for src, alt in images]
+            results = await asyncio.gather(
+                loop.run_in_executor(None, write_timed, text_file, styled_text),
+                loop.run_in_executor(None, write_timed, md_file, styled_text),
+                *downloads
+            )
+            image_wall = time.perf_counter() - image_started
+
+            image_info = []
+            for (img_src, img_alt), img_path in zip(images, results[2:]):
+                if img_path:
+                    image_info.append({
+                        'original_url': img_src,
+                        'local_path': img_path,
+                        'alt_text': img_alt
+                    })
+
+            phases.add('images', image_wall)
+            phases.count('page', len(content))
+            phases.count('images', sum(os.path.getsize(info['local_path']) for info in image_info))
+            phases.count('text', len(styled_text.encode('utf-8')))
+
+            timing = {
+                'page_fetch': round(fetched - started, 3),
+                'extract': round(extracted - fetched, 3),
+                'image_requests': len(images),
+                'images_wall': round(image_wall, 3),
+                'total': round(time.perf_counter() - started, 3)
+            }
+
+            # 메타데이터 저장
+            metadata = {
+                'url': url,
+                'title': title,
+                'scraped_at': datetime.now().isoformat(),
+                'method': 'async',
+                'images': image_info,
+                'text_file': str(text_file),
+                'markdown_file': str(md_file),
+                'timing': timing,
+                'phases': phases.phases_dict(),
+                'bytes': phases.bytes_dict(),
+                'image_store': store_stats.to_dict(),
+                'skipped_images': skipped.to_list()
+            }
+            metadata_json = json.dumps(metadata, ensure_ascii=False, indent=2)
+            await loop.run_in_executor(None, write_timed, folder_path / "metadata.json", metadata_json)
+            index_page(url, title, styled_text, tables, folder_path, metadata['scraped_at'])
+
+            return {
+                'success': True,
+                'folder_path': str(folder_path),
+                'text_content': styled_text,
+                'image_count': len(image_info),
+                'images': image_info,
+                'skipped_images': metadata['skipped_images'],
+                'timing': timing,
+                'phases': phases.phases_dict(),
+                'bytes': phases.bytes_dict(),
+                'method': 'async'
+            }
+
+        except aiohttp.ClientResponseError as e:
+            return {
+                'success': False,
+                'error': f'HTTP 오류 ({e.status}): {e.message}'
+            }
+        except (aiohttp.ServerTimeoutError, asyncio.TimeoutError) as e:
+            if 'connect' in str(e).lower():
+                error = '연결 시간 초과: 서버에 연결할 수 없습니다. 네트워크 연결을 확인하거나 잠시 후 다시 시도해주세요.'
+            else:
+                error = '읽기 시간 초과: 서버 응답이 너무 느립니다. 잠시 후 다시 시도해주세요.'
+            return {'success': False, 'error': error}
+        except aiohttp.ClientConnectionError:
+            return {
+                'success': False,
+                'error': '연결 오류: 서버에 연결할 수 없습니다. URL을 확인하거나 네트워크 연결을 점검해주세요.'
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'알 수 없는 오류: {str(e)}'
+            }
+
+    async def scrape_many(self, urls, concurrency=DEFAULT_PAGE_CONCURRENCY, on_result=None):
+        """여러 페이지를 동시에 스크래핑 (입력 순서대로 결과 반환)
+
+        on_result를 주면 페이지가 끝날 때마다 on_result(url, 결과, 소요 초)를 호출합니다.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(session, url):
+            async with semaphore:
+                started = time.perf_counter()
+                result = await self.scrape_page(url, session)
+                if on_result:
+                    on_result(url, result, time.perf_counter() - started)
+                return result
+
+        async with self.create_session() as session:
+            return await asyncio.gather(*(run(session, url) for url in urls))
+
+
+def run_sync(coro):
+    """동기 코드(Flask, CLI)에서 코루틴 실행"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    raise RuntimeError('실행 중인 이벤트 루프 안에서는 await를 사용해주세요.')
+
+
+def scrape_page_sync(url, **kwargs):
+    """단일 페이지 동기 래퍼"""
+    return run_sync(AsyncWebScraper(**kwargs).scrape_page(url))
+
+
+def scrape_pages_sync(urls, concurrency=DEFAULT_PAGE_CONCURRENCY, on_result=None, **kwargs):
+    """여러 페이지 동기 래퍼"""
+    return run_sync(AsyncWebScraper(**kwargs).scrape_many(urls, concurrency, on_result))
+
+
+def main():
+    import sys
+    if len(sys.argv) < 2:
+        print("사용법: python3 web_scraper_async.py <URL> [URL ...]")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    results = scrape_pages_sync(sys.argv[1:])
+    elapsed = time.perf_counter() - started
+
+    for url, result in zip(sys.argv[1:], results):
+        if result['success']:
+            print(f"완료: {url} -> {result['folder_path']} (이미지 {result['image_count']}개)")
+        else:
+            print(f"실패: {url} - {result['error']}")
+    print(f"전체 {len(results)}개 페이지, {elapsed:.2f}초")
+
+if __name__ == "__main__":
+    main()
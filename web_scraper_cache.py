@@ -0,0 +1,438 @@
+"""
+디스크 기반 HTTP 조건부 요청 캐시
+공유 세션의 어댑터 아래에서 GET 응답 본문과 검증자(ETag/Last-Modified)를 저장하고,
+다음 요청에는 If-None-Match/If-Modified-Since를 붙여 304 응답이면 디스크의 본문을 돌려줍니다.
+전체 크기가 상한을 넘으면 가장 오래 쓰지 않은 항목부터 지웁니다.
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.response import HTTPResponse
+
+# 기본 설정
+DEFAULT_CACHE_DIR = Path.home() / ".web_scraper" / "http_cache"
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024   # 전체 캐시 크기 상한
+DEFAULT_MAX_ENTRY_BYTES = 32 * 1024 * 1024    # 이보다 큰 응답은 저장하지 않음
+
+# 본문을 디코딩해 저장하므로 다시 만들 때 빼야 하는 헤더
+DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive'}
+
+# 304 응답으로 갱신하는 헤더
+REFRESHED_HEADERS = ('date', 'cache-control', 'expires', 'etag', 'last-modified', 'age')
+
+
+def parse_cache_control(value):
+    """Cache-Control 헤더를 {지시어: 값} dict로 변환"""
+    directives = {}
+    for part in (value or '').split(','):
+        name, _, arg = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = arg.strip('"') or None
+    return directives
+
+
+def parse_http_date(value):
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def freshness_deadline(headers, now):
+    """max-age/Expires로 계산한 유효 기한 (정보가 없으면 now - 항상 재검증)"""
+    directives = parse_cache_control(headers.get('cache-control'))
+    if 'no-cache' in directives:
+        return now
+    if 'max-age' in directives:
+        try:
+            age = int(headers.get('age') or 0)
+            return now + int(directives['max-age']) - age
+        except ValueError:
+            return now
+    expires = parse_http_date(headers.get('expires'))
+    date = parse_http_date(headers.get('date'))
+    if expires is not None:
+        return now + expires - (date or now)
+    return now
+
+
+def cache_key(url):
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+
+class CacheEntry:
+    def __init__(self, url, status, reason, headers, fresh_until, size):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers          # 소문자 키 dict (본문 관련 헤더 제외)
+        self.fresh_until = fresh_until
+        self.size = size
+
+    def to_dict(self):
+        return {
+            'url': self.url,
+            'status': self.status,
+            'reason': self.reason,
+            'headers': self.headers,
+            'fresh_until': self.fresh_until,
+            'size': self.size
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['url'], data['status'], data.get('reason'), data['headers'],
+                   data['fresh_until'], data['size'])
+
+
+class HttpCache:
+    """URL별 응답 본문 + 검증자를 디스크에 저장하는 LRU 캐시 (스레드 안전)"""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_MAX_BYTES,
+                 max_entry_bytes=DEFAULT_MAX_ENTRY_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.lock = threading.Lock()
+        self.entries = None  # key → 크기 (오래 쓰지 않은 순서), 처음 사용할 때 디스크에서 읽음
+        self.total_bytes = 0
+        self.counters = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    def _load(self):
+        """디스크의 기존 항목을 마지막 사용 시각 순서로 읽기 (lock 보유 상태에서 호출)"""
+        if self.entries is not None:
+            return
+        self.entries = OrderedDict()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        found = []
+        for meta_path in self.directory.glob('*.json'):
+            body_path = meta_path.with_suffix('.body')
+            try:
+                found.append((body_path.stat().st_mtime, meta_path.stem, body_path.stat().st_size))
+            except OSError:
+                continue
+        for mtime, key, size in sorted(found):
+            self.entries[key] = size
+            self.total_bytes += size
+
+    def paths(self, key):
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def lookup(self, url):
+        """저장된 항목 반환 (없으면 None)"""
+        key = cache_key(url)
+        with self.lock:
+            self._load()
+            if key not in self.entries:
+                return None
+        meta_path, body_path = self.paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                entry = CacheEntry.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            self.remove(key)
+            return None
+        return entry if entry.url == url else None
+
+    def read_body(self, url):
+        """본문 읽기 (최근 사용 시각 갱신)"""
+        key = cache_key(url)
+        meta_path, body_path = self.paths(key)
+        try:
+            with open(body_path, 'rb') as f:
+                body = f.read()
+            os.utime(body_path)
+        except OSError:
+            self.remove(key)
+            return None
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+        return body
+
+    def store(self, url, status, reason, headers, body, now=None):
+        """응답 저장 (임시 파일에 쓴 뒤 교체)"""
+        if len(body) > self.max_entry_bytes:
+            return False
+        now = now or time.time()
+        key = cache_key(url)
+        entry = CacheEntry(url, status, reason, headers, freshness_deadline(headers, now), len(body))
+        meta_path, body_path = self.paths(key)
+        suffix = f".{threading.get_ident()}.part"
+        with self.lock:
+            self._load()
+        try:
+            tmp_body = body_path.with_name(body_path.name + suffix)
+            with open(tmp_body, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_body, body_path)
+            self._write_meta(meta_path, entry)
+        except OSError as e:
+            print(f"HTTP 캐시 저장 실패: {url} - {e}")
+            return False
+
+        with self.lock:
+            self.total_bytes += len(body) - self.entries.pop(key, 0)
+            self.entries[key] = len(body)
+            self.counters['stores'] += 1
+            evicted = self._evict()
+        for old_key in evicted:
+            for path in self.paths(old_key):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+        return True
+
+    def refresh(self, url, entry, headers, now=None):
+        """304 응답의 헤더로 유효 기한과 검증자 갱신"""
+        now = now or time.time()
+        for name in REFRESHED_HEADERS:
+            if name in headers:
+                entry.headers[name] = headers[name]
+        entry.fresh_until = freshness_deadline(entry.headers, now)
+        try:
+            self._write_meta(self.paths(cache_key(url))[0], entry)
+        except OSError as e:
+            print(f"HTTP 캐시 갱신 실패: {url} - {e}")
+
+    def _write_meta(self, meta_path, entry):
+        tmp_meta = meta_path.with_name(meta_path.name + f".{threading.get_ident()}.part")
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump(entry.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_meta, meta_path)
+
+    def _evict(self):
+        """크기 상한을 넘으면 오래 쓰지 않은 항목부터 제거 (lock 보유 상태에서 호출)"""
+        evicted = []
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            key, size = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            self.counters['evictions'] += 1
+            evicted.append(key)
+        return evicted
+
+    def remove(self, key):
+        with self.lock:
+            if self.entries is not None and key in self.entries:
+                self.total_bytes -= self.entries.pop(key)
+        for path in self.paths(key):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def stats(self):
+        with self.lock:
+            self._load()
+            return {
+                'directory': str(self.directory),
+                'entries': len(self.entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                **self.counters
+            }
+
+    def clear(self):
+        with self.lock:
+            self._load()
+            keys = list(self.entries)
+        for key in keys:
+            self.remove(key)
+
+
+class RecordingBody:
+    """응답 본문(urllib3 HTTPResponse)을 읽히는 대로 기록했다가 끝까지 읽히면 캐시에 저장
+
+    stream=True로 받는 응답도 호출자가 읽는 속도 그대로 전달하므로 스트리밍 파싱과 함께 쓸 수 있습니다.
+    """
+
+    def __init__(self, raw, on_complete, max_bytes):
+        self._raw = raw
+        self._on_complete = on_complete
+        self._max_bytes = max_bytes
+        self._chunks = []
+        self._size = 0
+        self._active = True
+        if hasattr(raw, 'read1'):
+            self.read1 = self._read1
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def _record(self, data, decode_content):
+        if not self._active:
+            return
+        if not decode_content and self._raw.headers.get('content-encoding'):
+            # 압축된 바이트를 그대로 읽는 경우는 저장하지 않음
+            self._active = False
+            return
+        if data:
+            self._chunks.append(data)
+            self._size += len(data)
+            if self._size > self._max_bytes:
+                self._active = False
+                self._chunks = []
+
+    def _finish(self):
+        if self._active:
+            self._active = False
+            body, self._chunks = b''.join(self._chunks), []
+            self._on_complete(body)
+
+    def read(self, amt=None, decode_content=None, **kwargs):
+        data = self._raw.read(amt, decode_content=decode_content, **kwargs)
+        self._record(data, decode_content)
+        if amt is None or not data:
+            self._finish()
+        return data
+
+    def _read1(self, amt=None, decode_content=None):
+        data = self._raw.read1(amt, decode_content=decode_content)
+        self._record(data, decode_content)
+        if not data:
+            self._finish()
+        return data
+
+    def stream(self, amt=2 ** 16, decode_content=None):
+        for data in self._raw.stream(amt, decode_content=decode_content):
+            self._record(data, decode_content)
+            yield data
+        self._finish()
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """GET 요청을 HttpCache로 처리하는 어댑터
+
+    - 유효 기한(max-age/Expires) 안의 항목은 네트워크 없이 반환
+    - 기한이 지난 항목은 If-None-Match/If-Modified-Since로 재검증, 304면 저장된 본문 반환
+    - 200 응답은 본문을 끝까지 읽는 시점에 저장 (no-store, Set-Cookie, Vary, Range 요청 등은 제외)
+    - 304 응답의 Set-Cookie는 저장된 본문으로 만든 응답에 그대로 붙임
+    응답에는 cache_status 속성('hit', 'revalidated', 'miss', 'bypass')이 붙습니다.
+    """
+
+    def __init__(self, cache, **kwargs):
+        self.cache = cache
+        super().__init__(**kwargs)
+
+    def send(self, request, stream=False, **kwargs):
+        if request.method != 'GET' or 'Range' in request.headers:
+            response = super().send(request, stream=stream, **kwargs)
+            response.cache_status = 'bypass'
+            return response
+
+        url = request.url
+        request_directives = parse_cache_control(request.headers.get('Cache-Control'))
+        entry = self.cache.lookup(url)
+        now = time.time()
+
+        if entry and 'no-cache' not in request_directives and entry.fresh_until > now:
+            response = self.cached_response(request, entry)
+            if response is not None:
+                self.cache.count('hits')
+                response.cache_status = 'hit'
+                return response
+
+        if entry:
+            request = request.copy()
+            if 'etag' in entry.headers:
+                request.headers['If-None-Match'] = entry.headers['etag']
+            if 'last-modified' in entry.headers:
+                request.headers['If-Modified-Since'] = entry.headers['last-modified']
+
+        response = super().send(request, stream=stream, **kwargs)
+
+        if response.status_code == 304 and entry:
+            self.cache.refresh(url, entry, {k.lower(): v for k, v in response.headers.items()})
+            response.close()
+            cached = self.cached_response(request, entry)
+            if cached is not None:
+                # 304에 붙은 Set-Cookie(세션 갱신 등)는 저장된 본문과 함께 호출자에게 넘김
+                cached.cookies.update(response.cookies)
+                if 'Set-Cookie' in response.headers:
+                    cached.headers['Set-Cookie'] = response.headers['Set-Cookie']
+                self.cache.count('revalidated')
+                cached.cache_status = 'revalidated'
+                return cached
+            # 본문이 사라졌으면 조건 없이 다시 요청
+            request.headers.pop('If-None-Match', None)
+            request.headers.pop('If-Modified-Since', None)
+            response = super().send(request, stream=stream, **kwargs)
+
+        self.cache.count('misses')
+        response.cache_status = 'miss'
+        if self.cacheable(request, response, request_directives):
+            headers = {k.lower(): v for k, v in response.headers.items()
+                       if k.lower() not in DROPPED_HEADERS}
+            status, reason = response.status_code, response.reason
+            response.raw = RecordingBody(
+                response.raw,
+                lambda body: self.cache.store(url, status, reason, headers, body),
+                self.cache.max_entry_bytes
+            )
+        return response
+
+    def cacheable(self, request, response, request_directives):
+        if response.status_code != 200 or 'no-store' in request_directives:
+            return False
+        headers = response.headers
+        directives = parse_cache_control(headers.get('Cache-Control'))
+        if 'no-store' in directives:
+            return False
+        # 쿠키를 설정하는 응답은 스크래핑마다 다른 값이므로 저장하지 않음 (캐시 적중이면 쿠키를 받지 못함)
+        if 'Set-Cookie' in headers:
+            return False
+        # 본문을 디코딩해 저장하므로 Accept-Encoding 이외의 Vary는 지원하지 않음
+        vary = {v.strip().lower() for v in headers.get('Vary', '').split(',') if v.strip()}
+        if vary - {'accept-encoding'}:
+            return False
+        has_validator = 'ETag' in headers or 'Last-Modified' in headers
+        return has_validator or freshness_deadline(headers, 0) > 0
+
+    def cached_response(self, request, entry):
+        """저장된 본문으로 requests 응답 생성 (stream=True 읽기도 그대로 동작)"""
+        body = self.cache.read_body(entry.url)
+        if body is None:
+            return None
+        headers = dict(entry.headers)
+        headers['content-length'] = str(len(body))
+        raw = HTTPResponse(body=io.BytesIO(body), headers=headers, status=entry.status,
+                           reason=entry.reason, preload_content=False, decode_content=False,
+                           request_url=request.url)
+        return self.build_response(request, raw)
+
+
+class CacheStats:
+    """스크래핑 한 번 동안의 캐시 적중 집계 (여러 스레드에서 기록)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = {'hits': 0, 'revalidated': 0, 'misses': 0}
+
+    def record(self, response):
+        status = getattr(response, 'cache_status', None)
+        name = {'hit': 'hits', 'revalidated': 'revalidated', 'miss': 'misses'}.get(status)
+        if name:
+            with self.lock:
+                self.counts[name] += 1
+
+    def to_dict(self):
+        with self.lock:
+            return dict(self.counts)
+
+
+def is_unchanged(response):
+    """캐시에서 나온(적중/304) 응답인지 여부"""
+    return getattr(response, 'cache_status', None) in ('hit', 'revalidated')
@@ -0,0 +1,141 @@
+"""
+Selenium 브라우저 네트워크 응답 수집
+Chrome이 페이지를 불러오며 이미 받은 이미지 본문을 DevTools 프로토콜(Network.getResponseBody)로 꺼내
+requests로 같은 이미지를 다시 받지 않도록 합니다. 쿠키/세션이 필요한 이미지도 브라우저가 받은 그대로 저장됩니다.
+
+Chrome 성능 로그(goog:loggingPrefs)에 남는 Network 이벤트로 URL별 요청 id를 찾고,
+본문을 받지 못한 이미지(지연 로딩 등)만 호출하는 쪽에서 다시 요청합니다.
+추출에 쓰지 않는 글꼴/동영상/오디오는 Network.setBlockedURLs로 막을 수 있습니다.
+"""
+
+import base64
+import json
+import threading
+
+# 브라우저가 응답 본문을 보관하는 버퍼 크기 (넘치면 오래된 본문부터 버려지고 다시 받음)
+MAX_TOTAL_BUFFER = 200 * 1024 * 1024
+MAX_RESOURCE_BUFFER = 20 * 1024 * 1024
+
+# block_assets일 때 막을 URL 패턴 (Network.setBlockedURLs는 리소스 종류가 아닌 URL로 막음)
+BLOCKED_URL_PATTERNS = [
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.ogg', '*.ogv', '*.mp3', '*.wav', '*.m4a', '*.m3u8', '*.mov',
+    'fonts.googleapis.com/*', 'fonts.gstatic.com/*'
+]
+
+
+def enable_performance_log(options):
+    """Chrome 옵션에 Network 이벤트를 남기는 성능 로그 설정"""
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return options
+
+
+class NetworkCapture:
+    """한 번의 페이지 로드 동안 브라우저가 받은 응답 (URL → 요청 id)
+
+    start()는 페이지 이동 전에, collect()는 페이지 준비 후 이미지 저장 전에 호출합니다.
+    """
+
+    def __init__(self, driver, block_assets=False):
+        self.driver = driver
+        self.block_assets = block_assets
+        self.lock = threading.Lock()
+        self.requests = {}   # URL (리디렉션 전 URL 포함) → 요청 id
+        self.responses = {}  # 요청 id → {'url', 'status', 'mime', 'headers'}
+        self.finished = set()
+        self.blocked = 0
+        self.available = False
+        self.counters = {'captured': 0, 'missed': 0}
+
+    def start(self):
+        """Network 도메인을 켜고 이전 로그를 비움 (성능 로그가 없는 드라이버면 False)"""
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {
+                'maxTotalBufferSize': MAX_TOTAL_BUFFER,
+                'maxResourceBufferSize': MAX_RESOURCE_BUFFER
+            })
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs',
+                                        {'urls': BLOCKED_URL_PATTERNS if self.block_assets else []})
+            # 풀에서 빌린 드라이버에 남은 이전 페이지 이벤트
+            self.driver.get_log('performance')
+            self.available = True
+        except Exception as e:
+            print(f"브라우저 네트워크 수집을 사용할 수 없습니다: {e}")
+            self.available = False
+        return self.available
+
+    def collect(self):
+        """지금까지 쌓인 성능 로그에서 Network 이벤트 읽기"""
+        if not self.available:
+            return
+        try:
+            entries = self.driver.get_log('performance')
+        except Exception as e:
+            print(f"브라우저 네트워크 로그 읽기 실패: {e}")
+            return
+        with self.lock:
+            for entry in entries:
+                try:
+                    message = json.loads(entry['message'])['message']
+                except (KeyError, TypeError, ValueError):
+                    continue
+                self._handle(message.get('method'), message.get('params') or {})
+
+    def _handle(self, method, params):
+        request_id = params.get('requestId')
+        if method == 'Network.requestWillBeSent':
+            # 리디렉션도 같은 요청 id를 쓰므로 처음 URL로도 찾을 수 있음
+            self.requests[params['request']['url']] = request_id
+        elif method == 'Network.responseReceived':
+            response = params['response']
+            self.requests.setdefault(response['url'], request_id)
+            self.responses[request_id] = {
+                'url': response['url'],
+                'status': response.get('status'),
+                'mime': response.get('mimeType', ''),
+                'headers': {name.lower(): value for name, value in (response.get('headers') or {}).items()}
+            }
+        elif method == 'Network.loadingFinished':
+            self.finished.add(request_id)
+        elif method == 'Network.loadingFailed':
+            if params.get('blockedReason'):
+                self.blocked += 1
+
+    def response_body(self, url):
+        """브라우저가 받은 본문 (본문, Content-Type) (받지 않았으면 None)"""
+        with self.lock:
+            request_id = self.requests.get(url)
+            response = self.responses.get(request_id)
+            finished = request_id in self.finished
+        if response is None or not finished or not (200 <= (response['status'] or 0) < 300):
+            self._count('missed')
+            return None
+        try:
+            result = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+        except Exception as e:
+            # 버퍼에서 밀려났거나 페이지를 벗어난 경우
+            print(f"브라우저 응답 본문을 가져올 수 없습니다: {url} - {e}")
+            self._count('missed')
+            return None
+        body = result.get('body', '')
+        body = base64.b64decode(body) if result.get('base64Encoded') else body.encode('utf-8')
+        self._count('captured')
+        return body, response['headers'].get('content-type') or response['mime']
+
+    def cookie_header(self, url):
+        """url에 보낼 브라우저 쿠키 (다시 요청할 때 사용, 없으면 None)"""
+        if not self.available:
+            return None
+        try:
+            cookies = self.driver.execute_cdp_cmd('Network.getCookies', {'urls': [url]}).get('cookies') or []
+        except Exception:
+            return None
+        return '; '.join(f"{cookie['name']}={cookie['value']}" for cookie in cookies) or None
+
+    def _count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def to_dict(self):
+        with self.lock:
+            return {**self.counters, 'blocked': self.blocked, 'enabled': self.available}
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+SQLite 스크래핑 저장소
+페이지마다 폴더(content.txt, content.md, metadata.json, images/)를 만드는 대신
+페이지, 추출한 텍스트, 테이블 키/값, 이미지 참조를 하나의 SQLite 데이터베이스(WAL 모드)에 저장합니다.
+이미지 본문은 내용 주소 이미지 저장소(web_scraper_store)에 두고 해시만 기록하며,
+기존 폴더 구조는 export로 언제든 다시 만들 수 있습니다.
+
+쓰기는 전용 스레드 하나가 맡아, 동시에 들어온 페이지들을 한 트랜잭션으로 묶어 커밋합니다.
+묶음 커밋이 실패하면 페이지마다 다시 저장해, 실패한 페이지만 save_page에서 예외가 납니다.
+
+사용법:
+    python web_scraper_db.py stats
+    python web_scraper_db.py list --limit 20
+    python web_scraper_db.py export 123 --dir ~/Desktop
+"""
+
+import argparse
+import json
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from urllib.parse import urlparse
+from web_scraper_store import get_image_store
+
+DEFAULT_DB_PATH = Path.home() / ".web_scraper" / "scrapes.db"
+DEFAULT_BATCH_SIZE = 64       # 한 트랜잭션에 묶을 최대 페이지 수
+DEFAULT_BATCH_DELAY = 0.02    # 첫 페이지가 들어온 뒤 다른 페이지를 기다려 함께 커밋할 시간 (초)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT,
+    folder_name TEXT NOT NULL,
+    scraped_at TEXT NOT NULL,
+    text TEXT NOT NULL,
+    metadata TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS page_fields (
+    page_id INTEGER NOT NULL REFERENCES pages(id),
+    table_no INTEGER NOT NULL,
+    row_no INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS page_images (
+    page_id INTEGER NOT NULL REFERENCES pages(id),
+    position INTEGER NOT NULL,
+    original_url TEXT NOT NULL,
+    alt_text TEXT,
+    hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_url ON pages(url, scraped_at);
+CREATE INDEX IF NOT EXISTS page_fields_page ON page_fields(page_id);
+CREATE INDEX IF NOT EXISTS page_fields_key ON page_fields(key);
+CREATE INDEX IF NOT EXISTS page_images_page ON page_images(page_id);
+"""
+
+# 파일 앞부분으로 확장자 추정 (내보낼 때 사용)
+IMAGE_SIGNATURES = [
+    (b'\x89PNG\r\n\x1a\n', '.png'),
+    (b'\xff\xd8\xff', '.jpg'),
+    (b'GIF87a', '.gif'),
+    (b'GIF89a', '.gif'),
+]
+
+
+def image_extension(path, original_url):
+    """저장된 이미지의 확장자 (파일 앞부분, 없으면 URL, 그것도 없으면 .jpg)"""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(16)
+    except OSError:
+        head = b''
+    for signature, ext in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return ext
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return '.webp'
+    return os.path.splitext(urlparse(original_url).path)[1] or '.jpg'
+
+
+def page_record(url, title, folder_name, text, content, image_info, metadata):
+    """scrape_page 결과를 save_page에 넘길 dict로 변환
+
+    content는 extract_page의 PageContent, image_info의 local_path는 이미지 저장소 파일 경로입니다.
+    """
+    return {
+        'url': url,
+        'title': title,
+        'folder_name': folder_name,
+        'scraped_at': metadata['scraped_at'],
+        'text': text,
+        'tables': content.tables,
+        'images': [{
+            'original_url': info['original_url'],
+            'alt_text': info['alt_text'],
+            'hash': Path(info['local_path']).name
+        } for info in image_info],
+        'metadata': metadata
+    }
+
+
+class ScrapeDatabase:
+    """스크래핑 결과 SQLite 저장소 (스레드 안전)
+
+    save_page는 쓰기 스레드가 커밋할 때까지 기다린 뒤 페이지 id를 반환합니다.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, batch_size=DEFAULT_BATCH_SIZE, batch_delay=DEFAULT_BATCH_DELAY):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.lock = threading.Lock()
+        self.reader = self.connect()
+        with self.lock, self.reader:
+            self.reader.executescript(SCHEMA)
+        self.queue = queue.Queue()
+        self.commits = 0
+        self.writer = threading.Thread(target=self._write_loop, name='scrape-db-writer', daemon=True)
+        self.writer.start()
+
+    def connect(self):
+        db = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def save_page(self, record):
+        """페이지 저장 후 id 반환 (커밋될 때까지 기다림)"""
+        future = Future()
+        self.queue.put((record, future))
+        return future.result()
+
+    def _write_loop(self):
+        db = self.connect()
+        stopping = False
+        while not stopping:
+            item = self.queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.batch_delay
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                with db:
+                    page_ids = [self._insert(db, record) for record, future in batch]
+            except Exception:
+                # 묶음이 롤백되면 페이지마다 따로 다시 저장 (실패한 페이지의 save_page만 예외)
+                for record, future in batch:
+                    self._insert_one(db, record, future)
+                continue
+            self.commits += 1
+            for (record, future), page_id in zip(batch, page_ids):
+                future.set_result(page_id)
+        db.close()
+
+    def _insert_one(self, db, record, future):
+        try:
+            with db:
+                page_id = self._insert(db, record)
+        except Exception as e:
+            print(f"스크래핑 데이터베이스 저장 실패: {record.get('url')} - {e}")
+            future.set_exception(e)
+            return
+        self.commits += 1
+        future.set_result(page_id)
+
+    def _insert(self, db, record):
+        cursor = db.execute(
+            "INSERT INTO pages (url, title, folder_name, scraped_at, text, metadata) VALUES (?, ?, ?, ?, ?, ?)",
+            (record['url'], record['title'], record['folder_name'], record['scraped_at'], record['text'],
+             json.dumps(record['metadata'], ensure_ascii=False)))
+        page_id = cursor.lastrowid
+        db.executemany(
+            "INSERT INTO page_fields (page_id, table_no, row_no, key, value) VALUES (?, ?, ?, ?, ?)",
+            [(page_id, table_no, row_no, key, value)
+             for table_no, rows in enumerate(record['tables'])
+             for row_no, (key, value) in enumerate(rows)])
+        db.executemany(
+            "INSERT INTO page_images (page_id, position, original_url, alt_text, hash) VALUES (?, ?, ?, ?, ?)",
+            [(page_id, position, image['original_url'], image['alt_text'], image['hash'])
+             for position, image in enumerate(record['images'])])
+        return page_id
+
+    def get_page(self, page_id):
+        """저장된 페이지 (없으면 None)"""
+        with self.lock:
+            row = self.reader.execute(
+                "SELECT id, url, title, folder_name, scraped_at, text, metadata FROM pages WHERE id = ?",
+                (page_id,)).fetchone()
+            if row is None:
+                return None
+            fields = self.reader.execute(
+                "SELECT table_no, key, value FROM page_fields WHERE page_id = ? ORDER BY table_no, row_no",
+                (page_id,)).fetchall()
+            images = self.reader.execute(
+                "SELECT original_url, alt_text, hash FROM page_images WHERE page_id = ? ORDER BY position",
+                (page_id,)).fetchall()
+
+        tables = []
+        for table_no, key, value in fields:
+            while len(tables) <= table_no:
+                tables.append([])
+            tables[table_no].append((key, value))
+        return {
+            'id': row[0],
+            'url': row[1],
+            'title': row[2],
+            'folder_name': row[3],
+            'scraped_at': row[4],
+            'text': row[5],
+            'metadata': json.loads(row[6]),
+            'tables': tables,
+            'images': [{'original_url': url, 'alt_text': alt, 'hash': digest} for url, alt, digest in images]
+        }
+
+    def latest_page_id(self, url):
+        """URL의 가장 최근 페이지 id (없으면 None)"""
+        with self.lock:
+            row = self.reader.execute(
+                "SELECT id FROM pages WHERE url = ? ORDER BY scraped_at DESC, id DESC LIMIT 1", (url,)).fetchone()
+        return row[0] if row else None
+
+    def list_pages(self, limit=20, offset=0):
+        with self.lock:
+            rows = self.reader.execute(
+                "SELECT id, url, title, scraped_at FROM pages ORDER BY id DESC LIMIT ? OFFSET ?",
+                (limit, offset)).fetchall()
+        return [{'id': page_id, 'url': url, 'title': title, 'scraped_at': scraped_at}
+                for page_id, url, title, scraped_at in rows]
+
+    def export(self, page_id, base_dir, image_store=None):
+        """페이지를 기존 폴더 구조(content.txt, content.md, metadata.json, images/)로 내보내고 폴더 경로 반환"""
+        page = self.get_page(page_id)
+        if page is None:
+            raise KeyError(f'페이지를 찾을 수 없습니다: {page_id}')
+        image_store = image_store or get_image_store()
+
+        base_dir = Path(base_dir)
+        base_dir.mkdir(parents=True, exist_ok=True)
+        folder_path = base_dir / page['folder_name']
+        suffix = 1
+        while True:
+            try:
+                folder_path.mkdir()
+                break
+            except FileExistsError:
+                suffix += 1
+                folder_path = base_dir / f"{page['folder_name']}_{suffix}"
+        (folder_path / "images").mkdir()
+
+        text_file = folder_path / "content.txt"
+        md_file = folder_path / "content.md"
+        for path in (text_file, md_file):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(page['text'])
+
+        image_info = []
+        for image in page['images']:
+            blob = image_store.blob_path(image['hash'])
+            safe_name = re.sub(r'[^\w\-_\.]', '_', image['alt_text'] or image['hash'][:12])
+            file_path = folder_path / "images" / f"{safe_name}{image_extension(blob, image['original_url'])}"
+            try:
+                image_store.checkout(image['hash'], file_path)
+            except OSError as e:
+                print(f"이미지 내보내기 실패: {image['original_url']} - {e}")
+                continue
+            image_info.append({
+                'original_url': image['original_url'],
+                'local_path': str(file_path),
+                'alt_text': image['alt_text']
+            })
+
+        metadata = dict(page['metadata'], images=image_info, text_file=str(text_file),
+                        markdown_file=str(md_file), page_id=page['id'])
+        with open(folder_path / "metadata.json", 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2)
+        return folder_path
+
+    def stats(self):
+        with self.lock:
+            pages = self.reader.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            images = self.reader.execute("SELECT COUNT(*) FROM page_images").fetchone()[0]
+        return {
+            'path': str(self.path),
+            'pages': pages,
+            'images': images,
+            'commits': self.commits,
+            'pending': self.queue.qsize(),
+            'bytes': sum(os.path.getsize(path) for path in (self.path, Path(f"{self.path}-wal"))
+                         if os.path.exists(path))
+        }
+
+    def close(self):
+        """남은 쓰기를 마치고 연결 닫기"""
+        self.queue.put(None)
+        self.writer.join()
+        with self.lock:
+            self.reader.close()
+
+
+_database = None
+_database_lock = threading.Lock()
+
+
+def get_scrape_database(path=DEFAULT_DB_PATH):
+    """프로세스 공유 스크래핑 데이터베이스 (처음 호출 시 생성)"""
+    global _database
+    with _database_lock:
+        if _database is None:
+            _database = ScrapeDatabase(path)
+        return _database
+
+
+def main():
+    parser = argparse.ArgumentParser(description='스크래핑 데이터베이스 관리')
+    parser.add_argument('command', choices=['stats', 'list', 'export'],
+                        help='stats: 현황, list: 최근 페이지, export: 폴더로 내보내기')
+    parser.add_argument('page', nargs='?', help='내보낼 페이지 id 또는 URL (export)')
+    parser.add_argument('--db', default=str(DEFAULT_DB_PATH), help=f'데이터베이스 위치 (기본값: {DEFAULT_DB_PATH})')
+    parser.add_argument('--dir', default=str(Path.home() / "Desktop"), help='내보낼 위치 (기본값: 데스크탑)')
+    parser.add_argument('--limit', type=int, default=20, help='list에서 보여줄 페이지 수 (기본값: 20)')
+    args = parser.parse_args()
+
+    database = ScrapeDatabase(args.db)
+    try:
+        if args.command == 'stats':
+            print(json.dumps(database.stats(), ensure_ascii=False, indent=2))
+        elif args.command == 'list':
+            for page in database.list_pages(args.limit):
+                print(f"{page['id']}\t{page['scraped_at']}\t{page['title']}\t{page['url']}")
+        else:
+            if not args.page:
+                parser.error('내보낼 페이지 id 또는 URL이 필요합니다.')
+            page_id = int(args.page) if args.page.isdigit() else database.latest_page_id(args.page)
+            if page_id is None:
+                parser.error(f'페이지를 찾을 수 없습니다: {args.page}')
+            print(f"내보내기 완료: {database.export(page_id, Path(args.dir).expanduser())}")
+    finally:
+        database.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Selenium 페이지 내 일괄 추출
+<img>마다 find_elements/get_attribute로 chromedriver를 오가거나 page_source를 받아 다시 파싱하지 않고,
+스크립트 한 번으로 브라우저 DOM을 순회해 제목, 헤딩, 테이블 키/값, 본문 블록, 이미지 src/alt/srcset을
+JSON 한 덩어리로 받아 PageContent로 만듭니다.
+
+순회 규칙은 web_scraper_extract.PageExtractor와 같습니다 (같은 페이지면 같은 마크다운이 나옴).
+다만 브라우저는 JavaScript가 켜져 있으면 <noscript> 안을 태그가 아닌 글자로 두므로 noscript는 본문에서 뺍니다.
+"""
+
+from web_scraper_extract import PageContent
+
+# PageExtractor를 옮긴 DOM 순회 (execute_script 본문, 결과는 dict로 변환됨)
+DOM_EXTRACT_SCRIPT = r"""
+var EXCLUDED = {script: 1, style: 1, template: 1, noscript: 1};
+var PRESERVE = {pre: 1, textarea: 1};
+var HEADINGS = ['h1', 'h2', 'h3'];
+var CONTENT_CLASS = /content|body|main/;
+var NOT_SPACE = /[^\x20\n\t\f\r]/;
+
+var collectors = [], excluded = 0, preserve = 0;
+var title = null, headings = {}, tables = [], openTables = [], openRows = [], blocks = [], images = [];
+
+function feed(text) {
+    if (excluded || !text) { return; }
+    // 공백뿐인 텍스트는 줄바꿈 하나 또는 공백 하나로 줄임
+    if (!preserve && !NOT_SPACE.test(text)) { text = text.indexOf('\n') >= 0 ? '\n' : ' '; }
+    for (var i = 0; i < collectors.length; i++) { collectors[i].push(text); }
+}
+
+function walk(node) {
+    var children = node.childNodes;
+    for (var i = 0; i < children.length; i++) {
+        var child = children[i];
+        if (child.nodeType === 3) {
+            feed(child.nodeValue);
+        } else if (child.nodeType === 1) {
+            visit(child);
+        }
+    }
+}
+
+function visit(el) {
+    var tag = el.nodeName.toLowerCase(), opened = 0, kind = null, parts, i;
+    if (EXCLUDED[tag]) {
+        excluded++;
+        kind = 'excluded';
+    } else if (tag === 'title') {
+        if (title === null) { title = []; collectors.push(title); opened = 1; }
+    } else if (HEADINGS.indexOf(tag) >= 0) {
+        if (!headings.hasOwnProperty(tag)) { headings[tag] = []; collectors.push(headings[tag]); opened = 1; }
+    } else if (tag === 'table') {
+        var rows = [];
+        tables.push(rows);
+        openTables.push(rows);
+        kind = 'table';
+    } else if (tag === 'tr') {
+        var row = [0, []];
+        for (i = 0; i < openTables.length; i++) { openTables[i].push(row); }
+        openRows.push(row);
+        kind = 'tr';
+    } else if (tag === 'td' || tag === 'th') {
+        // 바깥 행들을 포함해 앞 두 셀에 해당할 때만 텍스트 수집
+        parts = null;
+        for (i = 0; i < openRows.length; i++) {
+            if (openRows[i][0] < 2) {
+                if (parts === null) { parts = []; }
+                openRows[i][1].push(parts);
+            }
+            openRows[i][0]++;
+        }
+        if (parts !== null) { collectors.push(parts); opened = 1; }
+    } else if (PRESERVE[tag]) {
+        preserve++;
+        kind = 'preserve';
+    } else if (tag === 'img') {
+        var hasSrc = el.hasAttribute('src');
+        images.push({
+            src: hasSrc ? el.src : null,
+            alt: el.getAttribute('alt'),
+            srcset: el.getAttribute('srcset'),
+            current_src: el.currentSrc || (hasSrc ? el.src : null)
+        });
+    }
+    if ((tag === 'div' || tag === 'p') && CONTENT_CLASS.test(el.getAttribute('class') || '')) {
+        parts = [];
+        blocks.push(parts);
+        collectors.push(parts);
+        opened++;
+    }
+
+    walk(el);
+
+    collectors.length -= opened;
+    if (kind === 'excluded') { excluded--; }
+    else if (kind === 'preserve') { preserve--; }
+    else if (kind === 'table') { openTables.pop(); }
+    else if (kind === 'tr') { openRows.pop(); }
+}
+
+walk(document);
+
+var heading = null;
+for (var h = 0; h < HEADINGS.length; h++) {
+    if (headings.hasOwnProperty(HEADINGS[h])) { heading = headings[HEADINGS[h]].join('').trim(); break; }
+}
+var pairs = tables.map(function(rows) {
+    return rows.filter(function(row) { return row[0] >= 2; }).map(function(row) {
+        return [row[1][0].join('').trim(), row[1][1].join('').trim()];
+    });
+});
+var navigation = window.performance && performance.getEntriesByType ? performance.getEntriesByType('navigation')[0] : null;
+return {
+    title: title === null ? null : title.join('').trim(),
+    document_title: document.title,
+    heading: heading,
+    tables: pairs,
+    blocks: blocks.map(function(parts) { return parts.join(''); }),
+    images: images,
+    html_bytes: navigation ? navigation.decodedBodySize : null
+};
+"""
+
+
+def page_content(payload):
+    """DOM_EXTRACT_SCRIPT 결과를 PageContent로 변환 (이미지 src는 브라우저가 해석한 절대 URL)"""
+    return PageContent(
+        title=payload.get('title'),
+        heading=payload.get('heading'),
+        tables=[[(key, value) for key, value in rows] for rows in payload.get('tables') or []],
+        blocks=list(payload.get('blocks') or []),
+        images=[(image.get('src'), image.get('alt')) for image in payload.get('images') or []]
+    )
+
+
+def extract_dom(driver):
+    """현재 페이지를 스크립트 한 번으로 추출해 (PageContent, 원본 결과 dict) 반환"""
+    payload = driver.execute_script(DOM_EXTRACT_SCRIPT)
+    return page_content(payload), payload
@@ -0,0 +1,387 @@
+"""
+lxml 기반 단일 순회 텍스트 추출
+페이지 제목, 첫 번째 헤딩, 테이블 키/값, 본문 블록, 이미지 목록을 트리를 한 번만 돌면서 모읍니다.
+세 스크래퍼가 공통으로 사용하며 마크다운 출력은 기존 extract_text_with_styling과 같습니다.
+StreamingPageParser는 응답 바이트를 받는 대로 파싱해 전체 DOM 없이 같은 결과를 만듭니다.
+"""
+
+import codecs
+import re
+import lxml.html
+from lxml import etree
+from bs4.dammit import EncodingDetector, UnicodeDammit
+
+# 본문으로 보는 div/p의 class 패턴
+CONTENT_CLASS = re.compile(r'content|body|main')
+
+# 텍스트에서 제외하는 태그 (BeautifulSoup get_text와 동일)
+EXCLUDED_TAGS = frozenset(('script', 'style', 'template'))
+
+HEADING_TAGS = ('h1', 'h2', 'h3')
+
+# 공백만 있는 텍스트를 줄이지 않는 태그와 공백 문자 (BeautifulSoup과 동일)
+PRESERVE_WHITESPACE_TAGS = frozenset(('pre', 'textarea'))
+ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+# 스트리밍 파싱 시 인코딩 판별을 위해 모아두는 앞부분 크기 (브라우저의 meta 선언 탐색 범위)
+STREAM_SNIFF_BYTES = 1024
+
+# 선언된 인코딩을 실제로 쓰이는 상위 호환 인코딩으로 매핑 (브라우저와 동일)
+ENCODING_ALIASES = {
+    'euc-kr': 'cp949',
+    'euc_kr': 'cp949',
+    'ks_c_5601-1987': 'cp949',
+}
+
+
+class PageContent:
+    """추출 결과"""
+
+    def __init__(self, title=None, heading=None, tables=None, blocks=None, images=None):
+        self.title = title          # <title> 텍스트 (없으면 None)
+        self.heading = heading      # 첫 h1, 없으면 h2, 없으면 h3 텍스트 (없으면 None)
+        self.tables = tables or []  # 테이블별 [(키, 값), ...]
+        self.blocks = blocks or []  # 본문 div/p의 원본 텍스트
+        self.images = images or []  # 문서 순서의 (src, alt) - 속성이 없으면 None
+
+    def image_list(self):
+        """src가 있는 이미지의 (src, alt) 목록 (alt가 없으면 image_N)"""
+        return [(src, image_alt(i, alt)) for i, (src, alt) in enumerate(self.images) if src]
+
+
+def image_alt(index, alt):
+    """이미지 대체 텍스트 (없으면 문서 순서 기준 image_N)"""
+    return alt if alt is not None else f'image_{index+1}'
+
+
+class PageExtractor:
+    """start/end 이벤트를 받아 필요한 텍스트를 한 번에 모으는 상태 기계
+
+    iterwalk(완성된 트리)와 HTMLPullParser(점진적 파싱) 양쪽에서 같은 방식으로 사용합니다.
+    텍스트는 다음 요소가 시작되거나 부모가 끝날 때 확정되므로 그 시점에 열린 수집기에 전달합니다.
+    """
+
+    def __init__(self, on_image=None, on_title=None):
+        self.on_image = on_image  # 이미지 태그를 만날 때마다 호출 (index, src, alt)
+        self.on_title = on_title  # 제목이 확정되면 한 번 호출 (title, 없으면 None)
+        self.title_reported = False
+        self.collectors = []      # 열린 텍스트 수집기 (리스트)
+        self.excluded = 0         # 열린 script/style/template 수
+        self.preserve = 0         # 열린 pre/textarea 수
+        self.frames = []          # 요소별로 닫을 때 되돌릴 상태
+        self.title = None
+        self.headings = {}
+        self.tables = []
+        self.open_tables = []
+        self.open_rows = []
+        self.blocks = []
+        self.images = []
+
+    def current_title(self):
+        return ''.join(self.title).strip() if self.title is not None else None
+
+    def report_title(self):
+        """</title>, <body> 시작, 첫 이미지, 문서 끝 중 가장 이른 시점에 제목 확정"""
+        if not self.title_reported:
+            self.title_reported = True
+            if self.on_title:
+                self.on_title(self.current_title())
+
+    def feed_text(self, first, tails):
+        if self.excluded:
+            return
+        for text in (first, *reversed(tails)):
+            if text:
+                # 공백뿐인 텍스트는 줄바꿈 하나 또는 공백 하나로 줄임
+                if not self.preserve and not text.strip(ASCII_SPACES):
+                    text = '\n' if '\n' in text else ' '
+                for parts in self.collectors:
+                    parts.append(text)
+
+    def start(self, elem):
+        # 앞 형제의 tail(사이의 주석 tail 포함) 또는 부모의 text가 이 시점에 확정됨
+        if self.collectors and not self.excluded:
+            tails = []
+            prev = elem.getprevious()
+            while prev is not None and not isinstance(prev.tag, str):
+                tails.append(prev.tail)
+                prev = prev.getprevious()
+            if prev is not None:
+                first = prev.tail
+            else:
+                parent = elem.getparent()
+                first = parent.text if parent is not None else None
+            self.feed_text(first, tails)
+
+        tag = elem.tag
+        opened = 0
+        kind = None
+
+        if tag in EXCLUDED_TAGS:
+            self.excluded += 1
+            kind = 'excluded'
+        elif tag == 'title':
+            if self.title is None:
+                self.title = []
+                self.collectors.append(self.title)
+                opened = 1
+                kind = 'title'
+        elif tag in HEADING_TAGS:
+            if tag not in self.headings:
+                self.headings[tag] = []
+                self.collectors.append(self.headings[tag])
+                opened = 1
+        elif tag == 'table':
+            rows = []
+            self.tables.append(rows)
+            self.open_tables.append(rows)
+            kind = 'table'
+        elif tag == 'tr':
+            row = [0, []]  # [셀 수, 앞 두 셀의 텍스트]
+            for rows in self.open_tables:
+                rows.append(row)
+            self.open_rows.append(row)
+            kind = 'tr'
+        elif tag == 'td' or tag == 'th':
+            # 바깥 행들을 포함해 앞 두 셀에 해당할 때만 텍스트 수집
+            parts = None
+            for row in self.open_rows:
+                if row[0] < 2:
+                    if parts is None:
+                        parts = []
+                    row[1].append(parts)
+                row[0] += 1
+            if parts is not None:
+                self.collectors.append(parts)
+                opened = 1
+        elif tag in PRESERVE_WHITESPACE_TAGS:
+            self.preserve += 1
+            kind = 'preserve'
+        elif tag == 'body':
+            self.report_title()
+        elif tag == 'img':
+            src, alt = elem.get('src'), elem.get('alt')
+            self.images.append((src, alt))
+            self.report_title()
+            if self.on_image:
+                self.on_image(len(self.images) - 1, src, alt)
+
+        if (tag == 'div' or tag == 'p') and CONTENT_CLASS.search(elem.get('class') or ''):
+            parts = []
+            self.blocks.append(parts)
+            self.collectors.append(parts)
+            opened += 1
+
+        self.frames.append((opened, kind))
+
+    def end(self, elem):
+        # 마지막 자식의 tail 또는 자식이 없으면 자신의 text가 확정됨
+        if self.collectors and not self.excluded:
+            tails = []
+            last = elem[-1] if len(elem) else None
+            while last is not None and not isinstance(last.tag, str):
+                tails.append(last.tail)
+                last = last.getprevious()
+            self.feed_text(last.tail if last is not None else elem.text, tails)
+
+        opened, kind = self.frames.pop()
+        if opened:
+            del self.collectors[-opened:]
+        if kind == 'title':
+            self.report_title()
+        elif kind == 'excluded':
+            self.excluded -= 1
+        elif kind == 'preserve':
+            self.preserve -= 1
+        elif kind == 'table':
+            self.open_tables.pop()
+        elif kind == 'tr':
+            self.open_rows.pop()
+
+    def result(self):
+        self.report_title()
+        heading = None
+        for tag in HEADING_TAGS:
+            if tag in self.headings:
+                heading = ''.join(self.headings[tag]).strip()
+                break
+
+        tables = []
+        for rows in self.tables:
+            tables.append([(''.join(cells[0]).strip(), ''.join(cells[1]).strip())
+                           for count, cells in rows if count >= 2])
+
+        return PageContent(
+            title=self.current_title(),
+            heading=heading,
+            tables=tables,
+            blocks=[''.join(parts) for parts in self.blocks],
+            images=list(self.images)
+        )
+
+
+def detect_encoding(content, partial=False):
+    """HTML 바이트의 인코딩 판별 (BOM → 문서 선언 → UTF-8 → 추정)
+
+    partial이면 content는 문서 앞부분이므로 끝에서 잘린 UTF-8 문자는 오류로 보지 않습니다.
+    """
+    content, bom_encoding = EncodingDetector.strip_byte_order_mark(content)
+    declared = bom_encoding or EncodingDetector.find_declared_encoding(content, is_html=True)
+    if declared:
+        declared = ENCODING_ALIASES.get(declared.lower(), declared)
+        try:
+            ''.encode(declared)
+            return declared
+        except LookupError:
+            pass
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(content, final=not partial)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return UnicodeDammit(content, is_html=True).original_encoding or 'utf-8'
+
+
+def to_utf8(html):
+    """문자열/바이트 HTML을 UTF-8 바이트로 변환 (lxml에 인코딩을 명시해 넘기기 위함)"""
+    if isinstance(html, str):
+        return html.encode('utf-8', errors='replace')
+    encoding = detect_encoding(html)
+    if encoding.replace('_', '-').lower() in ('utf-8', 'utf8'):
+        return html
+    return html.decode(encoding, errors='replace').encode('utf-8')
+
+
+def html_parser():
+    return lxml.html.HTMLParser(encoding='utf-8')
+
+
+def extract_page(html):
+    """HTML(바이트 또는 문자열)에서 PageContent 추출"""
+    extractor = PageExtractor()
+    try:
+        root = lxml.html.document_fromstring(to_utf8(html), parser=html_parser())
+    except (etree.ParserError, ValueError):
+        # 빈 문서 등
+        return extractor.result()
+
+    start, end = extractor.start, extractor.end
+    for event, elem in etree.iterwalk(root, events=('start', 'end')):
+        if event == 'start':
+            start(elem)
+        else:
+            end(elem)
+    return extractor.result()
+
+
+class StreamingPageParser:
+    """응답 청크를 받는 대로 파싱하는 추출기 (HTMLPullParser)
+
+    on_image/on_title은 PageExtractor와 같으며 해당 태그가 파싱되는 즉시 호출됩니다.
+    끝난 요소는 비우고 처리가 끝난 앞 형제는 트리에서 떼어내므로
+    메모리에는 현재 요소까지의 경로만 남습니다.
+    """
+
+    def __init__(self, on_image=None, on_title=None):
+        self.extractor = PageExtractor(on_image=on_image, on_title=on_title)
+        self.parser = None
+        self.decoder = None
+        self.head = b''  # 인코딩 판별 전까지 모아둔 앞부분
+        self.bytes_read = 0
+
+    def feed(self, chunk):
+        self.bytes_read += len(chunk)
+        if self.parser is not None:
+            self._feed(chunk)
+            return
+        self.head += chunk
+        if len(self.head) >= STREAM_SNIFF_BYTES:
+            self._start()
+
+    def _start(self):
+        data, self.head = self.head, b''
+        encoding = detect_encoding(data, partial=True)
+        if encoding.replace('_', '-').lower() not in ('utf-8', 'utf8'):
+            # lxml에는 항상 UTF-8로 변환해 넘김 (extract_page와 동일)
+            self.decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        self.parser = etree.HTMLPullParser(events=('start', 'end'), encoding='utf-8')
+        self._feed(data)
+
+    def _feed(self, data, final=False):
+        if self.decoder:
+            data = self.decoder.decode(data, final=final).encode('utf-8')
+        if data:
+            self.parser.feed(data)
+        self._drain()
+
+    def _drain(self):
+        extractor = self.extractor
+        for event, elem in self.parser.read_events():
+            if event == 'start':
+                extractor.start(elem)
+                # 앞 형제의 tail은 방금 처리했으므로 더 이상 필요 없음
+                parent = elem.getparent()
+                if parent is not None:
+                    while elem.getprevious() is not None:
+                        del parent[0]
+            else:
+                extractor.end(elem)
+                elem.clear(keep_tail=True)
+
+    def close(self):
+        """남은 데이터를 처리하고 PageContent 반환"""
+        if self.parser is None:
+            if not self.head:
+                return self.extractor.result()
+            self._start()
+        self._feed(b'', final=True)
+        try:
+            self.parser.close()
+        except etree.XMLSyntaxError:
+            # 빈 문서 등
+            pass
+        self._drain()
+        return self.extractor.result()
+
+
+def stream_page(chunks, on_image=None, on_title=None):
+    """바이트 청크 iterable에서 PageContent 추출"""
+    parser = StreamingPageParser(on_image=on_image, on_title=on_title)
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
+
+
+def format_styled_text(content, url=None, line_end=''):
+    """PageContent를 마크다운 텍스트로 변환
+
+    line_end는 각 줄 끝에 덧붙일 문자열입니다 (명령줄 버전은 '\\n'을 사용해 줄 사이가 한 줄씩 띄워짐).
+    """
+    styled_text = []
+
+    # URL 정보 추가
+    if url:
+        styled_text.append(f"**원본 URL**: {url}")
+        styled_text.append("")
+
+    # 제목
+    if content.heading is not None:
+        styled_text.append(f"# {content.heading}")
+
+    # 테이블 정보
+    for rows in content.tables:
+        styled_text.append("## 프로그램 정보")
+        for key, value in rows:
+            styled_text.append(f"**{key}**: {value}")
+        styled_text.append("")
+
+    # 본문 내용
+    for block in content.blocks:
+        text = block.strip()
+        if text and len(text) > 10:  # 의미있는 텍스트만
+            for line in text.split('\n'):
+                line = line.strip()
+                if line:
+                    styled_text.append(line)
+            styled_text.append("")
+
+    return '\n'.join(line + line_end for line in styled_text)
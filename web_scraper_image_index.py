@@ -0,0 +1,154 @@
+"""
+스크래핑 결과 이미지 색인
+/image 요청마다 모든 폴더를 뒤지지 않도록 "폴더명/파일명" → 경로를 메모리에 보관합니다.
+스크래핑할 때 바로 등록하고, 프로세스 시작 후 처음 조회할 때 디스크에서 한 번 다시 만듭니다.
+지연 이미지(lazy_images)는 아직 파일이 없으므로 원본 URL과 Referer를 함께 보관해 두고
+/image로 처음 요청될 때 받습니다 (metadata.json의 "lazy": true 항목으로 다시 만듦).
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+# 색인에 없는 키를 조회했을 때 디스크를 다시 훑는 최소 간격 (초)
+# (명령줄 버전 등 다른 프로세스가 만든 폴더를 찾기 위함)
+DEFAULT_RESCAN_INTERVAL = 30.0
+
+
+def image_key(path):
+    """이미지 파일 경로의 색인 키 ("폴더명/파일명", 스크린샷처럼 images/ 밖의 파일도 폴더명 기준)"""
+    path = Path(path)
+    folder = path.parent.parent if path.parent.name == "images" else path.parent
+    return f"{folder.name}/{path.name}"
+
+
+class ImageIndex:
+    """출력 폴더 후보들 아래 */images/* 파일의 색인 (스레드 안전)
+
+    키는 "폴더명/파일명"이며, 예전 URL 호환을 위해 파일명만으로도 찾을 수 있습니다
+    (같은 파일명이 여러 폴더에 있으면 가장 최근에 등록된 것).
+    """
+
+    def __init__(self, roots, rescan_interval=DEFAULT_RESCAN_INTERVAL):
+        self.roots = [Path(root) for root in roots]
+        self.rescan_interval = rescan_interval
+        self.lock = threading.Lock()
+        self.paths = {}
+        self.names = {}
+        self.lazy = {}  # 키 -> (저장할 경로, 원본 URL, Referer)
+        self.skipped = set()  # 받지 않기로 한 지연 이미지 키
+        self.scanned_at = None
+
+    def add(self, path):
+        path = Path(path)
+        key = image_key(path)
+        with self.lock:
+            self.paths[key] = path
+            self.names[path.name] = path
+            self.lazy.pop(key, None)
+
+    def add_lazy(self, path, url, referer):
+        """아직 받지 않은 이미지 등록"""
+        path = Path(path)
+        with self.lock:
+            self.lazy[image_key(path)] = (path, url, referer)
+
+    def forget_lazy(self, key):
+        """받지 않기로 한 지연 이미지 제거 (정책에 맞지 않는 이미지를 다시 요청하지 않도록)"""
+        with self.lock:
+            self.lazy.pop(key, None)
+            self.skipped.add(key)
+
+    def pending(self, key):
+        """키에 해당하는 지연 이미지 (저장할 경로, 원본 URL, Referer) (없으면 None)"""
+        with self.lock:
+            return self.lazy.get(key)
+
+    def add_result(self, result, page_url=None):
+        """스크래핑 결과 dict의 이미지들을 등록 (지연 이미지는 page_url을 Referer로 보관)"""
+        for image in result.get('images') or []:
+            if not image.get('local_path'):
+                continue
+            if image.get('lazy') and not os.path.isfile(image['local_path']):
+                self.add_lazy(image['local_path'], image['original_url'], page_url)
+            else:
+                self.add(image['local_path'])
+
+    def scan(self):
+        """출력 폴더 후보들을 훑어 색인을 다시 만듦"""
+        paths, names, lazy = {}, {}, {}
+        for root in self.roots:
+            try:
+                folders = sorted(os.scandir(root), key=lambda entry: entry.stat().st_mtime)
+            except OSError:
+                continue
+            for folder in folders:
+                images_dir = os.path.join(folder.path, "images")
+                if not folder.is_dir() or not os.path.isdir(images_dir):
+                    continue
+                try:
+                    entries = list(os.scandir(images_dir))
+                except OSError:
+                    continue
+                for entry in entries:
+                    if entry.is_file() and not entry.name.startswith('.'):
+                        path = Path(entry.path)
+                        paths[image_key(path)] = path
+                        names[entry.name] = path
+                lazy.update(self.scan_lazy(folder.path, paths))
+
+        with self.lock:
+            # 훑는 동안 등록된 항목이 디스크 내용보다 우선
+            paths.update(self.paths)
+            names.update(self.names)
+            lazy.update(self.lazy)
+            for key in list(lazy):
+                if key in paths or key in self.skipped:
+                    del lazy[key]
+            self.paths, self.names, self.lazy = paths, names, lazy
+            self.scanned_at = time.monotonic()
+        print(f"이미지 색인 생성: {len(paths)}개")
+
+    @staticmethod
+    def scan_lazy(folder, paths):
+        """폴더의 metadata.json에서 아직 받지 않은 지연 이미지 찾기"""
+        try:
+            with open(os.path.join(folder, "metadata.json"), 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        lazy = {}
+        for image in metadata.get('images') or []:
+            if image.get('lazy') and image.get('local_path'):
+                path = Path(image['local_path'])
+                key = image_key(path)
+                if key not in paths:
+                    lazy[key] = (path, image['original_url'], metadata.get('url'))
+        return lazy
+
+    def lookup(self, key):
+        """키에 해당하는 이미지 경로 (없으면 None)"""
+        path = self._get(key)
+        if path is None and self.pending(key) is None and (
+                self.scanned_at is None or time.monotonic() - self.scanned_at >= self.rescan_interval):
+            self.scan()
+            path = self._get(key)
+        return path
+
+    def _get(self, key):
+        with self.lock:
+            path = self.paths.get(key) if '/' in key else self.names.get(key)
+        if path is not None and not path.is_file():
+            # 폴더가 지워진 경우
+            with self.lock:
+                self.paths.pop(image_key(path), None)
+                if self.names.get(path.name) == path:
+                    del self.names[path.name]
+            return None
+        return path
+
+    def __len__(self):
+        with self.lock:
+            return len(self.paths)
@@ -0,0 +1,229 @@
+"""
+이미지 다운로드 정책
+간격용 GIF, 1×1 추적 픽셀, 작은 아이콘, 수 MB짜리 원본처럼 필요 없는 이미지에 대역폭과 디스크를 쓰지 않도록
+응답 헤더(Content-Type/Content-Length)와 본문 앞부분(형식/가로세로 크기)을 보고 받는 도중에 중단합니다.
+건너뛴 이미지는 이유와 함께 metadata.json의 skipped_images에 기록됩니다.
+"""
+
+import os
+import struct
+import threading
+from web_scraper_cache import is_unchanged
+
+# 기본 정책
+DEFAULT_MAX_IMAGE_BYTES = 10 * 1024 * 1024
+DEFAULT_MIN_IMAGE_WIDTH = 16
+DEFAULT_MIN_IMAGE_HEIGHT = 16
+DEFAULT_IMAGE_TYPES = frozenset({
+    'image/jpeg', 'image/png', 'image/gif', 'image/webp', 'image/avif', 'image/bmp', 'image/svg+xml'
+})
+
+# 형식을 알 수 없는 Content-Type (본문으로 판별)
+GENERIC_TYPES = {'', 'application/octet-stream', 'binary/octet-stream'}
+# 같은 형식의 다른 이름
+TYPE_ALIASES = {'image/jpg': 'image/jpeg', 'image/pjpeg': 'image/jpeg', 'image/x-png': 'image/png',
+                'image/x-ms-bmp': 'image/bmp'}
+# 형식/크기 판별에 쓰는 최대 앞부분 (JPEG는 EXIF 뒤에 크기가 있어 넉넉히)
+SNIFF_BYTES = 64 * 1024
+
+# 건너뛴 이유
+SKIP_TOO_LARGE = 'too_large'
+SKIP_TOO_SMALL = 'too_small'
+SKIP_TRACKING_PIXEL = 'tracking_pixel'
+SKIP_TYPE = 'type'
+
+
+class ImageSkipped(Exception):
+    """정책에 맞지 않아 받지 않은 이미지 (reason은 SKIP_* 중 하나)"""
+
+    def __init__(self, reason, detail):
+        super().__init__(f"{reason}: {detail}")
+        self.reason = reason
+        self.detail = detail
+
+
+def normalize_type(content_type):
+    mime = (content_type or '').split(';')[0].strip().lower()
+    return TYPE_ALIASES.get(mime, mime)
+
+
+def jpeg_size(head):
+    """JPEG SOF 세그먼트의 (가로, 세로) (앞부분에 없으면 None)"""
+    position = 2
+    while position + 9 < len(head):
+        if head[position] != 0xFF:
+            return None
+        marker = head[position + 1]
+        if marker == 0xFF:
+            position += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            position += 2
+            continue
+        if marker == 0xDA:
+            # 압축 데이터 시작 (SOF가 앞에 없음)
+            return None
+        length = struct.unpack('>H', head[position + 2:position + 4])[0]
+        # SOF0~SOF15 (DHT/JPG/DAC 제외)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack('>HH', head[position + 5:position + 9])
+            return width, height
+        position += 2 + length
+    return None
+
+
+def sniff_image(head):
+    """본문 앞부분으로 (MIME, 가로, 세로) 판별 (모르면 None, 크기를 모르면 가로/세로 None)"""
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        if len(head) >= 24 and head[12:16] == b'IHDR':
+            return ('image/png',) + struct.unpack('>II', head[16:24])
+        return 'image/png', None, None
+    if head[:6] in (b'GIF87a', b'GIF89a'):
+        if len(head) >= 10:
+            return ('image/gif',) + struct.unpack('<HH', head[6:10])
+        return 'image/gif', None, None
+    if head.startswith(b'\xff\xd8'):
+        size = jpeg_size(head)
+        return ('image/jpeg',) + (size or (None, None))
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        chunk = head[12:16]
+        if chunk == b'VP8 ' and len(head) >= 30:
+            width, height = struct.unpack('<HH', head[26:30])
+            return 'image/webp', width & 0x3FFF, height & 0x3FFF
+        if chunk == b'VP8L' and len(head) >= 25:
+            bits = int.from_bytes(head[21:25], 'little')
+            return 'image/webp', (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b'VP8X' and len(head) >= 30:
+            return ('image/webp', int.from_bytes(head[24:27], 'little') + 1,
+                    int.from_bytes(head[27:30], 'little') + 1)
+        return 'image/webp', None, None
+    if head[:2] == b'BM' and len(head) >= 26:
+        width, height = struct.unpack('<ii', head[18:26])
+        return 'image/bmp', abs(width), abs(height)
+    if head[4:12] in (b'ftypavif', b'ftypavis'):
+        return 'image/avif', None, None
+    if head[:4] == b'\x00\x00\x01\x00':
+        return 'image/x-icon', None, None
+    text = head[:256].lstrip().lower()
+    if text.startswith(b'<svg') or (text.startswith(b'<?xml') and b'<svg' in head[:1024].lower()):
+        return 'image/svg+xml', None, None
+    return None
+
+
+class ImagePolicy:
+    """받을 이미지의 크기 상한, 최소 가로세로, 허용 형식
+
+    max_bytes/min_width/min_height를 0 또는 None으로, allowed_types를 None으로 주면 그 검사를 하지 않습니다.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_IMAGE_BYTES, min_width=DEFAULT_MIN_IMAGE_WIDTH,
+                 min_height=DEFAULT_MIN_IMAGE_HEIGHT, allowed_types=DEFAULT_IMAGE_TYPES):
+        self.max_bytes = max_bytes
+        self.min_width = min_width
+        self.min_height = min_height
+        self.allowed_types = {normalize_type(mime) for mime in allowed_types} if allowed_types is not None else None
+
+    def check_headers(self, content_type, content_length=None):
+        """응답 헤더 검사 (본문을 받기 전)"""
+        mime = normalize_type(content_type)
+        if self.allowed_types is not None and mime not in GENERIC_TYPES and mime not in self.allowed_types:
+            raise ImageSkipped(SKIP_TYPE, f"Content-Type {mime}")
+        try:
+            length = int(content_length) if content_length else None
+        except ValueError:
+            length = None
+        if self.max_bytes and length is not None and length > self.max_bytes:
+            raise ImageSkipped(SKIP_TOO_LARGE, f"Content-Length {length} > {self.max_bytes}")
+
+    def check_head(self, head, complete=False):
+        """본문 앞부분으로 형식/크기 검사 (판별할 만큼 모이지 않았으면 False, 검사를 마쳤으면 True)"""
+        sniffed = sniff_image(head)
+        if sniffed is None:
+            # 아는 형식이 아니면 Content-Type 검사만 적용
+            return complete or len(head) >= SNIFF_BYTES
+        mime, width, height = sniffed
+        if self.allowed_types is not None and mime not in self.allowed_types:
+            raise ImageSkipped(SKIP_TYPE, f"형식 {mime}")
+        if width is None:
+            return complete or len(head) >= SNIFF_BYTES or mime in ('image/svg+xml', 'image/avif')
+        if width <= 1 and height <= 1:
+            raise ImageSkipped(SKIP_TRACKING_PIXEL, f"{width}x{height}")
+        if width < (self.min_width or 0) or height < (self.min_height or 0):
+            raise ImageSkipped(SKIP_TOO_SMALL, f"{width}x{height} < {self.min_width or 0}x{self.min_height or 0}")
+        return True
+
+    def check_file(self, path):
+        """저장된 파일 검사 (HTTP 캐시로 본문을 다시 받지 않을 때)"""
+        size = os.path.getsize(path)
+        if self.max_bytes and size > self.max_bytes:
+            raise ImageSkipped(SKIP_TOO_LARGE, f"{size} > {self.max_bytes}")
+        with open(path, 'rb') as f:
+            self.check_head(f.read(SNIFF_BYTES), complete=True)
+
+    def save_response(self, image_store, url, response, dest=None, ref=None):
+        """requests 응답(stream=True)을 검사하며 이미지 저장소에 저장하고 (해시, 크기, 상태) 반환
+
+        정책에 맞지 않으면 남은 본문을 받지 않고 연결을 닫은 뒤 ImageSkipped를 발생시킵니다.
+        """
+        with response:
+            self.check_headers(response.headers.get('content-type'), response.headers.get('content-length'))
+            unchanged = is_unchanged(response)
+            if unchanged:
+                # HTTP 캐시로 본문을 다시 읽지 않는 경우 저장된 파일로 검사
+                digest = image_store.lookup(url)
+                if digest:
+                    self.check_file(image_store.blob_path(digest))
+            return image_store.save(url, self.screen(response.iter_content(chunk_size=8192)), dest,
+                                    unchanged=unchanged, ref=ref)
+
+    def screen(self, chunks):
+        """본문 청크를 그대로 넘기면서 검사 (정책에 맞지 않으면 받는 도중 ImageSkipped)"""
+        screen = ImageScreen(self)
+        for chunk in chunks:
+            screen.feed(chunk)
+            yield chunk
+        screen.finish()
+
+
+class ImageScreen:
+    """청크 단위 본문 검사 (asyncio처럼 제너레이터를 쓰기 어려운 곳에서 직접 feed)"""
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.size = 0
+        self.head = b''
+        self.checked = False
+
+    def feed(self, chunk):
+        self.size += len(chunk)
+        if self.policy.max_bytes and self.size > self.policy.max_bytes:
+            raise ImageSkipped(SKIP_TOO_LARGE, f"{self.size}바이트에서 중단 (상한 {self.policy.max_bytes})")
+        if not self.checked:
+            self.head += chunk[:SNIFF_BYTES - len(self.head)]
+            self.checked = self.policy.check_head(self.head)
+
+    def finish(self):
+        if not self.checked:
+            self.checked = self.policy.check_head(self.head, complete=True)
+
+
+class SkippedImages:
+    """스크래핑 한 번 동안 건너뛴 이미지 기록 (여러 스레드에서 기록)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.items = []
+
+    def record(self, url, alt_text, skipped):
+        print(f"이미지 건너뜀 ({skipped.reason}): {url} - {skipped.detail}")
+        with self.lock:
+            self.items.append({
+                'original_url': url,
+                'alt_text': alt_text,
+                'reason': skipped.reason,
+                'detail': skipped.detail
+            })
+
+    def to_list(self):
+        with self.lock:
+            return list(self.items)
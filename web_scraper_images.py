@@ -0,0 +1,128 @@
+"""
+이미지 병렬 다운로드 풀
+페이지의 이미지들을 제한된 동시성으로 내려받고 결과를 문서 순서대로 모읍니다.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse
+
+# 기본 동시성 설정
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_PER_HOST_LIMIT = 4
+
+
+class ImageDownloadPool:
+    """제한된 워커 수와 호스트별 동시 요청 상한을 가진 이미지 다운로드 풀"""
+
+    def __init__(self, download_func, base_url=None, max_workers=DEFAULT_MAX_WORKERS,
+                 per_host_limit=DEFAULT_PER_HOST_LIMIT):
+        self.download_func = download_func
+        self.base_url = base_url
+        self.max_workers = max(1, int(max_workers))
+        self.per_host_limit = max(1, int(per_host_limit))
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                           thread_name_prefix='image-download')
+        self.lock = threading.Lock()
+        self.active = {}    # 호스트별 실행 중인 작업 수
+        self.pending = {}   # 호스트별 대기 작업 (호스트 상한 초과분)
+        self.entries = []   # (항목, Future) - 제출 순서 = 문서 순서
+        self.durations = []
+        self.started_at = None
+
+    def host_of(self, img_url):
+        """호스트 상한 계산에 사용할 호스트 추출"""
+        if img_url.startswith('//'):
+            img_url = 'https:' + img_url
+        elif self.base_url:
+            img_url = urljoin(self.base_url, img_url)
+        return urlparse(img_url).netloc.lower()
+
+    def submit(self, item, img_url, *args):
+        """다운로드 작업 등록 (item은 결과와 함께 그대로 돌려받음)"""
+        if self.started_at is None:
+            self.started_at = time.perf_counter()
+
+        future = Future()
+        host = self.host_of(img_url)
+        task = (host, future, (img_url,) + args)
+
+        with self.lock:
+            self.entries.append((item, future))
+            if self.active.get(host, 0) < self.per_host_limit:
+                self.active[host] = self.active.get(host, 0) + 1
+                self._start(task)
+            else:
+                self.pending.setdefault(host, deque()).append(task)
+        return future
+
+    def _start(self, task):
+        """작업을 실행기에 넘김 (lock 보유 상태에서 호출)"""
+        self.executor.submit(self._run, task)
+
+    def _run(self, task):
+        host, future, args = task
+        start = time.perf_counter()
+        result, error = None, None
+        try:
+            result = self.download_func(*args)
+        except Exception as e:
+            error = e
+
+        # 다음 작업을 먼저 넘기고 기록한 뒤 결과를 알림 (gather 시점에 요약이 완전하도록)
+        with self.lock:
+            self.durations.append(time.perf_counter() - start)
+            queue = self.pending.get(host)
+            if queue:
+                self._start(queue.popleft())
+            else:
+                self.active[host] -= 1
+
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def gather(self):
+        """모든 작업 완료를 기다린 뒤 (항목, 결과) 목록을 문서 순서대로 반환"""
+        results = []
+        for item, future in self.entries:
+            try:
+                results.append((item, future.result()))
+            except Exception as e:
+                print(f"이미지 다운로드 실패: {item} - {e}")
+                results.append((item, None))
+        return results
+
+    def summary(self):
+        """이미지 단계 타이밍 요약"""
+        wall = time.perf_counter() - self.started_at if self.started_at else 0.0
+        with self.lock:
+            total = sum(self.durations)
+            count = len(self.durations)
+        return {
+            'image_requests': count,
+            'images_wall': round(wall, 3),
+            'images_sum': round(total, 3),
+            'speedup': round(total / wall, 2) if wall > 0 else None,
+            'workers': self.max_workers,
+            'per_host_limit': self.per_host_limit
+        }
+
+    def shutdown(self):
+        # gather 없이 끝나는 경우(파싱 도중 오류 등) 아직 시작하지 않은 작업은 취소
+        with self.lock:
+            for queue in self.pending.values():
+                for host, future, args in queue:
+                    future.cancel()
+            self.pending.clear()
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        return False
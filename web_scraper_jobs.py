@@ -0,0 +1,152 @@
+"""
+백그라운드 스크래핑 작업 큐
+고정 크기 워커 풀이 작업을 처리하고, 작업 상태/진행률/결과를 조회할 수 있습니다.
+"""
+
+import queue
+import threading
+import time
+import uuid
+
+# 기본 설정
+DEFAULT_JOB_WORKERS = 4
+DEFAULT_MAX_QUEUE = 100
+DEFAULT_JOB_TTL = 3600  # 완료된 작업 보관 시간 (초)
+
+# 진행 상황에 보관하지 않는 항목 / 작업 완료 후에도 남겨두는 항목
+PROGRESS_EXCLUDED_KEYS = {'text_content'}
+PROGRESS_COUNTER_KEYS = {'images_done', 'images_total'}
+
+
+class JobQueueFull(Exception):
+    """대기열이 가득 차 작업을 받을 수 없음"""
+
+
+class Job:
+    def __init__(self, params):
+        self.id = uuid.uuid4().hex
+        self.params = params
+        self.status = 'queued'  # queued / running / done / failed
+        self.progress = {'stage': 'queued'}
+        self.result = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def to_dict(self):
+        data = {
+            'job_id': self.id,
+            'status': self.status,
+            'progress': dict(self.progress),
+            'params': self.params,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+        if self.result is not None:
+            data['result'] = self.result
+        return data
+
+
+class JobManager:
+    """고정 크기 워커 풀 기반 작업 관리자
+
+    runner(params, progress)는 결과 dict를 반환해야 하며,
+    progress(stage, **info)로 진행 상황을 알릴 수 있습니다.
+    """
+
+    def __init__(self, runner, workers=DEFAULT_JOB_WORKERS, max_queue=DEFAULT_MAX_QUEUE,
+                 ttl=DEFAULT_JOB_TTL):
+        self.runner = runner
+        self.workers = workers
+        self.ttl = ttl
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.threads = []
+
+    def start(self):
+        """워커 스레드 시작 (처음 작업이 들어올 때 자동 호출)"""
+        with self.lock:
+            if self.threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f'scrape-job-{i}', daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def submit(self, **params):
+        """작업 등록 후 job id 반환 (대기열이 가득 차면 JobQueueFull)"""
+        self.start()
+        self.purge_expired()
+        job = Job(params)
+        with self.lock:
+            self.jobs[job.id] = job
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            with self.lock:
+                del self.jobs[job.id]
+            raise JobQueueFull('작업 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.')
+        return job.id
+
+    def get(self, job_id):
+        """작업 상태 조회 (없거나 만료되면 None)"""
+        self.purge_expired()
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return job.to_dict() if job else None
+
+    def purge_expired(self):
+        """보관 시간이 지난 완료 작업 삭제"""
+        cutoff = time.time() - self.ttl
+        with self.lock:
+            expired = [job_id for job_id, job in self.jobs.items()
+                       if job.finished_at and job.finished_at < cutoff]
+            for job_id in expired:
+                del self.jobs[job_id]
+        return len(expired)
+
+    def stats(self):
+        with self.lock:
+            counts = {}
+            for job in self.jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            'workers': self.workers,
+            'queue_depth': self.queue.qsize(),
+            'max_queue': self.queue.maxsize,
+            'jobs': counts
+        }
+
+    def _worker(self):
+        while True:
+            try:
+                job = self.queue.get(timeout=60)
+            except queue.Empty:
+                self.purge_expired()
+                continue
+
+            def progress(stage, **info):
+                # 본문 텍스트처럼 큰 값은 진행 상황에 보관하지 않음
+                info = {k: v for k, v in info.items() if k not in PROGRESS_EXCLUDED_KEYS}
+                with self.lock:
+                    job.progress = {'stage': stage, **info}
+
+            with self.lock:
+                job.status = 'running'
+                job.started_at = time.time()
+                job.progress = {'stage': 'running'}
+            try:
+                result = self.runner(job.params, progress)
+                status = 'done' if result.get('success') else 'failed'
+            except Exception as e:
+                result = {'success': False, 'error': f'알 수 없는 오류: {str(e)}'}
+                status = 'failed'
+            with self.lock:
+                job.result = result
+                job.status = status
+                job.finished_at = time.time()
+                job.progress = {'stage': status,
+                                **{k: v for k, v in job.progress.items() if k in PROGRESS_COUNTER_KEYS}}
+            self.queue.task_done()
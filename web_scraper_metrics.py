@@ -0,0 +1,259 @@
+"""
+스크래핑 단계별 측정과 Prometheus 지표
+PhaseTimer는 한 번의 스크래핑에서 단계별 소요 시간과 바이트 수를 모아 결과 dict/metadata.json에 넣고,
+ScrapeMetrics는 여러 스크래핑의 결과를 방법/호스트/단계별 카운터와 히스토그램으로 모아
+Prometheus 텍스트 형식으로 내보냅니다 (web_app.py의 /metrics).
+
+단계 (이미지 다운로드는 다른 단계와 동시에 진행되므로 단계 합이 total보다 클 수 있음):
+    connect    DNS/연결/첫 응답 헤더까지 (호스트 속도 조절 대기 포함)
+    page_body  페이지 본문 수신 (스트리밍 모드에서는 파싱 시간을 뺀 나머지)
+    parse      HTML 파싱과 제목/테이블/본문/이미지 추출
+    format     추출한 내용을 마크다운 텍스트로 변환
+    images     첫 이미지 요청부터 마지막 이미지 저장까지
+    write      content.txt/content.md/metadata.json 또는 데이터베이스 저장
+
+Selenium은 connect 대신 driver(드라이버 준비/풀 대기), navigate(페이지 로드), ready(준비 상태 대기),
+screenshot을 기록하고 parse는 페이지 안에서 실행한 일괄 추출 스크립트 시간입니다
+(스크립트가 실패해 페이지 소스를 받은 경우에만 page_body가 기록됨).
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+# 히스토그램 구간 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class PhaseTimer:
+    """한 번의 스크래핑 단계별 소요 시간과 바이트 수 (스레드 안전)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.lock = threading.Lock()
+        self.phases = {}
+        self.sizes = {}
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name, seconds):
+        with self.lock:
+            self.phases[name] = self.phases.get(name, 0.0) + max(0.0, seconds)
+
+    def count(self, kind, size):
+        with self.lock:
+            self.sizes[kind] = self.sizes.get(kind, 0) + size
+
+    def phases_dict(self):
+        """단계별 초 ('total'은 시작부터 지금까지)"""
+        with self.lock:
+            phases = {name: round(seconds, 4) for name, seconds in self.phases.items()}
+        phases['total'] = round(time.perf_counter() - self.started, 4)
+        return phases
+
+    def bytes_dict(self):
+        with self.lock:
+            return dict(self.sizes)
+
+
+# 출력용 단계 이름 (출력 순서)
+PHASE_NAMES = {
+    'driver': '드라이버 준비',
+    'navigate': '페이지 로드',
+    'ready': '준비 대기',
+    'connect': '연결',
+    'page_body': '본문 수신',
+    'parse': '파싱',
+    'format': '텍스트 변환',
+    'screenshot': '스크린샷',
+    'images': '이미지',
+    'write': '저장'
+}
+
+
+def format_phases(phases):
+    """단계별 소요 시간 한 줄 요약 ("연결 0.012초, 파싱 0.034초, ...")"""
+    order = list(PHASE_NAMES)
+    names = sorted((name for name in phases if name != 'total'),
+                   key=lambda name: order.index(name) if name in order else len(order))
+    return ', '.join(f"{PHASE_NAMES.get(name, name)} {phases[name]:.3f}초" for name in names)
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(names, values, extra=None):
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.values = {}
+
+    def inc(self, values=(), amount=1):
+        """값 증가 (lock은 MetricsRegistry가 관리)"""
+        self.values[tuple(values)] = self.values.get(tuple(values), 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for values, total in sorted(self.values.items()):
+            lines.append(f"{self.name}{format_labels(self.labels, values)} {format_value(total)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self.values = {}  # 레이블 값 -> [구간별 개수..., 합계, 개수]
+
+    def observe(self, values, value):
+        """값 기록 (lock은 MetricsRegistry가 관리)"""
+        state = self.values.get(tuple(values))
+        if state is None:
+            state = self.values[tuple(values)] = [0] * len(self.buckets) + [0.0, 0]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                state[index] += 1
+        state[-2] += value
+        state[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for values, state in sorted(self.values.items()):
+            for bound, count in zip(self.buckets + (float('inf'),), state[:len(self.buckets)] + [state[-1]]):
+                labels = format_labels(self.labels, values, f'le="{format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = format_labels(self.labels, values)
+            lines.append(f"{self.name}_sum{labels} {round(state[-2], 6)}")
+            lines.append(f"{self.name}_count{labels} {state[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """카운터/히스토그램/게이지 모음 (스레드 안전)
+
+    게이지는 값을 보관하지 않고 render할 때 함수를 호출해 읽습니다
+    (함수는 숫자 또는 {레이블 값 튜플: 숫자}를 반환).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics = []
+        self.gauges = []
+
+    def counter(self, name, help_text, labels=()):
+        counter = Counter(name, help_text, labels)
+        self.metrics.append(counter)
+        return counter
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        histogram = Histogram(name, help_text, labels, buckets)
+        self.metrics.append(histogram)
+        return histogram
+
+    def gauge(self, name, help_text, func, labels=()):
+        self.gauges.append((name, help_text, tuple(labels), func))
+
+    def render(self):
+        """Prometheus 텍스트 형식 (text/plain; version=0.0.4)"""
+        with self.lock:
+            lines = [line for metric in self.metrics for line in metric.render()]
+        for name, help_text, labels, func in self.gauges:
+            try:
+                value = func()
+            except Exception as e:
+                print(f"지표 수집 실패 ({name}): {e}")
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            items = value.items() if isinstance(value, dict) else [((), value)]
+            for values, number in sorted(items):
+                if number is not None:
+                    lines.append(f"{name}{format_labels(labels, values)} {format_value(number)}")
+        return '\n'.join(lines) + '\n'
+
+
+class ScrapeMetrics:
+    """스크래핑 결과 dict를 방법/호스트/단계별 지표로 집계"""
+
+    def __init__(self, registry=None):
+        self.registry = registry or MetricsRegistry()
+        self.scrapes = self.registry.counter(
+            'web_scraper_scrapes_total', '스크래핑 요청 수', ('method', 'host', 'outcome'))
+        self.duration = self.registry.histogram(
+            'web_scraper_scrape_duration_seconds', '스크래핑 전체 소요 시간', ('method', 'host'))
+        self.phase_duration = self.registry.histogram(
+            'web_scraper_phase_duration_seconds', '스크래핑 단계별 소요 시간', ('method', 'phase'))
+        self.bytes = self.registry.counter(
+            'web_scraper_bytes_total', '받은 페이지/이미지와 추출한 텍스트의 바이트 수', ('method', 'kind'))
+        self.images = self.registry.counter(
+            'web_scraper_images_total', '저장한 이미지 수', ('method',))
+        self.skipped_images = self.registry.counter(
+            'web_scraper_images_skipped_total', '이미지 정책으로 건너뛴 이미지 수', ('method', 'reason'))
+        self.lazy_images = self.registry.counter(
+            'web_scraper_lazy_images_total', '/image에서 처음 요청될 때 받은 지연 이미지 수', ('store', 'cache'))
+
+    def record(self, method, url, result, outcome=None):
+        """스크래핑 한 번의 결과 기록 (outcome을 주지 않으면 success/error)"""
+        host = urlparse(url).netloc.lower()
+        outcome = outcome or ('success' if result.get('success') else 'error')
+        with self.registry.lock:
+            self.scrapes.inc((method, host, outcome))
+            if outcome != 'success':
+                return
+            phases = result.get('phases') or {}
+            if 'total' in phases:
+                self.duration.observe((method, host), phases['total'])
+            for phase, seconds in phases.items():
+                if phase != 'total':
+                    self.phase_duration.observe((method, phase), seconds)
+            for kind, size in (result.get('bytes') or {}).items():
+                self.bytes.inc((method, kind), size)
+            self.images.inc((method,), result.get('image_count') or 0)
+            for skipped in result.get('skipped_images') or []:
+                self.skipped_images.inc((method, skipped['reason']))
+
+    def record_lazy_image(self, store_status, cache_status, size):
+        """/image에서 받은 지연 이미지 한 개 기록 (저장소 상태 stored/deduplicated/reused, HTTP 캐시 상태)"""
+        with self.registry.lock:
+            self.lazy_images.inc((store_status, cache_status))
+            self.bytes.inc(('lazy', 'images'), size)
+
+    def render(self):
+        return self.registry.render()
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics():
+    """프로세스 공유 스크래핑 지표 (처음 호출 시 생성)"""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = ScrapeMetrics()
+        return _metrics
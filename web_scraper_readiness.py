@@ -0,0 +1,192 @@
+"""
+Selenium 페이지 준비 상태 감지
+고정 대기(time.sleep) 대신 네트워크 유휴, DOM 변경 멈춤, 사이트별 CSS 선택자 등을 확인하고
+전체 대기 시간은 상한(max_wait)을 넘지 않도록 합니다.
+"""
+
+import time
+from urllib.parse import urlparse
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+
+DEFAULT_MAX_WAIT = 8.0       # 준비 대기 상한 (초)
+DEFAULT_QUIET_PERIOD = 0.5   # 변화가 없어야 하는 시간 (초)
+DEFAULT_POLL_INTERVAL = 0.1
+
+# DOM 변경 감시 (속성 변경은 애니메이션 등으로 계속 발생하므로 제외)
+# 감시 시작 전의 변경은 알 수 없으므로 마지막 로딩/응답 완료 시점을 시작값으로 사용
+DOM_IDLE_SCRIPT = """
+if (!window.__scraperDom) {
+    var start = 0;
+    performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'))
+        .forEach(function(e) { start = Math.max(start, e.loadEventEnd || 0, e.responseEnd || 0); });
+    if (document.readyState !== 'complete' || !start) { start = performance.now(); }
+    window.__scraperDom = {last: start};
+    new MutationObserver(function() { window.__scraperDom.last = performance.now(); })
+        .observe(document, {subtree: true, childList: true, characterData: true});
+}
+return performance.now() - window.__scraperDom.last;
+"""
+
+# 진행 중인 fetch/XHR 수와 리소스 로딩 현황
+NETWORK_STATE_SCRIPT = """
+if (!window.__scraperNet) {
+    var net = window.__scraperNet = {pending: 0};
+    if (window.fetch) {
+        var origFetch = window.fetch;
+        window.fetch = function() {
+            net.pending++;
+            return origFetch.apply(this, arguments).finally(function() { net.pending--; });
+        };
+    }
+    var origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        net.pending++;
+        this.addEventListener('loadend', function() { net.pending--; });
+        return origSend.apply(this, arguments);
+    };
+}
+var entries = performance.getEntriesByType('resource');
+var lastEnd = 0;
+entries.concat(performance.getEntriesByType('navigation')).forEach(function(e) {
+    lastEnd = Math.max(lastEnd, e.responseEnd || 0);
+});
+return [document.readyState, window.__scraperNet.pending, entries.length, performance.now() - lastEnd];
+"""
+
+
+class ReadinessStrategy:
+    """준비 상태 확인 전략 (deadline까지 기다리고 준비되면 True)"""
+    name = 'base'
+
+    def wait(self, driver, deadline):
+        raise NotImplementedError
+
+
+class FixedDelay(ReadinessStrategy):
+    """기존 방식: 정해진 시간만큼 대기"""
+    name = 'fixed_delay'
+
+    def __init__(self, seconds=3.0):
+        self.seconds = seconds
+
+    def wait(self, driver, deadline):
+        time.sleep(max(0.0, min(self.seconds, deadline - time.perf_counter())))
+        return True
+
+
+class SelectorReady(ReadinessStrategy):
+    """지정한 CSS 선택자 요소가 나타날 때까지 대기"""
+    name = 'selector'
+
+    def __init__(self, selector, poll=DEFAULT_POLL_INTERVAL):
+        self.selector = selector
+        self.poll = poll
+
+    def wait(self, driver, deadline):
+        while True:
+            if driver.find_elements(By.CSS_SELECTOR, self.selector):
+                return True
+            if time.perf_counter() + self.poll > deadline:
+                return False
+            time.sleep(self.poll)
+
+
+class DomQuiescence(ReadinessStrategy):
+    """DOM 변경이 quiet_period 동안 없으면 준비된 것으로 판단"""
+    name = 'dom_quiescence'
+
+    def __init__(self, quiet_period=DEFAULT_QUIET_PERIOD, poll=DEFAULT_POLL_INTERVAL):
+        self.quiet_period = quiet_period
+        self.poll = poll
+
+    def wait(self, driver, deadline):
+        while True:
+            idle_ms = driver.execute_script(DOM_IDLE_SCRIPT) or 0
+            if idle_ms >= self.quiet_period * 1000:
+                return True
+            # 남은 조용한 시간만큼만 기다렸다가 다시 확인
+            sleep = max(self.poll, self.quiet_period - idle_ms / 1000)
+            if time.perf_counter() + sleep > deadline:
+                return False
+            time.sleep(sleep)
+
+
+class NetworkIdle(ReadinessStrategy):
+    """문서 로딩 완료 후 진행 중인 요청이 없고 새 리소스가 idle_period 동안 없으면 준비됨"""
+    name = 'network_idle'
+
+    def __init__(self, idle_period=DEFAULT_QUIET_PERIOD, poll=DEFAULT_POLL_INTERVAL):
+        self.idle_period = idle_period
+        self.poll = poll
+
+    def wait(self, driver, deadline):
+        last_count = None
+        stable_since = time.perf_counter()
+        while True:
+            ready_state, pending, count, since_last_ms = driver.execute_script(NETWORK_STATE_SCRIPT)
+            now = time.perf_counter()
+            if ready_state != 'complete' or pending or count != last_count:
+                if last_count is None and ready_state == 'complete' and not pending:
+                    # 마지막 응답 이후 경과 시간만큼은 이미 조용했던 것으로 봄
+                    stable_since = now - (since_last_ms or 0) / 1000
+                else:
+                    stable_since = now
+                last_count = count
+            if ready_state == 'complete' and not pending and now - stable_since >= self.idle_period:
+                return True
+            if now + self.poll > deadline:
+                return False
+            time.sleep(self.poll)
+
+
+class ReadinessPolicy:
+    """여러 전략을 순서대로 적용하되 전체 대기 시간은 max_wait으로 제한"""
+
+    def __init__(self, strategies=None, max_wait=DEFAULT_MAX_WAIT, site_selectors=None):
+        if strategies is None:
+            strategies = [DomQuiescence(), NetworkIdle()]
+        self.strategies = strategies
+        self.max_wait = max_wait
+        # 호스트 → CSS 선택자 (하위 도메인도 적용)
+        self.site_selectors = site_selectors or {}
+
+    def selector_for(self, url):
+        host = urlparse(url).netloc.lower().split(':')[0]
+        for site, selector in self.site_selectors.items():
+            site = site.lower()
+            if host == site or host.endswith('.' + site):
+                return selector
+        return None
+
+    def wait(self, driver, url):
+        """페이지가 준비될 때까지 대기하고 전략별 소요 시간 기록 반환"""
+        started = time.perf_counter()
+        deadline = started + self.max_wait
+        strategies = list(self.strategies)
+        selector = self.selector_for(url)
+        if selector:
+            strategies.insert(0, SelectorReady(selector))
+
+        steps = {}
+        timed_out = False
+        for strategy in strategies:
+            step_started = time.perf_counter()
+            try:
+                ready = strategy.wait(driver, deadline)
+            except WebDriverException as e:
+                # 스크립트 실행이 막힌 페이지 등: 이 전략은 건너뜀
+                print(f"준비 상태 확인 실패 ({strategy.name}): {e}")
+                ready = None
+            steps[strategy.name] = round(time.perf_counter() - step_started, 3)
+            if ready is False:
+                timed_out = True
+                break
+
+        return {
+            'waited': round(time.perf_counter() - started, 3),
+            'max_wait': self.max_wait,
+            'timed_out': timed_out,
+            'selector': selector,
+            'steps': steps
+        }
@@ -0,0 +1,179 @@
+"""
+스크래핑 결과 캐시
+같은 URL을 다시 스크래핑하면 네트워크에 요청하지 않고 이전 결과(저장 폴더 포함)를 돌려줍니다.
+정규화한 URL 기준으로 보관하며 항목 수/용량 상한(오래 쓰지 않은 것부터 삭제)과 유효 시간이 있습니다.
+같은 URL을 동시에 스크래핑하는 요청은 SingleFlight로 하나로 합칩니다.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# 기본 설정
+DEFAULT_RESULT_TTL = 600  # 결과 유효 시간 (초)
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url):
+    """캐시 키용 URL 정규화
+
+    스킴/호스트 소문자, 기본 포트 제거, 빈 경로는 '/', 쿼리 매개변수 정렬, 프래그먼트 제거
+    (예: ...?p=1&no=132&id=apply 와 ...?id=apply&no=132&p=1 은 같은 키)
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    if parts.username:
+        host = f"{parts.username}@{host}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or '/', query, ''))
+
+
+class ResultCache:
+    """TTL + LRU 스크래핑 결과 캐시 (스레드 안전)
+
+    성공한 결과만 보관하며, 저장 폴더가 지워진 결과는 적중으로 치지 않습니다.
+    """
+
+    def __init__(self, ttl=DEFAULT_RESULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> (결과, 크기, 저장 시각)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """보관 중인 결과 (없거나 만료되면 None)"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                result, size, stored_at = entry
+                folder = result.get('folder_path')
+                if time.time() - stored_at > self.ttl or (folder and not Path(folder).is_dir()):
+                    self._remove(key)
+                    entry = None
+                else:
+                    self.entries.move_to_end(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return dict(result, cached=True, cached_at=stored_at)
+
+    def put(self, key, result):
+        if not result.get('success'):
+            return
+        size = len(json.dumps(result, ensure_ascii=False, default=str).encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (result, size, time.time())
+            self.total_bytes += size
+            while len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+
+    def _remove(self, key):
+        """항목 삭제 (lock 보유 상태에서 호출)"""
+        result, size, stored_at = self.entries.pop(key)
+        self.total_bytes -= size
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'bytes': self.total_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None
+            }
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """같은 키의 동시 작업을 하나로 합침 (스레드 안전)
+
+    처음 요청한 스레드만 작업을 실행하고, 그동안 같은 키로 들어온 요청은 기다렸다가
+    같은 결과(또는 같은 예외)를 받습니다.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.flights = {}
+        self.led = 0
+        self.coalesced = 0
+
+    def do(self, key, func):
+        """func() 결과와 다른 요청의 결과를 받았는지 여부를 반환"""
+        with self.lock:
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = _Flight()
+                self.led += 1
+            else:
+                flight.waiters += 1
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = func()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            # 이후 요청은 새로 시작하고, 이미 합류한 요청은 done 알림으로 결과를 받음
+            with self.lock:
+                del self.flights[key]
+            flight.done.set()
+        return flight.result, False
+
+    def stats(self):
+        with self.lock:
+            return {
+                'in_flight': len(self.flights),
+                'waiting': sum(flight.waiters for flight in self.flights.values()),
+                'led': self.led,
+                'coalesced': self.coalesced
+            }
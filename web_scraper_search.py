@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+스크래핑 결과 전문 검색 색인
+스크래핑할 때마다 제목, 추출한 본문, 테이블 키/값을 SQLite FTS5 색인에 추가합니다.
+한국어는 띄어쓰기 단위로 자르면 조사가 붙은 낱말("프로그램에")을 찾을 수 없으므로
+한글/한자/가나는 두 글자씩 겹쳐 자른 토큰(bigram)으로 색인하고 검색어도 같은 방식으로 바꿉니다.
+URL마다 가장 최근 스크래핑 결과 하나만 보관합니다.
+
+사용법:
+    python web_scraper_search.py 청소년 프로그램
+    python web_scraper_search.py --stats
+"""
+
+import argparse
+import atexit
+import json
+import queue
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_INDEX_PATH = Path.home() / ".web_scraper" / "search.db"
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 100
+SNIPPET_CHARS = 80  # 검색 결과 본문 발췌 길이 (검색어 앞뒤 합계)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT,
+    fields TEXT NOT NULL,
+    body TEXT NOT NULL,
+    location TEXT,
+    scraped_at TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS search USING fts5(
+    title, fields, body,
+    content='',
+    tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+# 관련도 (제목/테이블/본문 가중치를 준 bm25, 작을수록 관련도가 높음)
+RANK = "bm25(search, 10.0, 4.0, 1.0)"
+
+# 두 글자씩 잘라 색인할 문자 (한글 자모/음절, CJK 한자, 가나)
+CJK_RUN = re.compile('[\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u3400-\u4dbf'
+                     '\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]+')
+# 발췌에서 빼는 format_styled_text 마크다운 기호
+MARKUP = re.compile(r'\*\*|^#+ ', re.MULTILINE)
+
+
+def cjk_bigrams(text):
+    """CJK 문자열을 겹치는 두 글자 토큰으로 바꿈 ("청소년센터" → "청소 소년 년센 센터")"""
+    def split(match):
+        run = match.group(0)
+        if len(run) == 1:
+            return f" {run} "
+        return " " + " ".join(run[i:i + 2] for i in range(len(run) - 1)) + " "
+    return CJK_RUN.sub(split, text or '')
+
+
+def build_query(text):
+    """검색어를 FTS5 MATCH 식으로 변환 (낱말은 모두 포함해야 함, 없으면 None)
+
+    한 글자 한국어 검색어는 그 글자로 시작하는 토큰을 찾습니다.
+    """
+    terms = []
+    for word in text.split():
+        tokens = cjk_bigrams(word).split()
+        if not tokens:
+            continue
+        if len(tokens) == 1 and CJK_RUN.fullmatch(tokens[0]) and len(tokens[0]) == 1:
+            terms.append(f'"{tokens[0]}"*')
+            continue
+        phrase = ' '.join(token.replace('"', '""') for token in tokens)
+        terms.append(f'"{phrase}"')
+    return ' '.join(terms) or None
+
+
+def table_fields(tables):
+    """PageContent.tables를 "키: 값" 줄로 변환"""
+    return '\n'.join(f"{key}: {value}" for rows in tables for key, value in rows)
+
+
+def snippet(body, text):
+    """본문에서 첫 번째 검색어 주변 발췌 (마크다운 강조/제목 기호는 뺌)"""
+    body = ' '.join(MARKUP.sub('', body).split())
+    position = -1
+    for word in text.split():
+        position = body.lower().find(word.lower())
+        if position >= 0:
+            break
+    start = max(0, position - SNIPPET_CHARS // 4) if position >= 0 else 0
+    end = start + SNIPPET_CHARS
+    return ('…' if start else '') + body[start:end] + ('…' if end < len(body) else '')
+
+
+class SearchIndex:
+    """FTS5 검색 색인 (스레드 안전)
+
+    add_page는 쓰기 스레드에 넘기고 바로 돌아오며, 쌓인 페이지는 한 트랜잭션으로 묶어 색인합니다.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.reader = self.connect()
+        with self.lock, self.reader:
+            self.reader.executescript(SCHEMA)
+        self.queue = queue.Queue()
+        self.indexed = 0
+        self.failed = 0  # 따로 다시 시도해도 색인하지 못한 페이지 수
+        self.writer = threading.Thread(target=self._write_loop, name='search-index-writer', daemon=True)
+        self.writer.start()
+
+    def connect(self):
+        db = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def add_page(self, url, title, text, tables=(), location=None, scraped_at=None):
+        """페이지 색인 요청 (같은 URL의 이전 결과는 교체)"""
+        self.queue.put({
+            'url': url,
+            'title': title,
+            'fields': table_fields(tables),
+            'body': text,
+            'location': str(location) if location is not None else None,
+            'scraped_at': scraped_at or time.strftime('%Y-%m-%dT%H:%M:%S')
+        })
+
+    def _write_loop(self):
+        db = self.connect()
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            batch = [item]
+            while True:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    # 종료 표시는 이번 묶음을 마친 뒤 처리
+                    self.queue.task_done()
+                    self.queue.put(None)
+                    break
+                batch.append(item)
+            try:
+                with db:
+                    for document in batch:
+                        self._index(db, document)
+                self.indexed += len(batch)
+            except sqlite3.Error:
+                # 묶음이 롤백되면 페이지마다 따로 다시 색인 (실패한 페이지만 빠짐)
+                for document in batch:
+                    self._index_one(db, document)
+            for _ in batch:
+                self.queue.task_done()
+        self.queue.task_done()
+        db.close()
+
+    def _index_one(self, db, document):
+        try:
+            with db:
+                self._index(db, document)
+            self.indexed += 1
+        except sqlite3.Error as e:
+            self.failed += 1
+            print(f"검색 색인 실패: {document['url']} - {e}")
+
+    def _index(self, db, document):
+        old = db.execute("SELECT id, title, fields, body FROM documents WHERE url = ?",
+                         (document['url'],)).fetchone()
+        if old:
+            # contentless 색인은 색인했던 값을 그대로 넘겨야 지울 수 있음
+            db.execute("INSERT INTO search (search, rowid, title, fields, body) VALUES ('delete', ?, ?, ?, ?)",
+                       (old[0], cjk_bigrams(old[1]), cjk_bigrams(old[2]), cjk_bigrams(old[3])))
+            db.execute("DELETE FROM documents WHERE id = ?", (old[0],))
+        cursor = db.execute(
+            "INSERT INTO documents (url, title, fields, body, location, scraped_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (document['url'], document['title'], document['fields'], document['body'],
+             document['location'], document['scraped_at']))
+        db.execute("INSERT INTO search (rowid, title, fields, body) VALUES (?, ?, ?, ?)",
+                   (cursor.lastrowid, cjk_bigrams(document['title']), cjk_bigrams(document['fields']),
+                    cjk_bigrams(document['body'])))
+
+    def flush(self):
+        """대기 중인 색인 작업이 끝날 때까지 기다림"""
+        self.queue.join()
+
+    def search(self, text, page=1, per_page=DEFAULT_PER_PAGE):
+        """관련도 순 검색 결과 {'total', 'page', 'per_page', 'results': [...]}"""
+        page = max(1, int(page))
+        per_page = min(MAX_PER_PAGE, max(1, int(per_page)))
+        expression = build_query(text)
+        if expression is None:
+            return {'total': 0, 'page': page, 'per_page': per_page, 'results': []}
+
+        with self.lock:
+            total = self.reader.execute("SELECT COUNT(*) FROM search WHERE search MATCH ?",
+                                        (expression,)).fetchone()[0]
+            rows = self.reader.execute(
+                f"SELECT d.url, d.title, d.body, d.location, d.scraped_at, {RANK} AS rank "
+                "FROM search JOIN documents d ON d.id = search.rowid "
+                "WHERE search MATCH ? ORDER BY rank LIMIT ? OFFSET ?",
+                (expression, per_page, (page - 1) * per_page)).fetchall()
+        return {
+            'total': total,
+            'page': page,
+            'per_page': per_page,
+            'results': [{
+                'url': url,
+                'title': title,
+                'snippet': snippet(body, text),
+                'location': location,
+                'scraped_at': scraped_at,
+                'score': round(-score, 4)
+            } for url, title, body, location, scraped_at, score in rows]
+        }
+
+    def stats(self):
+        with self.lock:
+            documents = self.reader.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+        return {
+            'path': str(self.path),
+            'documents': documents,
+            'indexed': self.indexed,
+            'failed': self.failed,
+            'pending': self.queue.qsize()
+        }
+
+    def close(self):
+        """남은 색인을 마치고 연결 닫기"""
+        self.queue.put(None)
+        self.writer.join()
+        with self.lock:
+            self.reader.close()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_search_index(path=DEFAULT_INDEX_PATH):
+    """프로세스 공유 검색 색인 (처음 호출 시 생성, 종료 시 남은 색인을 마침)"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SearchIndex(path)
+            atexit.register(_index.close)
+        return _index
+
+
+def index_page(url, title, text, tables=(), location=None, scraped_at=None):
+    """스크래핑 결과를 공유 검색 색인에 추가 (색인을 열 수 없어도 스크래핑은 계속)"""
+    try:
+        get_search_index().add_page(url, title, text, tables, location, scraped_at)
+    except (OSError, sqlite3.Error) as e:
+        print(f"검색 색인 추가 실패: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='스크래핑 결과 검색')
+    parser.add_argument('query', nargs='*', help='검색어')
+    parser.add_argument('--index', default=str(DEFAULT_INDEX_PATH), help=f'색인 위치 (기본값: {DEFAULT_INDEX_PATH})')
+    parser.add_argument('--page', type=int, default=1, help='결과 페이지 (기본값: 1)')
+    parser.add_argument('--stats', action='store_true', help='색인 현황 출력')
+    args = parser.parse_args()
+
+    index = SearchIndex(args.index)
+    try:
+        if args.stats or not args.query:
+            print(json.dumps(index.stats(), ensure_ascii=False, indent=2))
+            return
+        started = time.perf_counter()
+        found = index.search(' '.join(args.query), page=args.page)
+        print(f"검색 결과 {found['total']}건 ({(time.perf_counter() - started) * 1000:.1f}ms)")
+        for result in found['results']:
+            print(f"\n{result['title']} - {result['url']}")
+            print(f"  {result['snippet']}")
+            if result['location']:
+                print(f"  위치: {result['location']}")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -17,30 +17,302 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 import time
+import threading
+from web_scraper_session import get_session, IMAGE_HEADERS
+from web_scraper_cache import CacheStats
+from web_scraper_store import StoreStats, get_image_store
+from web_scraper_readiness import ReadinessPolicy
+from web_scraper_extract import extract_page, format_styled_text
+from web_scraper_search import index_page
+from web_scraper_metrics import PhaseTimer
+from web_scraper_image_policy import ImagePolicy, ImageSkipped, SkippedImages
+from web_scraper_capture import NetworkCapture, enable_performance_log
+from web_scraper_dom import extract_dom
+
+# 드라이버 풀 기본 설정
+DEFAULT_DRIVER_POOL_SIZE = 2
+DEFAULT_DRIVER_MAX_USES = 50      # 이 횟수만큼 사용한 드라이버는 새로 띄움
+DEFAULT_DRIVER_ACQUIRE_TIMEOUT = 60
+
+def create_driver():
+    """헤드리스 Chrome 드라이버 생성"""
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')  # 백그라운드 실행
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--window-size=1920,1080')
+    chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+    # 브라우저가 받은 이미지 본문을 다시 받지 않고 꺼내 쓰기 위한 Network 이벤트 로그
+    enable_performance_log(chrome_options)
+    
+    driver = webdriver.Chrome(options=chrome_options)
+    driver.set_page_load_timeout(30)
+    return driver
+
+class DriverPoolTimeout(Exception):
+    """풀에서 드라이버를 제때 받지 못함"""
+
+class PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.time()
+
+class DriverPool:
+    """미리 띄워 둔 헤드리스 Chrome 드라이버 풀
+
+    스크래핑마다 드라이버를 빌려주고, 반납 시 쿠키/스토리지/탭을 초기화합니다.
+    max_uses번 사용했거나 오류가 난 드라이버는 종료 후 새로 띄웁니다.
+    """
+    
+    def __init__(self, size=DEFAULT_DRIVER_POOL_SIZE, max_uses=DEFAULT_DRIVER_MAX_USES,
+                 acquire_timeout=DEFAULT_DRIVER_ACQUIRE_TIMEOUT, driver_factory=create_driver):
+        self.size = size
+        self.max_uses = max_uses
+        self.acquire_timeout = acquire_timeout
+        self.driver_factory = driver_factory
+        self.idle = []
+        self.total = 0       # 생성 중이거나 살아 있는 드라이버 수
+        self.closed = False
+        self.condition = threading.Condition()
+        self.counters = {
+            'acquired': 0,
+            'waited': 0,         # 대기가 필요했던 요청 수
+            'wait_total': 0.0,
+            'wait_max': 0.0,
+            'timeouts': 0,
+            'created': 0,
+            'create_failed': 0,
+            'recycled': 0,       # 사용 횟수 초과로 교체
+            'crashed': 0         # 오류로 교체
+        }
+    
+    def warm(self, background=True):
+        """풀 크기만큼 드라이버를 미리 띄움"""
+        def fill():
+            while True:
+                with self.condition:
+                    if self.closed or self.total >= self.size:
+                        return
+                    self.total += 1
+                if not self._spawn_idle():
+                    return
+        
+        if background:
+            threading.Thread(target=fill, name='driver-pool-warm', daemon=True).start()
+        else:
+            fill()
+    
+    def _spawn(self):
+        """드라이버 생성 (total은 호출 전에 이미 증가된 상태)"""
+        try:
+            pooled = PooledDriver(self.driver_factory())
+        except Exception:
+            with self.condition:
+                self.total -= 1
+                self.counters['create_failed'] += 1
+                self.condition.notify()
+            raise
+        with self.condition:
+            self.counters['created'] += 1
+        return pooled
+    
+    def _spawn_idle(self):
+        """드라이버를 생성해 유휴 목록에 추가 (실패하면 False)"""
+        try:
+            pooled = self._spawn()
+        except Exception as e:
+            print(f"Chrome 드라이버 설정 실패: {e}")
+            return False
+        with self.condition:
+            if self.closed:
+                self.total -= 1
+                self._quit(pooled)
+                return False
+            self.idle.append(pooled)
+            self.condition.notify()
+        return True
+    
+    def acquire(self, timeout=None):
+        """드라이버 대여 (유휴 드라이버가 없고 풀이 가득 차면 반납될 때까지 대기)"""
+        timeout = self.acquire_timeout if timeout is None else timeout
+        started = time.perf_counter()
+        deadline = started + timeout
+        waited = False
+        
+        with self.condition:
+            while True:
+                if self.closed:
+                    raise DriverPoolTimeout('드라이버 풀이 종료되었습니다.')
+                if self.idle:
+                    pooled = self.idle.pop()
+                    break
+                if self.total < self.size:
+                    self.total += 1
+                    pooled = None
+                    break
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self.counters['timeouts'] += 1
+                    raise DriverPoolTimeout('사용 가능한 브라우저를 기다리다 시간이 초과되었습니다.')
+                waited = True
+                self.condition.wait(remaining)
+        
+        if pooled is None:
+            pooled = self._spawn()
+        
+        wait = time.perf_counter() - started
+        with self.condition:
+            self.counters['acquired'] += 1
+            self.counters['wait_total'] += wait
+            self.counters['wait_max'] = max(self.counters['wait_max'], wait)
+            if waited:
+                self.counters['waited'] += 1
+        pooled.uses += 1
+        return pooled
+    
+    def release(self, pooled, broken=False):
+        """드라이버 반납 (초기화에 실패하거나 교체 대상이면 종료 후 새로 띄움)"""
+        replace = broken or pooled.uses >= self.max_uses
+        if not replace:
+            try:
+                self.reset(pooled.driver)
+            except Exception as e:
+                print(f"드라이버 초기화 실패, 교체합니다: {e}")
+                broken = replace = True
+        
+        if not replace:
+            with self.condition:
+                if not self.closed:
+                    self.idle.append(pooled)
+                    self.condition.notify()
+                    return
+            replace = True
+        
+        with self.condition:
+            self.counters['crashed' if broken else 'recycled'] += 1
+            self.total -= 1
+            self.condition.notify()
+        self._quit(pooled)
+        # 빈자리는 백그라운드에서 다시 채움
+        self.warm(background=True)
+    
+    def reset(self, driver):
+        """다음 사용을 위해 탭, 스토리지, 쿠키 초기화"""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        try:
+            driver.execute_script('window.localStorage && localStorage.clear(); '
+                                  'window.sessionStorage && sessionStorage.clear();')
+        except WebDriverException:
+            pass  # about:blank 등 스토리지 접근이 불가능한 페이지
+        try:
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': []})
+        except Exception:
+            driver.delete_all_cookies()
+        driver.get('about:blank')
+    
+    def _quit(self, pooled):
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            print(f"드라이버 종료 오류: {e}")
+    
+    def metrics(self):
+        """풀 대기 시간 등 지표"""
+        with self.condition:
+            counters = dict(self.counters)
+            idle = len(self.idle)
+            total = self.total
+        acquired = counters['acquired']
+        counters['wait_avg'] = counters['wait_total'] / acquired if acquired else 0.0
+        for key in ('wait_total', 'wait_max', 'wait_avg'):
+            counters[key] = round(counters[key], 4)
+        return {
+            'size': self.size,
+            'max_uses': self.max_uses,
+            'alive': total,
+            'idle': idle,
+            'in_use': total - idle,
+            **counters
+        }
+    
+    def close(self):
+        with self.condition:
+            self.closed = True
+            idle, self.idle = self.idle, []
+            self.total -= len(idle)
+            self.condition.notify_all()
+        for pooled in idle:
+            self._quit(pooled)
+
+_driver_pool = None
+_driver_pool_lock = threading.Lock()
+
+def get_driver_pool(create=True, **kwargs):
+    """프로세스 공유 드라이버 풀 (처음 호출 시 생성 후 미리 띄움)"""
+    global _driver_pool
+    with _driver_pool_lock:
+        if _driver_pool is None and create:
+            _driver_pool = DriverPool(**kwargs)
+            _driver_pool.warm()
+        return _driver_pool
 
 class SeleniumWebScraper:
-    def __init__(self, base_url):
+    def __init__(self, base_url, driver_pool=None, readiness=None, image_store=None, image_policy=None,
+                 capture_images=True, block_assets=False):
         self.base_url = base_url
         self.driver = None
+        # 드라이버 풀을 주면 매번 Chrome을 띄우지 않고 빌려 씀
+        self.driver_pool = driver_pool
+        self.pooled = None
+        # 페이지 준비 상태 감지 정책 (기본: DOM 변경 멈춤 + 네트워크 유휴, 상한 적용)
+        self.readiness = readiness or ReadinessPolicy()
+        # 이미지 요청의 HTTP 캐시 적중 집계 (scrape_page마다 새로 시작)
+        self.cache_stats = CacheStats()
+        # 이미지는 내용 주소 저장소에 한 번만 저장하고 폴더에는 하드 링크
+        self.image_store = image_store or get_image_store()
+        self.store_stats = StoreStats()
+        # 정책에 맞지 않는 이미지는 받는 도중 중단하고 기록
+        self.image_policy = image_policy or ImagePolicy()
+        self.skipped_images = SkippedImages()
+        # 브라우저가 이미 받은 이미지 본문을 저장 (받지 못한 이미지만 requests로 다시 요청)
+        self.capture_images = capture_images
+        # 추출에 쓰지 않는 글꼴/동영상/오디오 요청을 막음
+        self.block_assets = block_assets
+        self.capture = None
         
     def setup_driver(self):
         """Chrome 드라이버 설정"""
         try:
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')  # 백그라운드 실행
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
-            
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.set_page_load_timeout(30)
+            if self.driver_pool:
+                self.pooled = self.driver_pool.acquire()
+                self.driver = self.pooled.driver
+            else:
+                self.driver = create_driver()
             return True
+        except DriverPoolTimeout as e:
+            print(f"드라이버 풀 대기 실패: {e}")
+            return False
         except Exception as e:
             print(f"Chrome 드라이버 설정 실패: {e}")
             return False
     
+    def release_driver(self, broken=False):
+        """드라이버 반납 (풀 미사용 시 종료)"""
+        if self.pooled:
+            self.driver_pool.release(self.pooled, broken=broken)
+        elif self.driver:
+            self.driver.quit()
+        self.pooled = None
+        self.driver = None
+    
     def create_folder(self, folder_name):
         """데스크탑에 폴더 생성"""
         # 여러 경로 시도
@@ -84,11 +356,38 @@ class SeleniumWebScraper:
         print(f"최종 대안 경로로 폴더 생성: {fallback_path}")
         return fallback_path
     
+    def image_path(self, folder_path, img_name, img_url, content_type):
+        """이미지를 저장할 경로 (확장자는 Content-Type, 모르면 URL에서)"""
+        # 파일 확장자 결정
+        if 'image/jpeg' in content_type or 'image/jpg' in content_type:
+            file_ext = '.jpg'
+        elif 'image/png' in content_type:
+            file_ext = '.png'
+        elif 'image/gif' in content_type:
+            file_ext = '.gif'
+        elif 'image/webp' in content_type:
+            file_ext = '.webp'
+        else:
+            # URL에서 확장자 추출
+            parsed_url = urlparse(img_url)
+            file_ext = os.path.splitext(parsed_url.path)[1]
+            if not file_ext:
+                file_ext = '.jpg'  # 기본값
+        
+        # 파일명 정리
+        safe_name = re.sub(r'[^\w\-_\.]', '_', img_name)
+        filename = f"{safe_name}{file_ext}"
+        
+        # images 폴더 생성 확인
+        images_folder = folder_path / "images"
+        if not images_folder.exists():
+            images_folder.mkdir(parents=True, exist_ok=True)
+            print(f"images 폴더 생성: {images_folder}")
+        return images_folder / filename
+    
     def download_image(self, img_url, folder_path, img_name):
-        """이미지 다운로드 (requests 사용)"""
+        """이미지 저장 (브라우저가 받은 본문 사용, 없으면 requests로 다시 요청)"""
         try:
-            import requests
-            
             # 절대 URL로 변환
             if img_url.startswith('//'):
                 img_url = 'https:' + img_url
@@ -97,56 +396,35 @@ class SeleniumWebScraper:
             elif not img_url.startswith(('http://', 'https://')):
                 img_url = urljoin(self.base_url, '/' + img_url.lstrip('/'))
             
-            print(f"이미지 다운로드 시도: {img_url}")
-            
-            # 세션 생성 및 헤더 설정
-            session = requests.Session()
-            session.headers.update({
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
-                'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8',
-                'Referer': self.base_url
-            })
-            
-            response = session.get(img_url, timeout=15, stream=True)
-            response.raise_for_status()
-            
-            # Content-Type 확인
-            content_type = response.headers.get('content-type', '')
-            print(f"Content-Type: {content_type}")
-            
-            # 파일 확장자 결정
-            if 'image/jpeg' in content_type or 'image/jpg' in content_type:
-                file_ext = '.jpg'
-            elif 'image/png' in content_type:
-                file_ext = '.png'
-            elif 'image/gif' in content_type:
-                file_ext = '.gif'
-            elif 'image/webp' in content_type:
-                file_ext = '.webp'
+            # 브라우저가 이미 받은 이미지면 그 본문을 저장
+            captured = self.capture.response_body(img_url) if self.capture_images and self.capture else None
+            if captured:
+                body, content_type = captured
+                print(f"브라우저 응답 사용: {img_url} (Content-Type: {content_type})")
+                self.image_policy.check_headers(content_type, len(body))
+                file_path = self.image_path(folder_path, img_name, img_url, content_type)
+                digest, size, status = self.image_store.save(img_url, self.image_policy.screen([body]), file_path)
+                self.store_stats.record(status)
             else:
-                # URL에서 확장자 추출
-                parsed_url = urlparse(img_url)
-                file_ext = os.path.splitext(parsed_url.path)[1]
-                if not file_ext:
-                    file_ext = '.jpg'  # 기본값
-            
-            # 파일명 정리
-            safe_name = re.sub(r'[^\w\-_\.]', '_', img_name)
-            filename = f"{safe_name}{file_ext}"
-            file_path = folder_path / "images" / filename
-            
-            # images 폴더 생성 확인
-            images_folder = folder_path / "images"
-            if not images_folder.exists():
-                images_folder.mkdir(parents=True, exist_ok=True)
-                print(f"images 폴더 생성: {images_folder}")
-            
-            # 이미지 데이터 저장
-            with open(file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+                print(f"이미지 다운로드 시도: {img_url}")
+                
+                # 이미지 호스트의 공유 세션 사용 (keep-alive 연결 재사용), 브라우저 쿠키를 함께 보냄
+                headers = {**IMAGE_HEADERS, 'Referer': self.base_url}
+                cookie = self.capture.cookie_header(img_url) if self.capture else None
+                if cookie:
+                    headers['Cookie'] = cookie
+                response = get_session(img_url).get(img_url, headers=headers, timeout=15, stream=True)
+                self.cache_stats.record(response)
+                response.raise_for_status()
+                
+                # Content-Type 확인
+                content_type = response.headers.get('content-type', '')
+                print(f"Content-Type: {content_type}")
+                file_path = self.image_path(folder_path, img_name, img_url, content_type)
+                
+                # 이미지 데이터 저장 (저장소에 한 번만 저장하고 링크, 바뀌지 않은 이미지는 본문을 다시 쓰지 않음)
+                digest, size, status = self.image_policy.save_response(self.image_store, img_url, response, file_path)
+                self.store_stats.record(status)
             
             # 파일 크기 확인
             file_size = os.path.getsize(file_path)
@@ -158,58 +436,29 @@ class SeleniumWebScraper:
             
             return str(file_path)
             
+        except ImageSkipped as e:
+            self.skipped_images.record(img_url, img_name, e)
+            return None
         except Exception as e:
             print(f"이미지 다운로드 실패: {img_url} - {e}")
             return None
     
     def extract_text_with_styling(self, page_source, url=None):
         """페이지 소스에서 텍스트 추출"""
-        from bs4 import BeautifulSoup
-        
-        soup = BeautifulSoup(page_source, 'html.parser')
-        styled_text = []
-        
-        # URL 정보 추가
-        if url:
-            styled_text.append(f"**원본 URL**: {url}")
-            styled_text.append("")
-        
-        # 제목 추출
-        title = soup.find('h1') or soup.find('h2') or soup.find('h3')
-        if title:
-            styled_text.append(f"# {title.get_text().strip()}")
-        
-        # 테이블 정보 추출
-        tables = soup.find_all('table')
-        for table in tables:
-            styled_text.append("## 프로그램 정보")
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 2:
-                    key = cells[0].get_text().strip()
-                    value = cells[1].get_text().strip()
-                    styled_text.append(f"**{key}**: {value}")
-            styled_text.append("")
-        
-        # 본문 내용 추출
-        content_divs = soup.find_all(['div', 'p'], class_=re.compile(r'content|body|main'))
-        for div in content_divs:
-            text = div.get_text().strip()
-            if text and len(text) > 10:
-                lines = text.split('\n')
-                for line in lines:
-                    line = line.strip()
-                    if line:
-                        styled_text.append(line)
-                styled_text.append("")
-        
-        return '\n'.join(styled_text)
+        return format_styled_text(extract_page(page_source), url)
     
     def scrape_page(self, url):
         """Selenium을 사용한 웹페이지 스크래핑"""
+        broken = False
+        self.cache_stats = CacheStats()
+        self.store_stats = StoreStats()
+        self.skipped_images = SkippedImages()
+        # 단계별 소요 시간/바이트 수 (결과와 metadata.json의 phases, bytes)
+        phases = PhaseTimer()
         try:
-            if not self.setup_driver():
+            with phases.phase('driver'):
+                ready = self.setup_driver()
+            if not ready:
                 return {
                     'success': False,
                     'error': 'Chrome 드라이버를 설정할 수 없습니다. Chrome 브라우저가 설치되어 있는지 확인해주세요.'
@@ -221,19 +470,43 @@ class SeleniumWebScraper:
             
             print(f"Selenium으로 요청 URL: {url}")
             
-            # 페이지 로드
-            self.driver.get(url)
+            self.capture = NetworkCapture(self.driver, block_assets=self.block_assets)
+            if self.capture_images or self.block_assets:
+                self.capture.start()
             
-            # 페이지 로딩 대기
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
+            # 페이지 로드
+            with phases.phase('navigate'):
+                self.driver.get(url)
+                
+                # 페이지 로딩 대기
+                WebDriverWait(self.driver, 10).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "body"))
+                )
             
-            # 추가 대기 (JavaScript 로딩)
-            time.sleep(3)
+            # 추가 대기 (JavaScript 로딩) - 페이지가 준비되는 즉시 진행
+            with phases.phase('ready'):
+                readiness = self.readiness.wait(self.driver, url)
+            print(f"페이지 준비 대기: {readiness['waited']}초 {readiness['steps']}")
             
-            # 페이지 제목 추출
-            page_title = self.driver.title
+            # 제목/헤딩/테이블/본문/이미지를 스크립트 한 번으로 추출 (실패하면 페이지 소스를 받아 파싱)
+            try:
+                with phases.phase('parse'):
+                    content, payload = extract_dom(self.driver)
+                page_title = payload.get('document_title')
+                page_bytes = payload.get('html_bytes')
+                image_sources = payload.get('images') or []
+            except WebDriverException as e:
+                print(f"페이지 내 추출 실패, 페이지 소스로 추출합니다: {e}")
+                with phases.phase('page_body'):
+                    page_source = self.driver.page_source
+                with phases.phase('parse'):
+                    content = extract_page(page_source)
+                page_title = self.driver.title
+                page_bytes = len(page_source.encode('utf-8'))
+                image_sources = [{'src': urljoin(url, src) if src else None, 'alt': alt}
+                                 for src, alt in content.images]
+            
+            # 페이지 제목
             if not page_title:
                 page_title = "웹페이지_스크래핑"
             
@@ -243,52 +516,62 @@ class SeleniumWebScraper:
             folder_name = f"{safe_title}_{timestamp}"
             
             # 폴더 생성
-            folder_path = self.create_folder(folder_name)
-            
-            # 페이지 소스 가져오기
-            page_source = self.driver.page_source
+            with phases.phase('write'):
+                folder_path = self.create_folder(folder_name)
             
             # 텍스트 정보 추출
-            styled_text = self.extract_text_with_styling(page_source, url)
-            
-            # 텍스트 파일로 저장
-            text_file = folder_path / "content.txt"
-            with open(text_file, 'w', encoding='utf-8') as f:
-                f.write(styled_text)
-            
-            # 마크다운 파일로도 저장
-            md_file = folder_path / "content.md"
-            with open(md_file, 'w', encoding='utf-8') as f:
-                f.write(styled_text)
+            with phases.phase('format'):
+                styled_text = format_styled_text(content, url)
+            
+            with phases.phase('write'):
+                # 텍스트 파일로 저장
+                text_file = folder_path / "content.txt"
+                with open(text_file, 'w', encoding='utf-8') as f:
+                    f.write(styled_text)
+                
+                # 마크다운 파일로도 저장
+                md_file = folder_path / "content.md"
+                with open(md_file, 'w', encoding='utf-8') as f:
+                    f.write(styled_text)
             
             # 페이지 전체 스크린샷 캡처
             screenshot_path = folder_path / "page_screenshot.png"
             try:
-                self.driver.save_screenshot(str(screenshot_path))
+                with phases.phase('screenshot'):
+                    self.driver.save_screenshot(str(screenshot_path))
                 print(f"페이지 스크린샷 저장: {screenshot_path}")
             except Exception as e:
                 print(f"스크린샷 저장 실패: {e}")
                 screenshot_path = None
             
             # 이미지 추출 및 다운로드
-            images = self.driver.find_elements(By.TAG_NAME, "img")
+            image_started = time.perf_counter()
+            self.capture.collect()
             image_info = []
             
-            for i, img in enumerate(images):
-                try:
-                    img_src = img.get_attribute('src')
-                    if img_src:
-                        img_alt = img.get_attribute('alt') or f'image_{i+1}'
-                        img_path = self.download_image(img_src, folder_path, img_alt)
-                        if img_path:
-                            image_info.append({
-                                'original_url': img_src,
-                                'local_path': img_path,
-                                'alt_text': img_alt
-                            })
-                except Exception as e:
-                    print(f"이미지 처리 오류: {e}")
+            for i, image in enumerate(image_sources):
+                img_src = image.get('src')
+                if not img_src:
                     continue
+                img_alt = image.get('alt') or f'image_{i+1}'
+                # srcset이 있으면 브라우저가 실제로 받은 후보(currentSrc)를 저장
+                img_path = self.download_image(image.get('current_src') or img_src, folder_path, img_alt)
+                if img_path:
+                    info = {
+                        'original_url': img_src,
+                        'local_path': img_path,
+                        'alt_text': img_alt
+                    }
+                    if image.get('srcset'):
+                        info['srcset'] = image['srcset']
+                        info['current_src'] = image.get('current_src')
+                    image_info.append(info)
+            
+            phases.add('images', time.perf_counter() - image_started)
+            if page_bytes is not None:
+                phases.count('page', page_bytes)
+            phases.count('images', sum(os.path.getsize(info['local_path']) for info in image_info))
+            phases.count('text', len(styled_text.encode('utf-8')))
             
             # 스크린샷 정보 추가
             if screenshot_path:
@@ -306,12 +589,21 @@ class SeleniumWebScraper:
                 'method': 'selenium',
                 'images': image_info,
                 'text_file': str(text_file),
-                'markdown_file': str(md_file)
+                'markdown_file': str(md_file),
+                'readiness': readiness,
+                'phases': phases.phases_dict(),
+                'bytes': phases.bytes_dict(),
+                'cache': self.cache_stats.to_dict(),
+                'image_store': self.store_stats.to_dict(),
+                'skipped_images': self.skipped_images.to_list(),
+                'network_capture': self.capture.to_dict()
             }
             
-            metadata_file = folder_path / "metadata.json"
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, ensure_ascii=False, indent=2)
+            with phases.phase('write'):
+                metadata_file = folder_path / "metadata.json"
+                with open(metadata_file, 'w', encoding='utf-8') as f:
+                    json.dump(metadata, f, ensure_ascii=False, indent=2)
+            index_page(url, page_title, styled_text, content.tables, folder_path, metadata['scraped_at'])
             
             return {
                 'success': True,
@@ -319,7 +611,12 @@ class SeleniumWebScraper:
                 'text_content': styled_text,
                 'image_count': len(image_info),
                 'images': image_info,
-                'method': 'selenium'
+                'skipped_images': metadata['skipped_images'],
+                'method': 'selenium',
+                'readiness': readiness,
+                'network_capture': metadata['network_capture'],
+                'phases': phases.phases_dict(),
+                'bytes': phases.bytes_dict()
             }
             
         except TimeoutException:
@@ -328,6 +625,7 @@ class SeleniumWebScraper:
                 'error': '페이지 로딩 시간 초과: 페이지가 너무 오래 걸려 로드되지 않습니다.'
             }
         except WebDriverException as e:
+            broken = True
             return {
                 'success': False,
                 'error': f'브라우저 오류: {str(e)}'
@@ -338,24 +636,28 @@ class SeleniumWebScraper:
                 'error': f'알 수 없는 오류: {str(e)}'
             }
         finally:
-            if self.driver:
-                self.driver.quit()
+            self.release_driver(broken=broken)
 
 def main():
-    import sys
-    if len(sys.argv) != 2:
-        print("사용법: python3 web_scraper_selenium.py <URL>")
-        sys.exit(1)
+    import argparse
+    parser = argparse.ArgumentParser(description='Selenium 웹페이지 스크래핑')
+    parser.add_argument('url', help='스크래핑할 웹페이지 URL')
+    parser.add_argument('--no-capture', action='store_true',
+                        help='브라우저가 받은 이미지를 쓰지 않고 모두 requests로 다시 받음')
+    parser.add_argument('--block-assets', action='store_true',
+                        help='글꼴/동영상/오디오 요청을 막음')
+    args = parser.parse_args()
     
-    url = sys.argv[1]
-    scraper = SeleniumWebScraper(url)
-    result = scraper.scrape_page(url)
+    scraper = SeleniumWebScraper(args.url, capture_images=not args.no_capture, block_assets=args.block_assets)
+    result = scraper.scrape_page(args.url)
     
     if result['success']:
         print(f"스크래핑 완료!")
         print(f"폴더 위치: {result['folder_path']}")
         print(f"이미지 개수: {result['image_count']}")
         print(f"사용된 방법: {result['method']}")
+        capture = result['network_capture']
+        print(f"브라우저 응답 사용: {capture['captured']}개, 다시 요청: {capture['missed']}개, 차단: {capture['blocked']}개")
     else:
         print(f"스크래핑 실패: {result['error']}")
 
@@ -0,0 +1,198 @@
+"""
+공유 HTTP 세션 레지스트리
+호스트별 requests.Session과 커넥션 풀을 프로세스 전체에서 재사용하여
+요청마다 새 TCP/TLS 연결을 맺지 않도록 합니다.
+기본적으로 디스크 HTTP 캐시(web_scraper_cache)와 호스트별 속도 조절(web_scraper_throttle)을
+어댑터에 연결합니다. 캐시 적중은 네트워크를 쓰지 않으므로 속도 조절을 거치지 않습니다.
+
+공유 세션은 여러 스크래핑(웹 버전에서는 여러 사용자)이 함께 쓰므로 쿠키를 저장하지 않습니다.
+한 스크래핑 안에서 페이지가 설정한 쿠키(로그인/세션 쿠키 등)를 이미지 요청에 보내려면
+스크래핑마다 new_cookie_jar()로 만든 저장소를 cookies=로 넘기고 응답마다 keep_cookies()로 옮겨 담습니다.
+"""
+
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
+from web_scraper_cache import CachingHTTPAdapter, HttpCache
+from web_scraper_throttle import ThrottledHTTPAdapter, THROTTLE_STATUSES, get_scheduler
+
+# 기본 커넥션 풀 설정
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 32
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+# 공유 세션 쿠키 정책 (허용 도메인이 없으므로 응답의 쿠키를 저장하지도, 요청에 붙이지도 않음)
+SHARED_COOKIE_POLICY = DefaultCookiePolicy(allowed_domains=[])
+
+# 이미지 요청 시 덮어쓸 헤더
+IMAGE_HEADERS = {
+    'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
+}
+
+
+def default_retry():
+    """기존 재시도 전략"""
+    return Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["HEAD", "GET", "OPTIONS"]
+    )
+
+
+class CachingThrottledHTTPAdapter(CachingHTTPAdapter, ThrottledHTTPAdapter):
+    """캐시에서 처리하지 못한 요청만 속도 조절을 거쳐 보내는 어댑터"""
+
+
+def iter_body(response, chunk_size):
+    """stream=True 응답 본문을 도착하는 만큼씩 읽기
+
+    iter_content는 chunk_size가 찰 때까지 기다리므로 urllib3 2.x의 read1을 우선 사용합니다.
+    """
+    raw = response.raw
+    if not hasattr(raw, 'read1'):
+        yield from response.iter_content(chunk_size)
+        return
+    while True:
+        chunk = raw.read1(chunk_size, decode_content=True)
+        if not chunk:
+            break
+        yield chunk
+
+
+def new_cookie_jar():
+    """스크래핑 한 번 동안 쓰는 쿠키 저장소"""
+    return requests.cookies.RequestsCookieJar()
+
+
+def keep_cookies(jar, response):
+    """응답(리디렉션 포함)이 설정한 쿠키를 스크래핑 쿠키 저장소에 추가"""
+    for hop in response.history + [response]:
+        jar.update(hop.cookies)
+
+
+def host_key(url):
+    """세션 구분용 (scheme, host) 키"""
+    parsed = urlparse(url if '://' in url else 'https://' + url.lstrip('/'))
+    return (parsed.scheme.lower() or 'https', parsed.netloc.lower())
+
+
+class SessionRegistry:
+    """호스트별 공유 세션 레지스트리 (스레드 안전)"""
+
+    def __init__(self, pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 retry_factory=default_retry, headers=None, cache=None, scheduler=None):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.retry_factory = retry_factory
+        self.headers = dict(headers or DEFAULT_HEADERS)
+        # 디스크 HTTP 캐시 (None이면 사용하지 않음)
+        self.cache = cache
+        # 호스트별 속도 조절기 (None이면 사용하지 않음)
+        self.scheduler = scheduler
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def create_retry(self):
+        retry = self.retry_factory()
+        if self.scheduler is not None and isinstance(retry, Retry):
+            # 429/503은 스케줄러가 Retry-After와 호스트 전체 속도를 고려해 다시 보냄
+            # (urllib3는 status_forcelist에 없어도 Retry-After가 있으면 재시도하므로 함께 끔)
+            retry = retry.new(status_forcelist=[status for status in retry.status_forcelist or ()
+                                                if status not in THROTTLE_STATUSES],
+                              respect_retry_after_header=False)
+        return retry
+
+    def create_adapter(self):
+        kwargs = {
+            'pool_connections': self.pool_connections,
+            'pool_maxsize': self.pool_maxsize,
+            'max_retries': self.create_retry()
+        }
+        if self.cache is not None and self.scheduler is not None:
+            return CachingThrottledHTTPAdapter(self.cache, scheduler=self.scheduler, **kwargs)
+        if self.cache is not None:
+            return CachingHTTPAdapter(self.cache, **kwargs)
+        if self.scheduler is not None:
+            return ThrottledHTTPAdapter(scheduler=self.scheduler, **kwargs)
+        return HTTPAdapter(**kwargs)
+
+    def create_session(self):
+        session = requests.Session()
+        adapter = self.create_adapter()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update(self.headers)
+        session.cookies.set_policy(SHARED_COOKIE_POLICY)
+        return session
+
+    def get(self, url):
+        """URL의 호스트에 해당하는 공유 세션 반환"""
+        key = host_key(url)
+        session = self.sessions.get(key)
+        if session is None:
+            with self.lock:
+                session = self.sessions.get(key)
+                if session is None:
+                    session = self.create_session()
+                    self.sessions[key] = session
+        return session
+
+    def stats(self):
+        with self.lock:
+            stats = {
+                'hosts': len(self.sessions),
+                'pool_connections': self.pool_connections,
+                'pool_maxsize': self.pool_maxsize
+            }
+        if self.cache is not None:
+            stats['cache'] = self.cache.stats()
+        if self.scheduler is not None:
+            stats['throttle'] = self.scheduler.stats()
+        return stats
+
+    def close(self):
+        with self.lock:
+            sessions = list(self.sessions.values())
+            self.sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+_registry = SessionRegistry(cache=HttpCache(), scheduler=get_scheduler())
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    return _registry
+
+
+def get_session(url):
+    """프로세스 공유 레지스트리에서 세션 가져오기"""
+    return _registry.get(url)
+
+
+def configure(pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE, **kwargs):
+    """풀 크기, 캐시 등을 바꿔 레지스트리 재생성 (기존 세션은 닫힘)
+
+    cache/scheduler를 지정하지 않으면 기존 것을 그대로 사용하고, None을 넘기면 끕니다.
+    """
+    global _registry
+    with _registry_lock:
+        old = _registry
+        kwargs.setdefault('cache', old.cache)
+        kwargs.setdefault('scheduler', old.scheduler)
+        _registry = SessionRegistry(pool_connections=pool_connections, pool_maxsize=pool_maxsize, **kwargs)
+    old.close()
+    return _registry
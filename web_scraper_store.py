@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+내용 주소 기반 이미지 저장소
+이미지 본문을 SHA-256 해시 이름으로 한 번만 저장하고(blobs/ab/abcd...),
+스크래핑 폴더의 images/ 파일은 저장소 파일에 대한 하드 링크로 만듭니다.
+URL → 해시 색인(SQLite)이 있어 바뀌지 않은 이미지(HTTP 캐시 적중/304)는 본문을 다시 쓰지 않으며,
+어떤 스크래핑 폴더에서도 쓰지 않는 파일은 gc로 정리합니다.
+
+사용법:
+    python web_scraper_store.py stats
+    python web_scraper_store.py gc --grace-days 7
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_STORE_DIR = Path.home() / ".web_scraper" / "images"
+DEFAULT_GC_GRACE = 7 * 24 * 3600  # 링크가 없어도 이 기간 안에 쓰인 파일은 남겨둠 (초)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    hash TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS links (
+    path TEXT PRIMARY KEY,
+    hash TEXT NOT NULL,
+    linked_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pins (
+    ref TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    pinned_at REAL NOT NULL,
+    PRIMARY KEY (ref, hash)
+);
+CREATE INDEX IF NOT EXISTS urls_hash ON urls(hash);
+CREATE INDEX IF NOT EXISTS links_hash ON links(hash);
+"""
+
+
+class ImageStore:
+    """SHA-256 내용 주소 저장소 + URL 색인 (스레드 안전)"""
+
+    def __init__(self, directory=DEFAULT_STORE_DIR):
+        self.directory = Path(directory)
+        self.blob_dir = self.directory / "blobs"
+        self.tmp_dir = self.directory / "tmp"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(str(self.directory / "index.db"), timeout=30, check_same_thread=False)
+        with self.lock, self.db:
+            self.db.executescript(SCHEMA)
+
+    def blob_path(self, digest):
+        return self.blob_dir / digest[:2] / digest
+
+    def lookup(self, url):
+        """URL의 마지막 내용 해시 (저장소에 파일이 없으면 None)"""
+        with self.lock:
+            row = self.db.execute("SELECT hash FROM urls WHERE url = ?", (url,)).fetchone()
+        if row and self.blob_path(row[0]).exists():
+            return row[0]
+        return None
+
+    def put(self, chunks):
+        """본문을 저장소에 넣고 (해시, 크기, 새로 저장했는지) 반환"""
+        sha = hashlib.sha256()
+        size = 0
+        tmp_path = self.tmp_dir / f"{os.getpid()}.{threading.get_ident()}.part"
+        try:
+            with open(tmp_path, 'wb') as f:
+                for chunk in chunks:
+                    if chunk:
+                        sha.update(chunk)
+                        size += len(chunk)
+                        f.write(chunk)
+        except BaseException:
+            # 받는 도중 중단(이미지 정책, 연결 오류 등)되면 임시 파일을 남기지 않음
+            tmp_path.unlink(missing_ok=True)
+            raise
+        digest = sha.hexdigest()
+        blob = self.blob_path(digest)
+        if blob.exists():
+            tmp_path.unlink()
+            return digest, size, False
+        blob.parent.mkdir(exist_ok=True)
+        os.replace(tmp_path, blob)
+        return digest, size, True
+
+    def link(self, digest, dest):
+        """저장소 파일을 dest에 하드 링크 (다른 파일 시스템 등 링크가 안 되면 복사)"""
+        dest = Path(dest)
+        blob = self.blob_path(digest)
+        try:
+            if os.path.samefile(blob, dest):
+                return
+        except OSError:
+            pass
+        tmp_path = dest.with_name(f".{dest.name}.{threading.get_ident()}.part")
+        try:
+            os.link(blob, tmp_path)
+        except OSError:
+            shutil.copyfile(blob, tmp_path)
+        os.replace(tmp_path, dest)
+
+    def checkout(self, digest, dest):
+        """저장소 파일을 dest에 링크하고 gc가 알 수 있도록 기록"""
+        self.link(digest, dest)
+        with self.lock, self.db:
+            self.db.execute("INSERT OR REPLACE INTO links (path, hash, linked_at) VALUES (?, ?, ?)",
+                            (str(Path(dest).resolve()), digest, time.time()))
+
+    def save(self, url, chunks, dest=None, unchanged=False, ref=None):
+        """URL의 이미지를 저장소에 넣고 dest에 링크한 뒤 (해시, 크기, 상태) 반환
+
+        unchanged가 True(HTTP 캐시 적중/304)이고 URL의 내용이 저장소에 있으면 chunks를 읽지 않습니다.
+        dest 없이 ref(예: 스크래핑 데이터베이스 경로)를 주면 링크 대신 ref가 쓰는 파일로 고정해 gc에서 제외합니다.
+        상태는 'reused'(본문 재사용), 'deduplicated'(다른 URL/이전 내용과 같음), 'stored'(새 파일) 중 하나입니다.
+        """
+        digest = self.lookup(url) if unchanged else None
+        if digest:
+            status = 'reused'
+        else:
+            digest, size, created = self.put(chunks)
+            status = 'stored' if created else 'deduplicated'
+        if dest is not None:
+            self.link(digest, dest)
+
+        now = time.time()
+        size = self.blob_path(digest).stat().st_size
+        with self.lock, self.db:
+            self.db.execute(
+                "INSERT INTO blobs (hash, size, created_at, last_used) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(hash) DO UPDATE SET last_used = excluded.last_used",
+                (digest, size, now, now))
+            self.db.execute("INSERT OR REPLACE INTO urls (url, hash, fetched_at) VALUES (?, ?, ?)",
+                            (url, digest, now))
+            if dest is not None:
+                self.db.execute("INSERT OR REPLACE INTO links (path, hash, linked_at) VALUES (?, ?, ?)",
+                                (str(Path(dest).resolve()), digest, now))
+            if ref is not None:
+                self.db.execute("INSERT OR REPLACE INTO pins (ref, hash, pinned_at) VALUES (?, ?, ?)",
+                                (str(ref), digest, now))
+        return digest, size, status
+
+    def gc(self, grace=DEFAULT_GC_GRACE, dry_run=False):
+        """스크래핑 폴더에서 더 이상 쓰지 않는 파일 정리
+
+        링크된 파일이 지워졌거나 다른 파일로 바뀐 기록을 먼저 지우고,
+        남은 링크나 고정(pins)이 없으면서 grace 기간 동안 쓰이지 않은 저장소 파일을 삭제합니다.
+        """
+        with self.lock:
+            links = self.db.execute("SELECT path, hash FROM links").fetchall()
+            pinned = {row[0] for row in self.db.execute("SELECT DISTINCT hash FROM pins")}
+        stale = []
+        for path, digest in links:
+            try:
+                if not os.path.samefile(path, self.blob_path(digest)):
+                    stale.append(path)
+            except OSError:
+                stale.append(path)
+
+        stale_paths = set(stale)
+        live = {digest for path, digest in links if path not in stale_paths} | pinned
+        cutoff = time.time() - grace
+        with self.lock:
+            blobs = self.db.execute("SELECT hash, size FROM blobs WHERE last_used < ?", (cutoff,)).fetchall()
+        candidates = [(digest, size) for digest, size in blobs if digest not in live]
+
+        if not dry_run:
+            with self.lock, self.db:
+                self.db.executemany("DELETE FROM links WHERE path = ?", [(path,) for path in stale])
+                self.db.executemany("DELETE FROM blobs WHERE hash = ?", [(digest,) for digest, size in candidates])
+                self.db.executemany("DELETE FROM urls WHERE hash = ?", [(digest,) for digest, size in candidates])
+
+        freed = 0
+        if not dry_run:
+            for digest, size in candidates:
+                try:
+                    self.blob_path(digest).unlink()
+                    freed += size
+                except OSError:
+                    pass
+            for tmp_path in self.tmp_dir.glob('*.part'):
+                if tmp_path.stat().st_mtime < cutoff:
+                    tmp_path.unlink()
+
+        return {
+            'stale_links': len(stale),
+            'removed_blobs': len(candidates),
+            'freed_bytes': freed if not dry_run else sum(size for digest, size in candidates),
+            'dry_run': dry_run
+        }
+
+    def stats(self):
+        with self.lock:
+            blobs, stored = self.db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+            urls = self.db.execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+            links, linked = self.db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(b.size), 0) FROM links l JOIN blobs b ON b.hash = l.hash").fetchone()
+            pins = self.db.execute("SELECT COUNT(DISTINCT hash) FROM pins").fetchone()[0]
+        return {
+            'directory': str(self.directory),
+            'blobs': blobs,
+            'stored_bytes': stored,
+            'urls': urls,
+            'links': links,
+            'pinned': pins,
+            # 저장소 없이 폴더마다 따로 저장했다면 썼을 용량
+            'linked_bytes': linked
+        }
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+class StoreStats:
+    """스크래핑 한 번 동안의 저장소 사용 집계 (여러 스레드에서 기록)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = {'stored': 0, 'deduplicated': 0, 'reused': 0}
+
+    def record(self, status):
+        with self.lock:
+            self.counts[status] += 1
+
+    def to_dict(self):
+        with self.lock:
+            return dict(self.counts)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_image_store(directory=DEFAULT_STORE_DIR):
+    """프로세스 공유 이미지 저장소 (처음 호출 시 생성)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ImageStore(directory)
+        return _store
+
+
+def main():
+    parser = argparse.ArgumentParser(description='이미지 저장소 관리')
+    parser.add_argument('command', choices=['stats', 'gc'], help='stats: 현황, gc: 쓰지 않는 파일 정리')
+    parser.add_argument('--dir', default=str(DEFAULT_STORE_DIR), help=f'저장소 위치 (기본값: {DEFAULT_STORE_DIR})')
+    parser.add_argument('--grace-days', type=float, default=DEFAULT_GC_GRACE / 86400,
+                        help='링크가 없어도 최근 이 기간 안에 쓰인 파일은 남겨둠 (기본값: 7일)')
+    parser.add_argument('--dry-run', action='store_true', help='삭제하지 않고 대상만 계산')
+    args = parser.parse_args()
+
+    store = ImageStore(args.dir)
+    if args.command == 'gc':
+        result = store.gc(grace=args.grace_days * 86400, dry_run=args.dry_run)
+    else:
+        result = store.stats()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+도메인별 스크래핑 방법 기억
+호스트마다 requests(일반 HTTP)와 Selenium의 결과(성공, 시간 초과, 빈 추출)와 소요 시간을 기록해
+다음 요청은 처음부터 잘 되는 가장 빠른 방법으로 보냅니다.
+브라우저가 필요한 사이트라고 알게 되면 매번 requests 시간 초과를 기다린 뒤에 Selenium으로 넘어가지 않습니다.
+
+가벼운 방법(requests)이 밀려난 호스트는 REPROBE_INTERVAL마다 한 번씩 그 방법을 먼저 다시 시도합니다.
+기록은 ~/.web_scraper/strategies.json에 저장되어 재시작 후에도 유지됩니다
+(바뀐 기록은 FLUSH_INTERVAL마다, 그리고 프로세스 종료 시 한 번에 저장).
+"""
+
+import argparse
+import atexit
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+DEFAULT_STRATEGY_PATH = Path.home() / ".web_scraper" / "strategies.json"
+
+# 가벼운 순서 (기록이 없는 호스트는 이 순서로 시도)
+STRATEGIES = ('requests', 'selenium')
+
+# 결과 종류 (OUTCOMES는 좋은 결과 순서)
+OUTCOME_SUCCESS = 'success'
+OUTCOME_TIMEOUT = 'timeout'
+OUTCOME_EMPTY = 'empty'  # 성공했지만 추출한 내용이 없음 (JavaScript 렌더링 필요)
+OUTCOME_ERROR = 'error'
+OUTCOMES = (OUTCOME_SUCCESS, OUTCOME_EMPTY, OUTCOME_TIMEOUT, OUTCOME_ERROR)
+
+# 시간 초과로 보는 오류 메시지 (requests/asyncio/Selenium 스크래퍼의 오류 문구)
+TIMEOUT_MARKERS = ('시간 초과', 'ConnectTimeoutError', 'timed out')
+
+# 연속으로 이만큼 실패한 방법은 잘 되는 방법이 있는 동안 쓰지 않음
+FAILURE_LIMIT = 2
+# 밀려난 가벼운 방법을 다시 시도하는 간격 (초)
+REPROBE_INTERVAL = 6 * 3600
+# 소요 시간 지수 이동 평균 비율 (최근 값의 비중)
+LATENCY_ALPHA = 0.3
+# 바뀐 기록을 파일에 저장하는 간격 (초, 0이면 바뀔 때마다 바로 저장)
+FLUSH_INTERVAL = 5.0
+# 기록할 최대 호스트 수 (넘으면 오래 쓰지 않은 호스트부터 삭제)
+MAX_HOSTS = 5000
+
+
+def strategy_host(url):
+    return urlparse(url).netloc.lower()
+
+
+def has_content(result):
+    """추출한 본문(테이블/본문 블록)이나 이미지가 있는지 (URL과 제목 줄만 있으면 False)"""
+    if result.get('image_count'):
+        return True
+    for line in (result.get('text_content') or '').split('\n'):
+        line = line.strip()
+        if line and not line.startswith(('**원본 URL**', '# ')):
+            return True
+    return False
+
+
+def classify(result):
+    """스크래핑 결과 dict를 OUTCOMES 중 하나로 분류"""
+    if result.get('success'):
+        return OUTCOME_SUCCESS if has_content(result) else OUTCOME_EMPTY
+    error = str(result.get('error', ''))
+    if any(marker in error for marker in TIMEOUT_MARKERS):
+        return OUTCOME_TIMEOUT
+    return OUTCOME_ERROR
+
+
+def new_state():
+    state = {outcome: 0 for outcome in OUTCOMES}
+    state.update({'failures': 0, 'latency': None, 'last_outcome': None, 'last_used': 0.0})
+    return state
+
+
+class StrategyTable:
+    """호스트별 방법 기록과 방법 선택 (스레드 안전)"""
+
+    def __init__(self, path=DEFAULT_STRATEGY_PATH, reprobe_interval=REPROBE_INTERVAL,
+                 failure_limit=FAILURE_LIMIT, max_hosts=MAX_HOSTS, flush_interval=FLUSH_INTERVAL):
+        self.path = Path(path) if path else None
+        self.reprobe_interval = reprobe_interval
+        self.failure_limit = failure_limit
+        self.max_hosts = max_hosts
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        # 파일 쓰기는 self.lock 밖에서 하므로 쓰기끼리만 따로 막음 (save_lock → lock 순서로만 잡음)
+        self.save_lock = threading.Lock()
+        self.dirty = False
+        self.flush_timer = None
+        self.hosts = {}  # 호스트 → {'strategies': {방법: 상태}, 'updated': 시각}
+        self.routed = {name: 0 for name in STRATEGIES}
+        self.probes = 0
+        self.fallbacks = 0
+        self.load()
+
+    def load(self):
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                hosts = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"방법 기록을 읽을 수 없습니다: {self.path} - {e}")
+            return
+        for host, entry in hosts.items():
+            strategies = {name: dict(new_state(), **state) for name, state in entry.get('strategies', {}).items()
+                          if name in STRATEGIES}
+            self.hosts[host] = {'strategies': strategies, 'updated': entry.get('updated', 0.0)}
+
+    def save(self, hosts):
+        """파일에 저장 (save_lock 보유 상태에서 호출, 실패해도 스크래핑은 계속)"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + f".{threading.get_ident()}.part")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(hosts, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"방법 기록 저장 실패: {self.path} - {e}")
+
+    def mark_dirty(self):
+        """기록이 바뀌었음을 표시하고 저장 예약 (lock 보유 상태에서 호출, 바로 저장해야 하면 True)"""
+        if self.path is None:
+            return False
+        self.dirty = True
+        if not self.flush_interval:
+            return True
+        if self.flush_timer is None:
+            self.flush_timer = threading.Timer(self.flush_interval, self.flush)
+            self.flush_timer.daemon = True
+            self.flush_timer.start()
+        return False
+
+    def flush(self):
+        """바뀐 기록이 있으면 파일에 저장 (복사본만 lock 안에서 만들고 쓰기는 lock 밖에서)"""
+        # 복사본을 만든 순서대로 쓰도록 쓰기가 끝날 때까지 save_lock 유지
+        with self.save_lock:
+            with self.lock:
+                self.flush_timer = None
+                if not self.dirty:
+                    return
+                self.dirty = False
+                hosts = {host: {'strategies': {name: dict(state) for name, state in entry['strategies'].items()},
+                                'updated': entry['updated']}
+                         for host, entry in self.hosts.items()}
+            self.save(hosts)
+
+    def preferred(self, entry):
+        """잘 되는 방법 중 가장 빠른 방법 (모두 실패 중이면 연속 실패가 적은 가벼운 방법)"""
+        strategies = entry['strategies']
+        working = []
+        for index, name in enumerate(STRATEGIES):
+            state = strategies.get(name)
+            # 소요 시간은 실패로 세지 않은 결과에서만 기록됨
+            if state and state['latency'] is not None and state['failures'] < self.failure_limit:
+                working.append((state['latency'], index, name))
+        if working:
+            return min(working)[2]
+        return min(STRATEGIES, key=lambda name: (strategies.get(name, {}).get('failures', 0),
+                                                 STRATEGIES.index(name)))
+
+    def plan(self, url, available=STRATEGIES):
+        """이번 요청에서 시도할 방법 순서와 다시 시도(probe) 여부
+
+        기록이 없으면 가벼운 순서대로, 있으면 선택한 방법부터 시도합니다.
+        선택한 방법보다 가벼운 방법을 REPROBE_INTERVAL 동안 시도하지 않았으면 그 방법을 먼저 시도합니다.
+        """
+        available = [name for name in STRATEGIES if name in available]
+        host = strategy_host(url)
+        probe = False
+        with self.lock:
+            entry = self.hosts.get(host)
+            if entry is None:
+                order = available
+            else:
+                best = self.preferred(entry)
+                if best not in available:
+                    best = available[0]
+                order = [best] + [name for name in available if name != best]
+                now = time.time()
+                for name in available[:available.index(best)]:
+                    state = entry['strategies'].setdefault(name, new_state())
+                    if now - state['last_used'] >= self.reprobe_interval:
+                        # 동시에 들어온 요청이 모두 다시 시도하지 않도록 시도 시각을 먼저 기록
+                        state['last_used'] = now
+                        order = [name] + [other for other in order if other != name]
+                        probe = True
+                        self.probes += 1
+                        break
+            self.routed[order[0]] += 1
+        return order, probe
+
+    def should_fallback(self, url, outcome, fallback):
+        """이번 결과로 다음 방법(fallback)을 시도할지 여부
+
+        시간 초과면 시도하고, 빈 추출이면 다음 방법도 마지막에 빈 추출이 아니었을 때만 시도합니다
+        (두 방법 모두 비어 있으면 페이지 자체에 내용이 없는 것).
+        """
+        if outcome == OUTCOME_TIMEOUT:
+            return True
+        if outcome != OUTCOME_EMPTY:
+            return False
+        with self.lock:
+            entry = self.hosts.get(strategy_host(url))
+            state = entry['strategies'].get(fallback) if entry else None
+            return state is None or state['last_outcome'] != OUTCOME_EMPTY
+
+    def record(self, url, attempts):
+        """한 요청에서 시도한 [(방법, 결과, 소요 초), ...] 기록
+
+        다른 방법도 내용을 추출하지 못했다면 빈 추출은 방법 탓이 아니므로 실패로 세지 않습니다.
+        """
+        content_found = any(outcome == OUTCOME_SUCCESS for name, outcome, seconds in attempts)
+        host = strategy_host(url)
+        now = time.time()
+        with self.lock:
+            entry = self.hosts.setdefault(host, {'strategies': {}, 'updated': now})
+            entry['updated'] = now
+            for name, outcome, seconds in attempts:
+                state = entry['strategies'].setdefault(name, new_state())
+                state[outcome] += 1
+                state['last_outcome'] = outcome
+                state['last_used'] = now
+                if outcome == OUTCOME_SUCCESS or (outcome == OUTCOME_EMPTY and not content_found):
+                    state['failures'] = 0
+                    if seconds is not None:
+                        previous = state['latency']
+                        state['latency'] = round(seconds if previous is None else
+                                                 previous + LATENCY_ALPHA * (seconds - previous), 4)
+                else:
+                    state['failures'] += 1
+            if len(attempts) > 1:
+                self.fallbacks += 1
+            if len(self.hosts) > self.max_hosts:
+                oldest = sorted(self.hosts, key=lambda name: self.hosts[name]['updated'])
+                for name in oldest[:len(self.hosts) - self.max_hosts]:
+                    del self.hosts[name]
+            flush_now = self.mark_dirty()
+        if flush_now:
+            self.flush()
+
+    def forget(self, host):
+        """호스트 기록 삭제 (다음 요청은 가벼운 순서부터 다시 시도, 기록이 없었으면 False)"""
+        with self.lock:
+            removed = self.hosts.pop(host.lower(), None) is not None
+            flush_now = removed and self.mark_dirty()
+        if flush_now:
+            self.flush()
+        return removed
+
+    def stats(self):
+        """호스트별 선택한 방법과 방법별 결과 수, 평균 소요 시간"""
+        with self.lock:
+            hosts = {
+                host: {
+                    'preferred': self.preferred(entry),
+                    'updated': entry['updated'],
+                    'strategies': {name: dict(state) for name, state in entry['strategies'].items()}
+                }
+                for host, entry in self.hosts.items()
+            }
+            return {
+                'hosts': hosts,
+                'host_count': len(hosts),
+                'routed': dict(self.routed),
+                'probes': self.probes,
+                'fallbacks': self.fallbacks,
+                'reprobe_interval': self.reprobe_interval
+            }
+
+
+_table = None
+_table_lock = threading.Lock()
+
+
+def get_strategy_table(path=DEFAULT_STRATEGY_PATH):
+    """프로세스 공유 방법 기록 (처음 호출 시 파일에서 읽고, 종료 시 남은 기록을 저장)"""
+    global _table
+    with _table_lock:
+        if _table is None:
+            _table = StrategyTable(path)
+            atexit.register(_table.flush)
+        return _table
+
+
+def main():
+    parser = argparse.ArgumentParser(description='도메인별 스크래핑 방법 기록')
+    parser.add_argument('--path', default=str(DEFAULT_STRATEGY_PATH),
+                        help=f'기록 위치 (기본값: {DEFAULT_STRATEGY_PATH})')
+    parser.add_argument('--forget', metavar='HOST', help='호스트 기록 삭제')
+    args = parser.parse_args()
+
+    table = StrategyTable(args.path, flush_interval=0)
+    if args.forget:
+        print('삭제했습니다.' if table.forget(args.forget) else '기록이 없습니다.')
+        return
+    print(json.dumps(table.stats()['hosts'], ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
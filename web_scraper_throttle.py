@@ -0,0 +1,239 @@
+"""
+호스트별 요청 속도 조절 (politeness scheduler)
+모든 페이지/이미지 요청이 호스트별 토큰 버킷(초당 요청 수)과 동시 요청 상한을 거치게 합니다.
+429/503 응답을 받으면 Retry-After만큼 그 호스트 요청을 멈추고 속도를 절반으로 줄였다가,
+성공 응답이 이어지면 조금씩 원래 속도로 되돌립니다.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from web_scraper_cache import parse_http_date
+
+# 기본 호스트별 설정
+DEFAULT_HOST_RATE = 8.0        # 초당 요청 수
+DEFAULT_HOST_BURST = 16        # 쉬다가 한 번에 보낼 수 있는 요청 수
+DEFAULT_HOST_CONCURRENCY = 6   # 동시에 보내는 요청 수 상한
+MIN_HOST_RATE = 0.2            # 속도를 줄여도 이 아래로는 내리지 않음
+
+# 속도를 줄이고 다시 보낼 상태 코드
+THROTTLE_STATUSES = {429, 503}
+THROTTLE_RETRIES = 3
+# Retry-After가 없을 때의 대기 시간 (연속 실패마다 두 배, 초)
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+# 이보다 긴 Retry-After는 기다리지 않고 응답을 그대로 반환 (그동안 호스트는 멈춤)
+MAX_RETRY_AFTER = 120.0
+# 성공 응답마다 원래 속도의 이 비율만큼 되돌림
+RECOVERY_STEP = 0.1
+
+
+def request_host(url):
+    return urlparse(url).netloc.lower()
+
+
+def parse_retry_after(value, now=None):
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 초로 변환 (없거나 잘못되면 None)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    when = parse_http_date(value)
+    if when is None:
+        return None
+    return max(0.0, when - (now or time.time()))
+
+
+class HostThrottle:
+    """한 호스트의 토큰 버킷 + 동시 요청 수 + 적응형 속도 (lock은 스케줄러가 관리)"""
+
+    def __init__(self, rate, burst, concurrency):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.active = 0
+        self.blocked_until = 0.0
+        self.failures = 0  # 연속 429/503 수
+        self.requests = 0
+        self.throttled = 0
+        self.wait_time = 0.0
+
+    def refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, now):
+        """바로 보낼 수 있으면 0, 아니면 기다릴 초 (동시 요청 상한이면 None)"""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.active >= self.concurrency:
+            return None
+        self.refill(now)
+        if self.tokens < 1:
+            return (1 - self.tokens) / self.rate
+        self.tokens -= 1
+        self.active += 1
+        self.requests += 1
+        return 0
+
+    def feedback(self, status, retry_after, now):
+        """응답 결과로 속도 조절 후 429/503이면 다음 요청까지 기다릴 초 반환"""
+        if status in THROTTLE_STATUSES:
+            self.throttled += 1
+            if now < self.blocked_until:
+                # 이미 멈춘 동안 도착한 동시 요청들의 응답 - 속도는 한 번만 줄임
+                if retry_after is not None:
+                    self.blocked_until = max(self.blocked_until, now + retry_after)
+                return self.blocked_until - now
+            self.failures += 1
+            self.rate = max(MIN_HOST_RATE, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+            if retry_after is None:
+                delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** (self.failures - 1)))
+                retry_after = delay * random.uniform(0.8, 1.2)
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+            return retry_after
+        if status is not None and self.failures == 0:
+            self.rate = min(self.base_rate, self.rate + self.base_rate * RECOVERY_STEP)
+        elif status is not None:
+            self.failures = 0
+        return 0
+
+    def to_dict(self, now):
+        return {
+            'rate': round(self.rate, 3),
+            'base_rate': self.base_rate,
+            'concurrency': self.concurrency,
+            'active': self.active,
+            'blocked_for': round(max(0.0, self.blocked_until - now), 3),
+            'requests': self.requests,
+            'throttled': self.throttled,
+            'wait_time': round(self.wait_time, 3)
+        }
+
+
+class PolitenessScheduler:
+    """호스트별 요청 속도/동시성 조절기 (스레드 안전, asyncio에서도 사용 가능)
+
+    host_limits로 호스트별 설정을 바꿀 수 있습니다
+    (예: {'r.yongsanyouthtown.or.kr': {'rate': 2, 'concurrency': 2}}).
+    """
+
+    def __init__(self, rate=DEFAULT_HOST_RATE, burst=DEFAULT_HOST_BURST,
+                 concurrency=DEFAULT_HOST_CONCURRENCY, host_limits=None):
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.host_limits = dict(host_limits or {})
+        self.hosts = {}
+        self.lock = threading.Lock()
+        self.released = threading.Condition(self.lock)
+
+    def host(self, host):
+        """호스트 상태 (lock 보유 상태에서 호출)"""
+        throttle = self.hosts.get(host)
+        if throttle is None:
+            limits = self.host_limits.get(host, {})
+            throttle = HostThrottle(max(MIN_HOST_RATE, float(limits.get('rate', self.rate))),
+                                    max(1, int(limits.get('burst', self.burst))),
+                                    max(1, int(limits.get('concurrency', self.concurrency))))
+            self.hosts[host] = throttle
+        return throttle
+
+    def acquire(self, url):
+        """요청을 보내도 될 때까지 기다림 (release와 짝으로 호출)"""
+        host = request_host(url)
+        started = time.monotonic()
+        with self.lock:
+            throttle = self.host(host)
+            while True:
+                wait = throttle.try_acquire(time.monotonic())
+                if wait == 0:
+                    throttle.wait_time += time.monotonic() - started
+                    return host
+                # 동시 요청 상한이면 다른 요청이 끝날 때 깨어남
+                self.released.wait(wait)
+
+    async def acquire_async(self, url):
+        """acquire의 asyncio 버전 (이벤트 루프를 막지 않음)"""
+        host = request_host(url)
+        started = time.monotonic()
+        while True:
+            with self.lock:
+                throttle = self.host(host)
+                wait = throttle.try_acquire(time.monotonic())
+                if wait == 0:
+                    throttle.wait_time += time.monotonic() - started
+                    return host
+            await asyncio.sleep(wait if wait is not None else 0.05)
+
+    def release(self, host, status=None, retry_after=None):
+        """요청 완료 알림 - status/retry_after로 속도를 조절하고 429/503이면 대기할 초 반환"""
+        with self.lock:
+            throttle = self.host(host)
+            throttle.active -= 1
+            delay = throttle.feedback(status, parse_retry_after(retry_after), time.monotonic())
+            self.released.notify_all()
+        return delay
+
+    def stats(self):
+        now = time.monotonic()
+        with self.lock:
+            return {
+                'rate': self.rate,
+                'burst': self.burst,
+                'concurrency': self.concurrency,
+                'hosts': {host: throttle.to_dict(now) for host, throttle in self.hosts.items()}
+            }
+
+
+class ThrottledHTTPAdapter(HTTPAdapter):
+    """PolitenessScheduler를 거쳐 요청을 보내는 어댑터
+
+    429/503은 Retry-After(없으면 지수 백오프)만큼 기다린 뒤 THROTTLE_RETRIES번까지 다시 보냅니다.
+    동시 요청 수는 응답 헤더를 받을 때까지 셉니다.
+    """
+
+    def __init__(self, scheduler=None, **kwargs):
+        self.scheduler = scheduler
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if self.scheduler is None:
+            return super().send(request, **kwargs)
+
+        for attempt in range(THROTTLE_RETRIES + 1):
+            host = self.scheduler.acquire(request.url)
+            status, retry_after = None, None
+            try:
+                response = super().send(request, **kwargs)
+                status, retry_after = response.status_code, response.headers.get('Retry-After')
+            finally:
+                delay = self.scheduler.release(host, status, retry_after)
+            if status not in THROTTLE_STATUSES or attempt == THROTTLE_RETRIES or delay > MAX_RETRY_AFTER:
+                return response
+            print(f"요청 제한({status}) - {delay:.1f}초 후 재시도: {request.url}")
+            response.close()
+            # 다음 acquire가 Retry-After 동안 기다림
+        return response
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """프로세스 공유 스케줄러 (처음 호출 시 생성)"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = PolitenessScheduler()
+        return _scheduler
+